@@ -3,10 +3,12 @@ AI-Powered Resume Analyzer & Skill Gap Finder
 Main Streamlit Application
 """
 
+import os
+import time
 import streamlit as st
-from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx, clean_text
 from utils.nlp_processor import download_nltk_data
-from utils.matcher import calculate_match_score, generate_suggestions
+from utils.resources import prewarm
+from utils.job_queue import JobQueue, WorkerPool, PENDING_STATUSES
 
 
 # Page configuration
@@ -21,8 +23,142 @@ st.set_page_config(
 # Initialize NLTK data
 @st.cache_resource
 def initialize_nltk():
-    """Download required NLTK data on first run"""
+    """Download required NLTK data and pre-load shared resources on first run"""
     download_nltk_data()
+    prewarm()
+
+
+# Seconds between checks for a finished analysis
+ANALYSIS_POLL_SECONDS = 0.5
+
+
+# Analysis job queue plus its local worker pool, shared by all sessions
+@st.cache_resource
+def get_job_queue():
+    """Create the job queue and start RESUME_QUEUE_WORKERS local workers (default 2)"""
+    job_queue = JobQueue()
+    workers = int(os.environ.get('RESUME_QUEUE_WORKERS', '2'))
+    if workers > 0:
+        job_queue.worker_pool = WorkerPool(
+            job_queue.db_path, workers, os.environ.get('RESUME_CACHE_DIR')
+        ).start()
+    return job_queue
+
+
+def render_results(analysis, show_timings=False):
+    """
+    Display a finished analysis from the job queue
+    
+    Args:
+        analysis: Job result (see utils.job_queue.analyze_resume)
+        show_timings: Show the worker's stage timing table
+    """
+    results = analysis['match']
+    suggestions = analysis['suggestions']
+    section_results = analysis['sections']
+    
+    st.markdown("---")
+    st.header("📊 Analysis Results")
+    
+    # Text as extracted by the worker
+    if analysis.get('resume_text'):
+        with st.expander("📄 Preview Resume Text"):
+            st.text_area("Resume Content", analysis['resume_text'], height=200, disabled=True)
+    
+    # Match Score
+    match_pct = results['match_percentage']
+    ml_score = results['ml_match_score']
+    col_score1, col_score2, col_score3, col_score4 = st.columns(4)
+    
+    with col_score1:
+        st.metric("Skill Match", f"{match_pct}%")
+    with col_score2:
+        st.metric("ML Match Score", f"{ml_score}%")
+    with col_score3:
+        st.metric("Matched Skills", results['total_matched'])
+    with col_score4:
+        st.metric("Missing Skills", len(results['missing_skills']))
+    
+    if results.get('semantic_match_score') is not None:
+        st.caption(f"🧭 Semantic similarity (embedding model): {results['semantic_match_score']}%")
+    
+    # Progress bar - use ML score for visual
+    if ml_score >= 80:
+        bar_color = "green"
+    elif ml_score >= 60:
+        bar_color = "orange"
+    else:
+        bar_color = "red"
+    
+    st.progress(ml_score / 100)
+    
+    # Explanation of scores
+    with st.expander("ℹ️ Understanding the Scores"):
+        st.markdown("""
+        **Skill Match**: Percentage based on matched keywords and skills
+        
+        **ML Match Score**: AI-powered score using TF-IDF and cosine similarity
+        - Analyzes overall content similarity
+        - Considers context and word importance
+        - More holistic than keyword matching
+        
+        💡 A good match typically has both scores above 60%
+        """)
+    
+    # Detailed Results
+    st.markdown("---")
+    
+    col_res1, col_res2 = st.columns(2)
+    
+    with col_res1:
+        st.subheader("✅ Matched Skills")
+        if results['matched_skills']:
+            for skill in results['matched_skills']:
+                st.markdown(f"- ✓ {skill}")
+        else:
+            st.info("No matched skills found")
+    
+    with col_res2:
+        st.subheader("❌ Missing Skills")
+        if results['missing_skills']:
+            for skill in results['missing_skills']:
+                st.markdown(f"- ✗ {skill}")
+        else:
+            st.success("No missing skills!")
+    
+    # Suggestions
+    st.markdown("---")
+    st.subheader("💡 Improvement Suggestions")
+    for suggestion in suggestions:
+        st.markdown(f"- {suggestion}")
+    
+    # Additional Details
+    with st.expander("📈 Detailed Analysis"):
+        st.write("**Your Resume Skills:**")
+        st.write(", ".join(results['resume_skills']) if results['resume_skills'] else "None detected")
+        
+        st.write("\n**Job Description Requirements:**")
+        st.write(", ".join(results['jd_skills']) if results['jd_skills'] else "None detected")
+        
+        if section_results:
+            st.write(f"\n**Section-Weighted Skill Match:** {section_results['weighted_match_percentage']}%")
+            st.table([
+                {
+                    'section': name,
+                    'weight': scores['weight'],
+                    'skill_match': scores['skill_match'],
+                    'ml_match_score': scores['ml_match_score'],
+                    'matched_skills': ", ".join(scores['matched_skills'])
+                }
+                for name, scores in section_results['section_scores'].items()
+            ])
+        
+        if show_timings:
+            st.write("\n**Timing Breakdown** (analysis worker, inclusive of nested stages):")
+            if analysis.get('timings'):
+                st.table(analysis['timings'])
+            else:
+                st.caption("Not recorded for this analysis; click Analyze again to record timings.")
 
 
 def main():
@@ -68,6 +204,13 @@ def main():
             - Tailor for each application
             """
         )
+        
+        st.header("⏱️ Diagnostics")
+        show_timings = st.checkbox(
+            "Show timing breakdown",
+            value=False,
+            help="Record how long each processing stage takes for this analysis"
+        )
     
     # Main content area
     col1, col2 = st.columns(2)
@@ -81,26 +224,9 @@ def main():
             help="Upload your resume in PDF or DOCX format"
         )
         
-        resume_text = ""
+        # Text is extracted by the analysis workers, not in this script
         if uploaded_file is not None:
-            try:
-                # Extract text based on file type
-                if uploaded_file.name.endswith('.pdf'):
-                    resume_text = extract_text_from_pdf(uploaded_file)
-                elif uploaded_file.name.endswith('.docx'):
-                    resume_text = extract_text_from_docx(uploaded_file)
-                
-                # Clean text
-                resume_text = clean_text(resume_text)
-                
-                st.success(f"✅ Resume uploaded: {uploaded_file.name}")
-                
-                # Show preview
-                with st.expander("📄 Preview Resume Text"):
-                    st.text_area("Resume Content", resume_text, height=200, disabled=True)
-                    
-            except Exception as e:
-                st.error(f"❌ Error processing resume: {str(e)}")
+            st.success(f"✅ Resume uploaded: {uploaded_file.name}")
     
     # Column 2: Job Description Input
     with col2:
@@ -151,92 +277,33 @@ Nice to have:
     with col_btn2:
         analyze_button = st.button("🔍 Analyze Match", type="primary", use_container_width=True)
     
-    # Analysis Results
+    # Analysis runs on the worker pool; this script only submits and polls
+    job_queue = get_job_queue()
     if analyze_button:
-        if not resume_text:
+        if uploaded_file is None:
             st.error("❌ Please upload a resume first!")
         elif not jd_text.strip():
             st.error("❌ Please provide a job description!")
         else:
+            st.session_state['analysis_job'] = job_queue.submit(
+                uploaded_file.getvalue(), uploaded_file.name, jd_text, record_timings=show_timings
+            )
+    
+    # Analysis Results (only while the inputs still match the submitted job)
+    job_id = st.session_state.get('analysis_job')
+    if job_id and uploaded_file is not None and jd_text.strip() and \
+            job_id == JobQueue.job_id_for(uploaded_file.getvalue(), jd_text):
+        job = job_queue.get(job_id)
+        if job is None:
+            st.session_state.pop('analysis_job')
+        elif job['status'] in PENDING_STATUSES:
             with st.spinner("🔄 Analyzing your resume..."):
-                # Calculate match
-                results = calculate_match_score(resume_text, jd_text)
-                suggestions = generate_suggestions(results)
-                
-                st.markdown("---")
-                st.header("📊 Analysis Results")
-                
-                # Match Score
-                match_pct = results['match_percentage']
-                ml_score = results['ml_match_score']
-                col_score1, col_score2, col_score3, col_score4 = st.columns(4)
-                
-                with col_score1:
-                    st.metric("Skill Match", f"{match_pct}%")
-                with col_score2:
-                    st.metric("ML Match Score", f"{ml_score}%")
-                with col_score3:
-                    st.metric("Matched Skills", results['total_matched'])
-                with col_score4:
-                    st.metric("Missing Skills", len(results['missing_skills']))
-                
-                # Progress bar - use ML score for visual
-                if ml_score >= 80:
-                    bar_color = "green"
-                elif ml_score >= 60:
-                    bar_color = "orange"
-                else:
-                    bar_color = "red"
-                
-                st.progress(ml_score / 100)
-                
-                # Explanation of scores
-                with st.expander("ℹ️ Understanding the Scores"):
-                    st.markdown("""
-                    **Skill Match**: Percentage based on matched keywords and skills
-                    
-                    **ML Match Score**: AI-powered score using TF-IDF and cosine similarity
-                    - Analyzes overall content similarity
-                    - Considers context and word importance
-                    - More holistic than keyword matching
-                    
-                    💡 A good match typically has both scores above 60%
-                    """)
-                
-                # Detailed Results
-                st.markdown("---")
-                
-                col_res1, col_res2 = st.columns(2)
-                
-                with col_res1:
-                    st.subheader("✅ Matched Skills")
-                    if results['matched_skills']:
-                        for skill in results['matched_skills']:
-                            st.markdown(f"- ✓ {skill}")
-                    else:
-                        st.info("No matched skills found")
-                
-                with col_res2:
-                    st.subheader("❌ Missing Skills")
-                    if results['missing_skills']:
-                        for skill in results['missing_skills']:
-                            st.markdown(f"- ✗ {skill}")
-                    else:
-                        st.success("No missing skills!")
-                
-                # Suggestions
-                st.markdown("---")
-                st.subheader("💡 Improvement Suggestions")
-                for suggestion in suggestions:
-                    st.markdown(f"- {suggestion}")
-                
-                # Additional Details
-                with st.expander("📈 Detailed Analysis"):
-                    st.write("**Your Resume Skills:**")
-                    st.write(", ".join(results['resume_skills']) if results['resume_skills'] else "None detected")
-                    
-                    st.write("\n**Job Description Requirements:**")
-                    st.write(", ".join(results['jd_skills']) if results['jd_skills'] else "None detected")
+                time.sleep(ANALYSIS_POLL_SECONDS)
+            st.rerun()
+        elif job['status'] == 'failed':
+            st.error(f"❌ Analysis failed: {job['error']}")
+        else:
+            render_results(job['result'], show_timings)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+DOCX Extraction Benchmark
+Compares the streaming DOCX extractor with python-docx's paragraph list
+
+The old extractor built a python-docx Document and concatenated
+doc.paragraphs, so skills listed in tables, headers, footers and text boxes
+never reached the matcher. The new one streams the package XML once and
+yields all of them in reading order.
+
+Each synthetic resume keeps half of the taxonomy's skills in body paragraphs
+and the other half in a skills table, the page header and footer, and a text
+box. Recall is the share of skills in the written text that extract_skills
+finds in the extracted text.
+
+Usage:
+    python benchmarks/bench_docx_extraction.py
+    python benchmarks/bench_docx_extraction.py --documents 10 --pages 100
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_corpus import generate_resume_lines, SECTION_HEADINGS
+from utils.nlp_processor import extract_skills
+from utils.taxonomy import get_taxonomy
+from utils.text_extractor import extract_text_from_docx
+
+
+# A text box as Word writes it: DrawingML with a VML fallback copy
+TEXTBOX_XML = (
+    '<mc:AlternateContent'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:Choice Requires="wps"><w:drawing><wps:wsp><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>'
+    '</mc:AlternateContent>'
+)
+
+
+def legacy_extract_text_from_docx(file):
+    """The paragraphs-only python-docx extractor this module replaced"""
+    from docx import Document
+
+    text = ""
+    doc = Document(file)
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text.strip()
+
+
+def write_layout_docx(rng, pages, path):
+    """
+    Write a resume whose skills are split between body text and layout elements
+
+    Args:
+        rng: random.Random instance
+        pages: Approximate length in pages
+        path: Destination file
+
+    Returns:
+        str: Every piece of text written, joined by newlines
+    """
+    from docx import Document
+    from docx.oxml import parse_xml
+
+    skills = list(get_taxonomy().skills)
+    rng.shuffle(skills)
+    body_skills, layout_skills = skills[:len(skills) // 2], skills[len(skills) // 2:]
+
+    lines = generate_resume_lines(rng, pages, skill_density=0)
+    for skill in body_skills:
+        index = rng.randrange(2, len(lines))
+        if lines[index] not in SECTION_HEADINGS:
+            lines[index] += f" using {skill}"
+
+    document = Document()
+    section = document.sections[0]
+    header_text = f"{lines[0]} | {layout_skills[0]}"
+    footer_text = f"Certified in {layout_skills[1]}"
+    section.header.paragraphs[0].text = header_text
+    section.footer.paragraphs[0].text = footer_text
+    written = [header_text, footer_text]
+
+    middle = len(lines) // 2
+    for number, line in enumerate(lines):
+        if line in SECTION_HEADINGS:
+            document.add_heading(line.title(), level=1)
+        else:
+            document.add_paragraph(line)
+        written.append(line)
+
+        if number == 1:
+            textbox_text = f"Key strengths: {layout_skills[2]}, {layout_skills[3]}"
+            anchor = document.add_paragraph().add_run()
+            anchor._r.append(parse_xml(TEXTBOX_XML.format(text=textbox_text)))
+            written.append(textbox_text)
+        elif number == middle:
+            table_skills = layout_skills[4:]
+            table = document.add_table(rows=len(table_skills) + 1, cols=3)
+            for cell, title in zip(table.rows[0].cells, ('Skill', 'Years', 'Level')):
+                cell.text = title
+            for row, skill in zip(table.rows[1:], table_skills):
+                cells = (skill, str(rng.randint(1, 10)), rng.choice(('Advanced', 'Expert')))
+                for cell, value in zip(row.cells, cells):
+                    cell.text = value
+                written.append(' '.join(cells))
+
+    document.save(path)
+    return '\n'.join(written)
+
+
+def time_per_call(func, paths, repeat):
+    """
+    Time a function over all files
+
+    Returns:
+        float: Mean milliseconds per document
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path in paths:
+            func(path)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (repeat * len(paths))
+
+
+def skill_recall(extract, paths, written):
+    """
+    Share of the written skills extract_skills recovers from extracted text
+
+    Returns:
+        float: Recall over all documents, in percent
+    """
+    expected = found = 0
+    for path, text in zip(paths, written):
+        truth = extract_skills(text)
+        expected += len(truth)
+        found += len(truth & extract_skills(extract(path)))
+    return found * 100 / expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DOCX text extraction")
+    parser.add_argument('--documents', type=int, default=20, help="Synthetic resumes to extract")
+    parser.add_argument('--pages', type=int, default=20, help="Approximate pages per resume")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the documents")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        paths, written = [], []
+        for index in range(args.documents):
+            path = os.path.join(directory, f"resume_{index:04d}.docx")
+            written.append(write_layout_docx(rng, args.pages, path))
+            paths.append(path)
+
+        # Every body paragraph the old extractor saw must still be there
+        for path in paths:
+            new_lines = set(extract_text_from_docx(path).split('\n'))
+            if not all(line in new_lines for line in legacy_extract_text_from_docx(path).split('\n') if line.strip()):
+                sys.exit("Streaming extractor lost body text python-docx returned")
+
+        legacy_ms = time_per_call(legacy_extract_text_from_docx, paths, args.repeat)
+        streaming_ms = time_per_call(extract_text_from_docx, paths, args.repeat)
+        legacy_recall = skill_recall(legacy_extract_text_from_docx, paths, written)
+        streaming_recall = skill_recall(extract_text_from_docx, paths, written)
+        size_kib = sum(os.path.getsize(path) for path in paths) / len(paths) / 1024
+
+    print(f"Documents: {len(paths)} ({args.pages} pages, {size_kib:.0f} KiB each on average)")
+    print(f"python-docx paragraphs:  {legacy_ms:8.2f} ms/doc   skill recall {legacy_recall:5.1f}%")
+    print(f"Streaming XML extractor: {streaming_ms:8.2f} ms/doc   skill recall {streaming_recall:5.1f}%")
+    print(f"Speed-up:                {legacy_ms / streaming_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
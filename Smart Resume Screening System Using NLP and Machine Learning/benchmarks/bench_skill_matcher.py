@@ -0,0 +1,135 @@
+"""
+Skill Matcher Benchmark
+Compares the old per-skill regex loop with the compiled SkillMatcher
+
+Usage:
+    python benchmarks/bench_skill_matcher.py
+    python benchmarks/bench_skill_matcher.py --extra-skills 5000
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.taxonomy import get_taxonomy
+from utils.skill_matcher import SkillMatcher
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def legacy_extract_skills(text, skills, synonyms):
+    """
+    The original extract_skills loop: one regex search per skill and synonym
+
+    Args:
+        text: Input text string
+        skills: List of canonical skill names
+        synonyms: Dict mapping canonical name to a list of aliases
+
+    Returns:
+        set: Set of extracted skills
+    """
+    text_lower = text.lower()
+    found_skills = set()
+
+    for skill in skills:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found_skills.add(skill)
+
+    for canonical, aliases in synonyms.items():
+        for synonym in aliases:
+            pattern = r'\b' + re.escape(synonym) + r'\b'
+            if re.search(pattern, text_lower):
+                found_skills.add(canonical)
+                break
+
+    return found_skills
+
+
+def load_documents(data_dir):
+    """
+    Load every readable document in the data directory
+
+    Args:
+        data_dir: Directory containing .txt/.md/.pdf/.docx files
+
+    Returns:
+        list: List of (name, text) tuples
+    """
+    documents = []
+    for name in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, name)
+        if name.endswith(('.txt', '.md')):
+            with open(path, encoding='utf-8') as f:
+                documents.append((name, f.read()))
+        elif name.endswith(('.pdf', '.docx')):
+            from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx
+            with open(path, 'rb') as f:
+                if name.endswith('.pdf'):
+                    documents.append((name, extract_text_from_pdf(f)))
+                else:
+                    documents.append((name, extract_text_from_docx(f)))
+    return documents
+
+
+def time_per_call(func, texts, repeat):
+    """
+    Time a function over all texts
+
+    Returns:
+        float: Mean milliseconds per document
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill extraction")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directory of documents to scan")
+    parser.add_argument('--repeat', type=int, default=20, help="Passes over the documents")
+    parser.add_argument('--extra-skills', type=int, default=0,
+                        help="Add N synthetic skills to show how cost grows with taxonomy size")
+    args = parser.parse_args()
+
+    documents = load_documents(args.data_dir)
+    if not documents:
+        sys.exit(f"No documents found in {args.data_dir}")
+    texts = [text for _, text in documents]
+
+    taxonomy = get_taxonomy()
+    skills = taxonomy.skills + [f'skill{i}x' for i in range(args.extra_skills)]
+    synonyms = taxonomy.synonyms
+
+    build_start = time.perf_counter()
+    matcher = SkillMatcher(skills, synonyms)
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    # Both paths must agree before timings mean anything
+    for name, text in documents:
+        if matcher.find(text) != legacy_extract_skills(text, skills, synonyms):
+            sys.exit(f"Mismatch between old and new skill extraction on {name}")
+
+    legacy_ms = time_per_call(lambda t: legacy_extract_skills(t, skills, synonyms), texts, args.repeat)
+    compiled_ms = time_per_call(matcher.find, texts, args.repeat)
+
+    total_chars = sum(len(text) for text in texts)
+    print(f"Documents: {len(texts)} ({total_chars} chars), skills: {len(skills)}, "
+          f"aliases: {len(matcher.lookup)}")
+    print(f"SkillMatcher build time: {build_ms:.2f} ms")
+    print(f"Per-skill regex loop:    {legacy_ms:.3f} ms/doc")
+    print(f"Compiled SkillMatcher:   {compiled_ms:.3f} ms/doc")
+    print(f"Speedup:                 {legacy_ms / compiled_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Startup Benchmark
+Measures cold import time of the utils modules with lazy imports against
+the eager import graph they replaced, and the per-call cost of
+preprocess_text with the shared stopword set versus reloading it per call
+
+The eager baseline imports what each module used to import at load time
+(scikit-learn, NLTK, pdfplumber, python-docx) before importing the module
+itself. Both per-call variants split words with the same regex, so only
+the stopword handling differs.
+
+Usage:
+    python benchmarks/bench_startup.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+_NLP_PROCESSOR_IMPORTS = (
+    'import nltk; from nltk.corpus import stopwords; from nltk.tokenize import word_tokenize; '
+    'from sklearn.feature_extraction.text import TfidfVectorizer'
+)
+
+# Module-level imports each module had before they were made lazy
+EAGER_IMPORTS = {
+    'utils.text_extractor': 'import pdfplumber; from docx import Document',
+    'utils.nlp_processor': _NLP_PROCESSOR_IMPORTS,
+    'utils.matcher': _NLP_PROCESSOR_IMPORTS + '; from sklearn.metrics.pairwise import cosine_similarity',
+}
+
+
+def time_cold_import(statement, runs):
+    """
+    Run a statement in fresh interpreters and time it
+
+    Args:
+        statement: Python code to execute
+        runs: Number of fresh interpreters
+
+    Returns:
+        float: Median wall time in milliseconds
+    """
+    timings = []
+    for _ in range(runs):
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"{statement}; "
+            "print((time.perf_counter() - start) * 1000)"
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def legacy_preprocess_text(text):
+    """preprocess_text re-reading the stopword corpus every call, as it originally did"""
+    from nltk.corpus import stopwords
+    from utils.tokenizer import WORD_PATTERN
+
+    stop_words = set(stopwords.words('english'))
+    return [token for token in WORD_PATTERN.findall(text.lower()) if token not in stop_words and len(token) > 2]
+
+
+def shared_preprocess_text(text):
+    """The same filter with the stopword set loaded once per process"""
+    from utils.resources import get_stopwords
+    from utils.tokenizer import WORD_PATTERN
+
+    stop_words = get_stopwords()
+    return [token for token in WORD_PATTERN.findall(text.lower()) if token not in stop_words and len(token) > 2]
+
+
+def time_per_call(func, text, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(text)
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup and per-call resource loading")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters per import measurement")
+    parser.add_argument('--calls', type=int, default=200, help="Calls per preprocess_text measurement")
+    args = parser.parse_args()
+
+    print("Cold import (median of fresh interpreters):")
+    print(f"  {'module':<22} {'eager':>9} {'lazy':>9} {'saving':>9}")
+    for module, eager_imports in EAGER_IMPORTS.items():
+        eager_ms = time_cold_import(f"{eager_imports}; import {module}", args.runs)
+        lazy_ms = time_cold_import(f"import {module}", args.runs)
+        print(f"  {module:<22} {eager_ms:>6.1f} ms {lazy_ms:>6.1f} ms {eager_ms - lazy_ms:>6.1f} ms "
+              f"({eager_ms / lazy_ms:.1f}x)")
+    prewarm_ms = time_cold_import('import utils.matcher; from utils.resources import prewarm; prewarm()', args.runs)
+    print(f"  utils.matcher then prewarm(): {prewarm_ms:.1f} ms (paid once, before forking workers)")
+
+    with open(os.path.join(PROJECT_ROOT, 'data', 'sample_jds.txt'), encoding='utf-8') as f:
+        text = f.read()
+
+    print("Per call preprocess_text (same tokenizer):")
+    try:
+        legacy_ms = time_per_call(legacy_preprocess_text, text, args.calls)
+        shared_ms = time_per_call(shared_preprocess_text, text, args.calls)
+    except LookupError:
+        print("  skipped: needs the NLTK stopwords corpus (nltk.download('stopwords'))")
+        return
+    print(f"  stopwords reloaded per call: {legacy_ms:.3f} ms")
+    print(f"  shared stopword set:         {shared_ms:.3f} ms")
+    print(f"  saving per call:             {legacy_ms - shared_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Tokenizer Benchmark
+Compares the old per-stage tokenization with the shared TokenStream
+
+The old path ran NLTK's word_tokenize for keywords, let TfidfVectorizer
+re-tokenize the joined tokens, and normalized the text again with a regex
+for the ML score. The new path tokenizes each resume once and feeds the same
+stream to skill extraction, keyword extraction and ML scoring.
+
+Usage:
+    python benchmarks/bench_tokenizer.py
+    python benchmarks/bench_tokenizer.py --documents 200 --pages 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_corpus import generate_resume_lines, generate_jd_text
+from utils.job_profile import get_job_profile
+from utils.matcher import calculate_ml_match_score
+from utils.nlp_processor import extract_skills, extract_keywords_tfidf, normalize_for_ml
+from utils.resources import get_stopwords
+from utils.tokenizer import tokenize
+
+
+def _legacy_word_tokenizer():
+    """
+    NLTK's word_tokenize, or its Treebank stage alone when Punkt is missing
+
+    Returns:
+        tuple: (tokenizer function, description)
+    """
+    from nltk.tokenize import word_tokenize, TreebankWordTokenizer
+    try:
+        word_tokenize('warm up')
+        return word_tokenize, 'word_tokenize'
+    except LookupError:
+        # Skips the Punkt sentence split, so the old path is timed optimistically
+        return TreebankWordTokenizer().tokenize, 'TreebankWordTokenizer (Punkt not installed)'
+
+
+def _legacy_stopwords():
+    try:
+        return get_stopwords()
+    except LookupError:
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        return ENGLISH_STOP_WORDS
+
+
+def make_legacy_path(jd_text):
+    """
+    The per-stage feature extraction from before the shared token stream
+
+    Args:
+        jd_text: Job description text
+
+    Returns:
+        function: Takes a resume text, returns (skills, keywords, ml_score)
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    word_tokenizer, _ = _legacy_word_tokenizer()
+    stop_words = _legacy_stopwords()
+    jd_clean = normalize_for_ml(jd_text)
+
+    def legacy(text):
+        skills = extract_skills(text)
+
+        tokens = [t for t in word_tokenizer(text.lower()) if t not in stop_words and len(t) > 2]
+        keyword_vectorizer = TfidfVectorizer(max_features=15, ngram_range=(1, 2))
+        keyword_vectorizer.fit_transform([' '.join(tokens)])
+        keywords = list(keyword_vectorizer.get_feature_names_out())
+
+        ml_vectorizer = TfidfVectorizer(stop_words='english', max_features=100, ngram_range=(1, 2))
+        matrix = ml_vectorizer.fit_transform([normalize_for_ml(text), jd_clean])
+        ml_score = round(cosine_similarity(matrix[0:1], matrix[1:2])[0][0] * 100, 2)
+        return skills, keywords, ml_score
+
+    return legacy
+
+
+def make_shared_path(jd_text):
+    """
+    Feature extraction from one TokenStream per resume
+
+    Args:
+        jd_text: Job description text
+
+    Returns:
+        function: Takes a resume text, returns (skills, keywords, ml_score)
+    """
+    profile = get_job_profile(jd_text)
+
+    def shared(text):
+        tokens = tokenize(text)
+        return (
+            extract_skills(tokens),
+            extract_keywords_tfidf(tokens, top_n=15),
+            calculate_ml_match_score(tokens, profile)
+        )
+
+    return shared
+
+
+def time_per_call(func, texts, repeat):
+    """
+    Time a function over all texts
+
+    Returns:
+        float: Mean milliseconds per document
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark shared tokenization")
+    parser.add_argument('--documents', type=int, default=50, help="Synthetic resumes to process")
+    parser.add_argument('--pages', type=int, default=2, help="Approximate pages per resume")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the documents")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = ['\n'.join(generate_resume_lines(rng, args.pages)) for _ in range(args.documents)]
+    jd_text = generate_jd_text(rng)
+
+    legacy = make_legacy_path(jd_text)
+    shared = make_shared_path(jd_text)
+
+    # Skills and the ML score are unchanged; keywords may differ on ties
+    # and on words NLTK split differently (e.g. "don't")
+    for text in texts:
+        old, new = legacy(text), shared(text)
+        if old[0] != new[0] or old[2] != new[2]:
+            sys.exit("Mismatch between old and shared skill or ML scoring")
+
+    word_tokenizer, tokenizer_name = _legacy_word_tokenizer()
+    legacy_tokenize_ms = time_per_call(
+        lambda text: (normalize_for_ml(text), word_tokenizer(text.lower())), texts, args.repeat
+    )
+    def shared_tokens(text):
+        stream = tokenize(text)
+        return stream.ml_tokens, stream.keyword_tokens
+
+    shared_tokenize_ms = time_per_call(shared_tokens, texts, args.repeat)
+    legacy_ms = time_per_call(legacy, texts, args.repeat)
+    shared_ms = time_per_call(shared, texts, args.repeat)
+
+    total_chars = sum(len(text) for text in texts)
+    print(f"Documents: {len(texts)} ({total_chars // len(texts)} chars each on average)")
+    print(f"Old keyword tokenizer:         {tokenizer_name}")
+    print(f"Tokenization, old (2 passes):  {legacy_tokenize_ms:.3f} ms/doc")
+    print(f"Tokenization, shared stream:   {shared_tokenize_ms:.3f} ms/doc")
+    print(f"Skills + keywords + ML, old:   {legacy_ms:.3f} ms/doc")
+    print(f"Skills + keywords + ML, new:   {shared_ms:.3f} ms/doc")
+    print(f"Saving per document:           {legacy_ms - shared_ms:.3f} ms ({legacy_ms / shared_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Benchmark Suite
+Measures throughput, latency percentiles and peak memory of the main
+pipeline stages on a synthetic corpus
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --output new.json --compare results.json
+
+With --compare, any stage whose p50 latency grew by more than --threshold
+(default 20%) is reported as a regression and the exit status is 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_corpus import generate_corpus
+from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx, clean_text
+from utils.nlp_processor import extract_skills, extract_keywords_tfidf
+from utils.matcher import calculate_match_score
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list
+
+    Args:
+        sorted_values: Sorted list of numbers
+        fraction: Percentile as a fraction (e.g. 0.95)
+
+    Returns:
+        float: Percentile value
+    """
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def measure(func, inputs, repeat=1, memory_samples=5):
+    """
+    Time a function over a list of inputs and record its peak memory
+
+    Args:
+        func: Function taking one input
+        inputs: List of inputs
+        repeat: Passes over the inputs
+        memory_samples: Inputs to run again under tracemalloc
+
+    Returns:
+        dict: Throughput, latency percentiles (ms) and peak memory (bytes)
+    """
+    # Warm-up call so one-time imports and caches are not measured
+    func(inputs[0])
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            call_start = time.perf_counter()
+            func(value)
+            latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows everything down, so measure memory separately
+    peak_memory = 0
+    for value in inputs[:memory_samples]:
+        tracemalloc.start()
+        func(value)
+        peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'throughput_per_s': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_memory_bytes': peak_memory
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(corpus_dir, count, pages, skill_density, seed, repeat):
+    """
+    Generate the corpus and benchmark every stage
+
+    Returns:
+        dict: Run metadata and per-stage results
+    """
+    paths = generate_corpus(corpus_dir, count, pages, skill_density, seed)
+    with open(paths['jd'], encoding='utf-8') as f:
+        jd_text = f.read()
+
+    # Text for the NLP stages comes from the extracted PDFs
+    resume_texts = [clean_text(extract_text_from_pdf(path, parallel=False)) for path in paths['pdf']]
+
+    stages = {
+        'extract_text_from_pdf': (lambda path: extract_text_from_pdf(path, parallel=False), paths['pdf']),
+        'extract_text_from_docx': (extract_text_from_docx, paths['docx']),
+        'extract_skills': (extract_skills, resume_texts),
+        'extract_keywords_tfidf': (extract_keywords_tfidf, resume_texts),
+        'calculate_match_score': (lambda text: calculate_match_score(text, jd_text), resume_texts)
+    }
+
+    results = {}
+    for name, (func, inputs) in stages.items():
+        print(f"Benchmarking {name}...", file=sys.stderr)
+        results[name] = measure(func, inputs, repeat=repeat)
+
+    try:
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        max_rss = None
+
+    return {
+        'metadata': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'corpus': {'count': count, 'pages': pages, 'skill_density': skill_density, 'seed': seed},
+            'repeat': repeat,
+            'process_max_rss_bytes': max_rss
+        },
+        'stages': results
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Find stages whose p50 latency regressed against a baseline run
+
+    Args:
+        current: Results from run_benchmarks
+        baseline: Results loaded from an earlier JSON file
+        threshold: Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        list: Human-readable regression descriptions
+    """
+    regressions = []
+    for name, stats in current['stages'].items():
+        old = baseline.get('stages', {}).get(name)
+        if not old or not old['p50_ms']:
+            continue
+        change = stats['p50_ms'] / old['p50_ms'] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: p50 {old['p50_ms']:.3f} ms -> {stats['p50_ms']:.3f} ms (+{change:.0%})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume screening pipeline")
+    parser.add_argument('--output', default='benchmark_results.json', help="Results JSON file")
+    parser.add_argument('--compare', default=None, help="Baseline results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed p50 slowdown before flagging")
+    parser.add_argument('--count', type=int, default=20, help="Resumes per format")
+    parser.add_argument('--pages', type=int, default=2, help="Approximate pages per resume")
+    parser.add_argument('--skill-density', type=float, default=0.1, help="Share of words that are skills")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for the corpus")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the corpus per stage")
+    parser.add_argument('--corpus-dir', default=None, help="Keep the generated corpus here")
+    args = parser.parse_args()
+
+    if args.corpus_dir:
+        results = run_benchmarks(args.corpus_dir, args.count, args.pages, args.skill_density,
+                                 args.seed, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            results = run_benchmarks(corpus_dir, args.count, args.pages, args.skill_density,
+                                     args.seed, args.repeat)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'stage':<26} {'docs/s':>9} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'peak_KiB':>9}")
+    for name, stats in results['stages'].items():
+        print(f"{name:<26} {stats['throughput_per_s']:>9.1f} {stats['p50_ms']:>9.2f} "
+              f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} {stats['peak_memory_bytes'] / 1024:>9.0f}")
+    print(f"Results saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
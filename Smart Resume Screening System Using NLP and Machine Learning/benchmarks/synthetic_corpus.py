@@ -0,0 +1,213 @@
+"""
+Synthetic Corpus Generator
+Builds reproducible resumes and job descriptions for benchmarking
+
+Usage:
+    python benchmarks/synthetic_corpus.py --output corpus/ --count 50 --pages 3
+"""
+
+import argparse
+import os
+import random
+import sys
+import textwrap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.taxonomy import get_taxonomy
+
+
+FILLER_WORDS = (
+    'developed designed implemented maintained improved delivered led managed '
+    'built optimized migrated automated reviewed supported analyzed reduced '
+    'increased scalable reliable production customer team project platform '
+    'service application system feature performance latency cost quality '
+    'stakeholders requirements release deployment pipeline data reporting '
+    'dashboard integration workflow process documentation mentoring onboarding'
+).split()
+
+SECTION_HEADINGS = ['SUMMARY', 'EXPERIENCE', 'SKILLS', 'PROJECTS', 'EDUCATION']
+
+# Roughly one US-letter page of 11pt text
+LINES_PER_PAGE = 50
+WORDS_PER_LINE = 12
+
+# Characters of 10pt Helvetica that fit between the PDF page margins (512pt),
+# so pdfium's bounded text extraction never clips a word
+PDF_LINE_CHARS = 80
+
+
+def _skill_vocabulary():
+    """All skill names and synonyms a generated document can mention"""
+    taxonomy = get_taxonomy()
+    vocabulary = set(taxonomy.skills)
+    for synonyms in taxonomy.synonyms.values():
+        vocabulary.update(synonyms)
+    return sorted(vocabulary)
+
+
+def generate_resume_lines(rng, pages=2, skill_density=0.1):
+    """
+    Generate the lines of one synthetic resume
+
+    Args:
+        rng: random.Random instance
+        pages: Approximate length in pages
+        skill_density: Share of words (0-1) that are skill mentions
+
+    Returns:
+        list: Lines of text
+    """
+    vocabulary = _skill_vocabulary()
+    total_lines = max(1, pages * LINES_PER_PAGE)
+    lines = [f"Candidate {rng.randint(1000, 9999)}", "candidate@example.com"]
+
+    section_every = max(1, total_lines // len(SECTION_HEADINGS))
+    for line_number in range(total_lines - len(lines)):
+        if line_number % section_every == 0:
+            lines.append(SECTION_HEADINGS[(line_number // section_every) % len(SECTION_HEADINGS)])
+            continue
+        words = [
+            rng.choice(vocabulary) if rng.random() < skill_density else rng.choice(FILLER_WORDS)
+            for _ in range(WORDS_PER_LINE)
+        ]
+        lines.append('- ' + ' '.join(words))
+    return lines
+
+
+def generate_jd_text(rng, skill_count=12):
+    """
+    Generate a synthetic job description
+
+    Args:
+        rng: random.Random instance
+        skill_count: Number of required skills
+
+    Returns:
+        str: Job description text
+    """
+    skills = rng.sample(_skill_vocabulary(), skill_count)
+    lines = ["Software Engineer", "", "Requirements:"]
+    lines += [f"- Experience with {skill}" for skill in skills]
+    lines += ["", "Responsibilities:"]
+    lines += ['- ' + ' '.join(rng.choice(FILLER_WORDS) for _ in range(10)) for _ in range(6)]
+    return '\n'.join(lines)
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(lines, path):
+    """
+    Write lines of text to a minimal PDF (Helvetica, one column)
+
+    Args:
+        lines: Lines of text (Latin-1 characters only), wrapped to the page width
+        path: Destination file
+    """
+    lines = [
+        wrapped for line in lines
+        for wrapped in textwrap.wrap(line, PDF_LINE_CHARS, break_on_hyphens=False) or ['']
+    ]
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)] or [[]]
+
+    # Object 1: catalog, 2: page tree, 3: font, then (page, content) pairs
+    objects = {3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for i, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        commands = ' '.join(f"({_pdf_escape(line)}) '" for line in page_lines)
+        stream = f"BT /F1 10 Tf 14 TL 50 770 Td {commands} ET".encode('latin-1', 'replace')
+        objects[content_id] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+    objects[1] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = len(output)
+        output += b"%d 0 obj\n%s\nendobj\n" % (object_id, objects[object_id])
+
+    xref_offset = len(output)
+    size = max(objects) + 1
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for object_id in range(1, size):
+        output += b"%010d 00000 n \n" % offsets[object_id]
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset)
+
+    with open(path, 'wb') as f:
+        f.write(output)
+
+
+def write_docx(lines, path):
+    """
+    Write lines of text to a DOCX file, headings in the Heading 1 style
+
+    Args:
+        lines: Lines of text
+        path: Destination file
+    """
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        if line in SECTION_HEADINGS:
+            document.add_heading(line.title(), level=1)
+        else:
+            document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_corpus(output_dir, count=20, pages=2, skill_density=0.1, seed=0):
+    """
+    Write a corpus of PDF and DOCX resumes plus a job description
+
+    Args:
+        output_dir: Destination directory
+        count: Number of resumes of each format
+        pages: Approximate resume length in pages
+        skill_density: Share of words that are skill mentions
+        seed: Random seed, so runs are reproducible
+
+    Returns:
+        dict: Paths of the generated files ('pdf', 'docx' lists, 'jd' path)
+    """
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+
+    paths = {'pdf': [], 'docx': [], 'jd': os.path.join(output_dir, 'job_description.txt')}
+    for i in range(count):
+        lines = generate_resume_lines(rng, pages, skill_density)
+        pdf_path = os.path.join(output_dir, f"resume_{i:04d}.pdf")
+        docx_path = os.path.join(output_dir, f"resume_{i:04d}.docx")
+        write_pdf(lines, pdf_path)
+        write_docx(lines, docx_path)
+        paths['pdf'].append(pdf_path)
+        paths['docx'].append(docx_path)
+
+    with open(paths['jd'], 'w', encoding='utf-8') as f:
+        f.write(generate_jd_text(rng))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    parser.add_argument('--output', required=True, help="Destination directory")
+    parser.add_argument('--count', type=int, default=20, help="Resumes per format")
+    parser.add_argument('--pages', type=int, default=2, help="Approximate pages per resume")
+    parser.add_argument('--skill-density', type=float, default=0.1, help="Share of words that are skills")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.output, args.count, args.pages, args.skill_density, args.seed)
+    print(f"Wrote {len(paths['pdf'])} PDF and {len(paths['docx'])} DOCX resumes to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+"""
+Bulk Screening Module
+Headless command line screening of a directory or zip of resumes
+
+Usage:
+    python -m utils.bulk_screen --jd job.txt --input resumes/ --output results.csv
+    python -m utils.bulk_screen --jd job.txt --input resumes.zip --output results.jsonl
+
+Results are written as each resume finishes, so an interrupted run can be
+restarted with the same command and will skip resumes already in the output.
+
+With --dedup-index, near-duplicates of earlier submissions (this run or
+previous ones) reuse the earlier score instead of being scored again. A
+score is only reused for the same job description, skill taxonomy and
+models, and a resume whose file changed under the same name is rescored.
+
+With --store, scored rows are also appended to a columnar results store
+for analytics (see utils.results_store).
+
+The store and the dedup index are written in batches and at the end of a
+run. A resumed run first adds any rows a killed run had already written to
+the output but not yet saved to them.
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import repeat
+
+from utils.text_extractor import extract_text, extract_text_from_pdf, clean_text
+from utils.matcher import calculate_match_score, scoring_version
+from utils.job_profile import hash_text
+from utils.resources import prewarm
+
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+# Rows buffered per results store segment
+STORE_SEGMENT_ROWS = 10000
+
+# Columns written for every resume; list fields are joined with '; ' in CSV
+RESULT_FIELDS = [
+    'resume_id', 'match_percentage', 'ml_match_score', 'semantic_match_score', 'total_matched',
+    'total_jd_requirements', 'matched_skills', 'missing_skills',
+    'resume_skills', 'duplicate_of', 'error'
+]
+
+# Typed columns, converted back when CSV output is read in again
+FLOAT_FIELDS = ('match_percentage', 'ml_match_score', 'semantic_match_score')
+INT_FIELDS = ('total_matched', 'total_jd_requirements')
+LIST_FIELDS = ('matched_skills', 'missing_skills', 'resume_skills')
+
+
+def iter_resume_sources(input_path):
+    """
+    Yield every resume in a directory (recursively) or a zip archive
+
+    Args:
+        input_path: Directory or .zip file
+
+    Yields:
+        tuple: (resume_id, loader) where loader() returns the file bytes
+    """
+    if zipfile.is_zipfile(input_path):
+        with zipfile.ZipFile(input_path) as archive:
+            names = sorted(
+                name for name in archive.namelist()
+                if name.lower().endswith(RESUME_EXTENSIONS) and not name.endswith('/')
+            )
+        for name in names:
+            yield name, _ZipMemberLoader(input_path, name)
+    else:
+        for root, dirs, files in os.walk(input_path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, input_path), _FileLoader(path)
+
+
+class _FileLoader:
+    """Picklable callable that reads a file from disk"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+
+class _ZipMemberLoader:
+    """Picklable callable that reads one member of a zip archive"""
+
+    def __init__(self, archive_path, name):
+        self.archive_path = archive_path
+        self.name = name
+
+    def __call__(self):
+        with zipfile.ZipFile(self.archive_path) as archive:
+            return archive.read(self.name)
+
+
+def _extract_clean_text(resume_id, data):
+    """Extract and clean the text of one resume's bytes"""
+    if resume_id.lower().endswith('.pdf'):
+        # Already inside a worker process, so no nested page-level pool
+        raw_text = extract_text_from_pdf(io.BytesIO(data), parallel=False)
+    else:
+        raw_text = extract_text(io.BytesIO(data), resume_id)
+    return clean_text(raw_text)
+
+
+def _error_row(resume_id, error):
+    row = {field: None for field in RESULT_FIELDS}
+    row['resume_id'] = resume_id
+    row['error'] = str(error)
+    return row
+
+
+def score_resume_text(resume_id, resume_text, jd_text):
+    """
+    Score already extracted resume text (runs in a worker process)
+
+    Args:
+        resume_id: Identifier written to the output
+        resume_text: Cleaned resume text
+        jd_text: Job description text content
+
+    Returns:
+        dict: Result row with RESULT_FIELDS keys
+    """
+    try:
+        results = calculate_match_score(resume_text, jd_text)
+        row = {field: results.get(field) for field in RESULT_FIELDS}
+        row['ml_match_score'] = float(results['ml_match_score'])
+        row['error'] = ''
+    except Exception as e:
+        return _error_row(resume_id, e)
+    row['resume_id'] = resume_id
+    return row
+
+
+def screen_resume(resume_id, loader, jd_text):
+    """
+    Extract, clean and score one resume (runs in a worker process)
+
+    Args:
+        resume_id: Identifier written to the output
+        loader: Callable returning the file bytes
+        jd_text: Job description text content
+
+    Returns:
+        dict: Result row with RESULT_FIELDS keys
+    """
+    try:
+        resume_text = _extract_clean_text(resume_id, loader())
+    except Exception as e:
+        return _error_row(resume_id, e)
+    return score_resume_text(resume_id, resume_text, jd_text)
+
+
+def prepare_resume(resume_id, loader, hasher):
+    """
+    Extract a resume and compute its dedup fingerprints (runs in a worker process)
+
+    Args:
+        resume_id: Resume identifier
+        loader: Callable returning the file bytes
+        hasher: MinHasher from utils.dedup
+
+    Returns:
+        dict: 'resume_id', 'text', 'file_hash', 'signature' and 'error'
+    """
+    try:
+        data = loader()
+        resume_text = _extract_clean_text(resume_id, data)
+        return {
+            'resume_id': resume_id,
+            'text': resume_text,
+            'file_hash': hashlib.sha256(data).hexdigest(),
+            'signature': hasher.signature(resume_text),
+            'error': ''
+        }
+    except Exception as e:
+        return {'resume_id': resume_id, 'error': str(e)}
+
+
+def score_key(jd_text):
+    """
+    Key of stored scores in the dedup index
+
+    Args:
+        jd_text: Job description text content
+
+    Returns:
+        str: Hash of the JD text and the taxonomy and model versions, since
+             stored scores are only valid for the ones that produced them
+    """
+    return hash_text(f"{scoring_version()}\n{jd_text}")
+
+
+def iter_screening_results(sources, jd_text, workers=None, max_pending=None, dedup=None):
+    """
+    Screen resumes on a worker pool, keeping a bounded number in flight
+
+    With a dedup index, workers first extract each resume and fingerprint
+    it; near-duplicates of an already scored resume reuse that score, and
+    only the rest go back to the pool for scoring.
+
+    Args:
+        sources: Iterable of (resume_id, loader) tuples
+        jd_text: Job description text content
+        workers: Number of worker processes (default: CPU count)
+        max_pending: Maximum submitted-but-unfinished resumes
+        dedup: Optional DuplicateIndex, updated as resumes are screened
+
+    Yields:
+        dict: Result rows in completion order
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    sources = iter(sources)
+    jd_key = score_key(jd_text)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Future -> prepared resume it scores (None for single-step futures)
+        pending = {}
+        exhausted = False
+        while pending or not exhausted:
+            # Top up the window without reading ahead of it
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    resume_id, loader = next(sources)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if dedup is None:
+                    pending[pool.submit(screen_resume, resume_id, loader, jd_text)] = None
+                else:
+                    pending[pool.submit(prepare_resume, resume_id, loader, dedup.hasher)] = 'prepare'
+
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = pending.pop(future)
+                result = future.result()
+
+                if stage is None:
+                    yield result
+                elif stage == 'prepare':
+                    if result['error']:
+                        yield _error_row(result['resume_id'], result['error'])
+                        continue
+                    resume_id = result['resume_id']
+                    if resume_id in dedup and dedup.file_hash_of(resume_id) != result['file_hash']:
+                        # Same id, different file (e.g. an edited resume.pdf): score it afresh
+                        prior = duplicate_of = None
+                    elif resume_id in dedup:
+                        # Screened in an earlier run from the same file: its own score is reusable
+                        prior = dedup.get_score(resume_id, jd_key)
+                        duplicate_of = prior.get('duplicate_of') if prior else None
+                    else:
+                        duplicate_of = dedup.find_exact(result['file_hash'])
+                        if duplicate_of is None:
+                            duplicate_of, _ = dedup.query(result['signature'])
+                        prior = dedup.get_score(duplicate_of, jd_key) if duplicate_of else None
+                    if prior is not None:
+                        # Near-duplicate of a scored resume: reuse its score
+                        dedup.add(resume_id, result['signature'], result['file_hash'])
+                        yield dict(prior, resume_id=resume_id, duplicate_of=duplicate_of)
+                    else:
+                        future = pool.submit(score_resume_text, result['resume_id'], result['text'], jd_text)
+                        pending[future] = result
+                else:
+                    duplicate_of, _ = dedup.add(stage['resume_id'], stage['signature'], stage['file_hash'])
+                    result['duplicate_of'] = duplicate_of
+                    if not result['error']:
+                        dedup.put_score(stage['resume_id'], jd_key,
+                                        {key: value for key, value in result.items() if key != 'resume_id'})
+                    yield result
+
+
+def read_completed_ids(output_path, output_format):
+    """
+    Collect resume ids already present in an existing output file
+
+    Args:
+        output_path: CSV or JSONL results file
+        output_format: 'csv' or 'jsonl'
+
+    Returns:
+        set: Completed resume ids
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+
+    with open(output_path, newline='', encoding='utf-8') as f:
+        if output_format == 'csv':
+            for row in csv.DictReader(f):
+                # Rows cut short by an interruption have no 'error' column
+                if row.get('error') is not None:
+                    completed.add(row['resume_id'])
+        else:
+            for line in f:
+                try:
+                    completed.add(json.loads(line)['resume_id'])
+                except (ValueError, KeyError):
+                    # A partially written last line from an interrupted run
+                    continue
+    return completed
+
+
+def _parse_csv_row(row):
+    """Convert a CSV output row back to the types screening produced"""
+    parsed = {}
+    for field in RESULT_FIELDS:
+        value = row.get(field) or ''
+        if field in LIST_FIELDS:
+            parsed[field] = [skill for skill in value.split('; ') if skill]
+        elif field == 'error':
+            parsed[field] = value
+        elif not value:
+            parsed[field] = None
+        elif field in FLOAT_FIELDS:
+            parsed[field] = float(value)
+        elif field in INT_FIELDS:
+            parsed[field] = int(float(value))
+        else:
+            parsed[field] = value
+    return parsed
+
+
+def read_result_rows(output_path, output_format):
+    """
+    Read the complete rows of an existing output file
+
+    Args:
+        output_path: CSV or JSONL results file
+        output_format: 'csv' or 'jsonl'
+
+    Returns:
+        list: Result dicts with RESULT_FIELDS keys
+    """
+    rows = []
+    if not os.path.exists(output_path):
+        return rows
+
+    with open(output_path, newline='', encoding='utf-8') as f:
+        if output_format == 'csv':
+            rows = [_parse_csv_row(row) for row in csv.DictReader(f) if row.get('error') is not None]
+        else:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+    return rows
+
+
+def recover_unsaved_rows(rows, sources, jd_text, store=None, job='', dedup=None, workers=None):
+    """
+    Add output rows of an interrupted run that never reached the store or dedup index
+
+    Resumed runs skip every resume already in the output, so without this
+    the rows a killed run had buffered would never be stored. Resumes
+    missing from the index are extracted and fingerprinted again, and their
+    output row is stored as their score.
+
+    Args:
+        rows: Rows of the existing output (see read_result_rows)
+        sources: Iterable of (resume_id, loader) tuples
+        jd_text: Job description text content
+        store: Optional ResultsStore
+        job: Job name in the store
+        dedup: Optional DuplicateIndex
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        tuple: (rows added to the store, resumes added to the index)
+    """
+    rows = [row for row in rows if not row.get('error')]
+    stored = indexed = 0
+
+    if store is not None:
+        present = store.resume_ids(job)
+        stored = store.append([row for row in rows if row['resume_id'] not in present], job)
+
+    if dedup is not None:
+        missing = {row['resume_id']: row for row in rows if row['resume_id'] not in dedup}
+        sources = [(resume_id, loader) for resume_id, loader in sources if resume_id in missing]
+        if sources:
+            jd_key = score_key(jd_text)
+            resume_ids, loaders = zip(*sources)
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+                for result in pool.map(prepare_resume, resume_ids, loaders, repeat(dedup.hasher)):
+                    if result['error']:
+                        continue
+                    row = missing[result['resume_id']]
+                    dedup.add(result['resume_id'], result['signature'], result['file_hash'])
+                    dedup.put_score(result['resume_id'], jd_key,
+                                    {key: value for key, value in row.items() if key != 'resume_id'})
+                    indexed += 1
+    return stored, indexed
+
+
+def truncate_partial_line(path, block_size=65536):
+    """
+    Cut a file back to its last newline, dropping a row an interruption left half written
+
+    Args:
+        path: File to repair (a missing file is left alone)
+        block_size: Bytes read per step while scanning backwards
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            f.truncate(position)
+
+
+class ResultWriter:
+    """Appends result rows to a CSV or JSONL file, flushing each row"""
+
+    def __init__(self, output_path, output_format):
+        self.output_format = output_format
+        # Otherwise the next row would be glued onto a partial last line
+        truncate_partial_line(output_path)
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, 'a', newline='', encoding='utf-8')
+        if output_format == 'csv':
+            self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+            if is_new:
+                self._writer.writeheader()
+
+    def write(self, row):
+        if self.output_format == 'csv':
+            self._writer.writerow({
+                key: '; '.join(value) if isinstance(value, list) else value
+                for key, value in row.items()
+            })
+        else:
+            self._file.write(json.dumps(row) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Screen a directory or zip of resumes against a job description")
+    parser.add_argument('--jd', required=True, help="Job description text file")
+    parser.add_argument('--input', required=True, help="Directory or .zip of PDF/DOCX resumes")
+    parser.add_argument('--output', required=True, help="Results file (.csv or .jsonl)")
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help="Output format (default: from extension)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--progress-every', type=int, default=100, help="Report progress every N resumes")
+    parser.add_argument('--dedup-index', default=None, help="Near-duplicate index (.npz) to reuse scores")
+    parser.add_argument('--dedup-threshold', type=float, default=0.85, help="Similarity for a duplicate (new index)")
+    parser.add_argument('--store', default=None, help="Also append results to this columnar results store")
+    parser.add_argument('--job', default=None, help="Job name in the results store (default: JD file name)")
+    args = parser.parse_args(argv)
+
+    output_format = args.format or ('jsonl' if args.output.lower().endswith('.jsonl') else 'csv')
+
+    with open(args.jd, encoding='utf-8') as f:
+        jd_text = f.read()
+
+    # Resume support: skip anything already written by a previous run. A
+    # half-written last row is cut off first, so it is not counted as done
+    # and then lost when the writer truncates it
+    truncate_partial_line(args.output)
+    completed = read_completed_ids(args.output, output_format)
+    sources = (
+        (resume_id, loader) for resume_id, loader in iter_resume_sources(args.input)
+        if resume_id not in completed
+    )
+    if completed:
+        print(f"Resuming: {len(completed)} resumes already screened", file=sys.stderr)
+
+    dedup = None
+    if args.dedup_index:
+        from utils.dedup import DuplicateIndex
+        dedup = DuplicateIndex.open(args.dedup_index, args.dedup_threshold)
+
+    store = None
+    store_rows = []
+    job = args.job or os.path.splitext(os.path.basename(args.jd))[0]
+    if args.store:
+        from utils.results_store import ResultsStore
+        store = ResultsStore(args.store)
+
+    # Load heavy modules once here so forked workers inherit them
+    prewarm()
+
+    if completed and (store is not None or dedup is not None):
+        stored, indexed = recover_unsaved_rows(
+            read_result_rows(args.output, output_format), iter_resume_sources(args.input), jd_text,
+            store, job, dedup, args.workers
+        )
+        if stored or indexed:
+            print(f"Recovered {stored} store rows and {indexed} dedup entries from the output",
+                  file=sys.stderr)
+
+    processed = failed = duplicates = 0
+    start = time.perf_counter()
+    try:
+        with ResultWriter(args.output, output_format) as writer:
+            for row in iter_screening_results(sources, jd_text, workers=args.workers, dedup=dedup):
+                writer.write(row)
+                processed += 1
+                if row['error']:
+                    failed += 1
+                if row.get('duplicate_of'):
+                    duplicates += 1
+                if store is not None:
+                    store_rows.append(row)
+                    if len(store_rows) >= STORE_SEGMENT_ROWS:
+                        store.append(store_rows, job)
+                        store_rows = []
+                if processed % args.progress_every == 0:
+                    rate = processed / (time.perf_counter() - start)
+                    print(f"Screened {processed} resumes ({failed} failed, {rate:.1f}/s)", file=sys.stderr)
+    finally:
+        if dedup is not None:
+            dedup.save(args.dedup_index)
+        if store is not None:
+            store.append(store_rows, job)
+
+    elapsed = time.perf_counter() - start
+    print(f"Done: {processed} resumes screened, {failed} failed in {elapsed:.1f}s", file=sys.stderr)
+    if dedup is not None:
+        print(f"Near-duplicates: {duplicates}, clusters in index: {len(dedup.clusters())}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+"""
+Dedup Module
+Finds near-duplicate resumes with MinHash signatures and an LSH index
+
+Each cleaned resume is reduced to a MinHash signature over word shingles.
+Signatures are split into bands; resumes sharing any band land in the same
+bucket, so candidate duplicates are found without comparing against every
+earlier resume. Candidates are confirmed by their estimated Jaccard
+similarity. The index remembers scores per job description so a duplicate
+can reuse the score of its earlier submission, persists across runs and
+reports clusters of duplicates.
+
+Usage:
+    python -m utils.dedup --index dedup.npz --input resumes/ --threshold 0.85
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import zlib
+
+import numpy as np
+
+from utils.nlp_processor import normalize_for_ml
+
+
+# Mersenne prime for the (a * x + b) mod p hash family; x < p keeps products in uint64
+_PRIME = (1 << 31) - 1
+
+# Shingles hashed per numpy step, bounding the num_perm x shingles work array
+_SHINGLE_BATCH = 4096
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures over word shingles of normalized text
+    """
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        """
+        Args:
+            num_perm: Signature length (more = more accurate, slower)
+            shingle_size: Words per shingle
+            seed: Seed for the hash permutations (must match across runs)
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+
+    def shingles(self, text):
+        """
+        Set of word shingles of a text
+
+        Args:
+            text: Input text string
+
+        Returns:
+            set: Shingle strings
+        """
+        words = normalize_for_ml(text).split()
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {
+            ' '.join(words[i:i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        }
+
+    def signature(self, text):
+        """
+        MinHash signature of a text
+
+        Args:
+            text: Input text string
+
+        Returns:
+            numpy.ndarray or None: num_perm uint32 values, None for empty text
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) % _PRIME for shingle in self.shingles(text)),
+            dtype=np.uint64
+        )
+        if not len(hashes):
+            return None
+
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        for start in range(0, len(hashes), _SHINGLE_BATCH):
+            batch = hashes[start:start + _SHINGLE_BATCH]
+            permuted = (self._a[:, None] * batch[None, :] + self._b[:, None]) % _PRIME
+            np.minimum(signature, permuted.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+def lsh_parameters(threshold, num_perm):
+    """
+    Choose bands x rows so the LSH candidate threshold sits just below threshold
+
+    Pairs with similarity s become candidates with probability
+    1 - (1 - s^rows)^bands, which rises steeply around (1/bands)^(1/rows).
+
+    Args:
+        threshold: Target Jaccard similarity
+        num_perm: Signature length
+
+    Returns:
+        tuple: (bands, rows)
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class DuplicateIndex:
+    """
+    Persistent LSH index of resume signatures with duplicate clusters and
+    reusable scores
+    """
+
+    def __init__(self, threshold=0.85, num_perm=128, shingle_size=5, seed=1):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity at which resumes count as duplicates
+            num_perm: Signature length
+            shingle_size: Words per shingle
+            seed: MinHash seed
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm, shingle_size, seed)
+        self.bands, self.rows = lsh_parameters(threshold, num_perm)
+
+        self.ids = []
+        self._signatures = []
+        self._positions = {}
+        self._buckets = [{} for _ in range(self.bands)]
+        self._file_hashes = {}
+        self._id_hashes = {}
+        self._parents = {}
+        self._scores = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, resume_id):
+        return resume_id in self._positions
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def query(self, signature):
+        """
+        Find the most similar indexed resume above the threshold
+
+        Args:
+            signature: Signature from MinHasher.signature
+
+        Returns:
+            tuple: (resume_id, similarity), or (None, 0.0) if no duplicate
+        """
+        if signature is None:
+            return None, 0.0
+
+        candidates = set()
+        for band, key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best_id, best_similarity = None, 0.0
+        for position in sorted(candidates):
+            similarity = float(np.mean(self._signatures[position] == signature))
+            if similarity >= self.threshold and similarity > best_similarity:
+                best_id, best_similarity = self.ids[position], similarity
+        return best_id, best_similarity
+
+    def find_exact(self, file_hash):
+        """
+        Return the id of an indexed resume with identical file bytes, or None
+        """
+        return self._file_hashes.get(file_hash)
+
+    def file_hash_of(self, resume_id):
+        """
+        Return the file hash a resume was indexed with, or None
+        """
+        return self._id_hashes.get(resume_id)
+
+    def add(self, resume_id, signature, file_hash=None):
+        """
+        Index a resume and link it to its closest earlier duplicate
+
+        An id that is already indexed is left alone, unless a file hash is
+        given that differs from the stored one: the file behind the id has
+        changed, so its old signature, cluster links and scores are dropped
+        and the new content is indexed in their place.
+
+        Args:
+            resume_id: Unique resume identifier
+            signature: Signature from MinHasher.signature (None for empty text)
+            file_hash: Optional SHA-256 of the file bytes
+
+        Returns:
+            tuple: (duplicate_of, similarity) as returned by query()
+        """
+        position = self._positions.get(resume_id)
+        if position is not None:
+            if not file_hash or self._id_hashes.get(resume_id) == file_hash:
+                return None, 0.0
+            self._forget(resume_id, position)
+
+        duplicate_of, similarity = self.find_exact(file_hash), 1.0
+        if duplicate_of is None:
+            duplicate_of, similarity = self.query(signature)
+
+        if position is None:
+            position = len(self.ids)
+            self.ids.append(resume_id)
+            self._positions[resume_id] = position
+            self._signatures.append(None)
+        if signature is None:
+            # Kept for its file hash only; an empty text matches nothing
+            signature = np.zeros(self.hasher.num_perm, dtype=np.uint32)
+        else:
+            for band, key in self._band_keys(signature):
+                self._buckets[band].setdefault(key, []).append(position)
+        self._signatures[position] = signature
+        if file_hash:
+            self._id_hashes[resume_id] = file_hash
+            self._file_hashes.setdefault(file_hash, resume_id)
+        if duplicate_of is not None:
+            self._union(resume_id, duplicate_of)
+        return duplicate_of, similarity
+
+    def _forget(self, resume_id, position):
+        """Drop everything indexed for a resume except its position"""
+        signature = self._signatures[position]
+        if signature.any():
+            for band, key in self._band_keys(signature):
+                bucket = self._buckets[band][key]
+                bucket.remove(position)
+                if not bucket:
+                    del self._buckets[band][key]
+
+        file_hash = self._id_hashes.pop(resume_id, None)
+        if file_hash and self._file_hashes.get(file_hash) == resume_id:
+            del self._file_hashes[file_hash]
+            other = next((other for other, value in self._id_hashes.items() if value == file_hash), None)
+            if other is not None:
+                self._file_hashes[file_hash] = other
+
+        self._scores.pop(resume_id, None)
+
+        # Take the resume out of its cluster; the other members stay together
+        root = self._root(resume_id)
+        members = [
+            member for member in set(self._parents) | set(self._parents.values())
+            if member != resume_id and self._root(member) == root
+        ]
+        for member in members + [resume_id]:
+            self._parents.pop(member, None)
+        for member in members[1:]:
+            self._parents[member] = members[0]
+
+    def _root(self, resume_id):
+        root = resume_id
+        while self._parents.get(root, root) != root:
+            root = self._parents[root]
+        # Path compression
+        while resume_id != root:
+            parent = self._parents[resume_id]
+            self._parents[resume_id] = root
+            resume_id = parent
+        return root
+
+    def _union(self, first, second):
+        first_root, second_root = self._root(first), self._root(second)
+        if first_root != second_root:
+            self._parents[first_root] = second_root
+
+    def clusters(self):
+        """
+        Groups of resumes that are duplicates of each other
+
+        Returns:
+            list: Sorted lists of resume ids (only groups of two or more),
+                  largest first
+        """
+        groups = {}
+        # Roots are only referenced as parents, so include both sides
+        for resume_id in set(self._parents) | set(self._parents.values()):
+            groups.setdefault(self._root(resume_id), set()).add(resume_id)
+        return sorted((sorted(group) for group in groups.values() if len(group) > 1),
+                      key=lambda group: (-len(group), group[0]))
+
+    def get_score(self, resume_id, jd_key):
+        """
+        Stored score of a resume for a job description, or None
+
+        Args:
+            resume_id: Resume identifier
+            jd_key: Hash of the JD text and scoring version (see utils.bulk_screen)
+        """
+        return self._scores.get(resume_id, {}).get(jd_key)
+
+    def put_score(self, resume_id, jd_key, score):
+        """
+        Remember a resume's score for a job description
+
+        Args:
+            resume_id: Resume identifier
+            jd_key: Hash of the JD text and scoring version
+            score: JSON-serializable score dict
+        """
+        self._scores.setdefault(resume_id, {})[jd_key] = score
+
+    def save(self, path):
+        """
+        Write the index to a .npz file
+
+        Args:
+            path: Destination file
+        """
+        meta = {
+            'threshold': self.threshold,
+            'num_perm': self.hasher.num_perm,
+            'shingle_size': self.hasher.shingle_size,
+            'seed': self.hasher.seed,
+            'ids': self.ids,
+            'file_hashes': self._file_hashes,
+            'id_hashes': self._id_hashes,
+            'parents': self._parents,
+            'scores': self._scores
+        }
+        signatures = (np.vstack(self._signatures) if self._signatures
+                      else np.zeros((0, self.hasher.num_perm), dtype=np.uint32))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = path + '.tmp.npz'
+        np.savez(temp_path, meta=np.array(json.dumps(meta)), signatures=signatures)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read an index written by save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            DuplicateIndex: Loaded index
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data['meta']))
+            signatures = data['signatures']
+
+        index = cls(meta['threshold'], meta['num_perm'], meta['shingle_size'], meta['seed'])
+        for resume_id, signature in zip(meta['ids'], signatures):
+            position = len(index.ids)
+            index.ids.append(resume_id)
+            index._positions[resume_id] = position
+            index._signatures.append(signature)
+            if signature.any():
+                for band, key in index._band_keys(signature):
+                    index._buckets[band].setdefault(key, []).append(position)
+        index._file_hashes = meta['file_hashes']
+        # Indexes saved before per-id hashes were kept know only the first id per hash
+        index._id_hashes = meta.get('id_hashes') or {
+            resume_id: file_hash for file_hash, resume_id in meta['file_hashes'].items()
+        }
+        index._parents = meta['parents']
+        index._scores = meta['scores']
+        return index
+
+    @classmethod
+    def open(cls, path, threshold=0.85):
+        """
+        Load an index if the file exists, otherwise create an empty one
+
+        Args:
+            path: .npz file
+            threshold: Threshold for a new index (an existing index keeps its own)
+
+        Returns:
+            DuplicateIndex: Index
+        """
+        if os.path.exists(path):
+            return cls.load(path)
+        return cls(threshold)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utils.bulk_screen import iter_resume_sources
+    from utils.text_extractor import extract_text, clean_text
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate resumes")
+    parser.add_argument('--index', required=True, help="Index file (.npz), created if missing")
+    parser.add_argument('--input', required=True, help="Directory or .zip of resumes to add")
+    parser.add_argument('--threshold', type=float, default=0.85, help="Similarity threshold (new index)")
+    args = parser.parse_args(argv)
+
+    index = DuplicateIndex.open(args.index, args.threshold)
+    added = duplicates = 0
+    for resume_id, loader in iter_resume_sources(args.input):
+        try:
+            data = loader()
+            file_hash = hashlib.sha256(data).hexdigest()
+            if index.file_hash_of(resume_id) == file_hash:
+                continue
+            signature = None
+            if index.find_exact(file_hash) is None:
+                signature = index.hasher.signature(clean_text(extract_text(io.BytesIO(data), resume_id)))
+        except Exception as e:
+            print(f"Skipping {resume_id}: {e}", file=sys.stderr)
+            continue
+        duplicate_of, similarity = index.add(resume_id, signature, file_hash)
+        added += 1
+        if duplicate_of is not None:
+            duplicates += 1
+            print(f"{resume_id} ~ {duplicate_of} ({similarity:.0%})")
+    index.save(args.index)
+
+    clusters = index.clusters()
+    print(f"Added {added} resumes ({duplicates} near-duplicates); index holds {len(index)}, "
+          f"{len(clusters)} duplicate clusters")
+    for cluster in clusters:
+        print(f"  [{len(cluster)}] " + ', '.join(cluster))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,478 @@
+"""
+Distributed Screening Module
+Shards a resume corpus across worker processes on several hosts
+
+A coordinator splits the corpus into shards and hands them out to workers
+over authenticated sockets (multiprocessing.connection). Each worker runs
+the usual extract + score pipeline on its shard and sends back the shard's
+top-k rows; the coordinator merges them into one global ranking. A worker
+that disconnects or misses the shard timeout has its shard reassigned.
+
+Usage (coordinator; --local-workers also starts workers on this machine):
+    python -m utils.distributed coordinator --jd job.txt --input resumes/ \\
+        --output top.csv --top-k 100 --listen 0.0.0.0:6100 --local-workers 4
+
+Usage (on each additional host, with the same RESUME_CLUSTER_KEY):
+    python -m utils.distributed worker --connect coordinator-host:6100 --processes 8
+
+Messages are pickled, so only run workers and coordinator on a trusted
+network and always set RESUME_CLUSTER_KEY to a shared secret.
+"""
+
+import argparse
+import heapq
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import Listener, Client
+
+from utils.bulk_screen import iter_resume_sources, screen_resume, _error_row, ResultWriter
+from utils.resources import prewarm
+
+
+DEFAULT_PORT = 6100
+
+# Resumes per shard; smaller shards lose less work when a worker fails
+DEFAULT_SHARD_SIZE = 50
+
+# Seconds a worker may spend on one shard before it is reassigned
+SHARD_TIMEOUT = 600
+
+# Assignments per shard before its resumes are reported as failed
+MAX_SHARD_ATTEMPTS = 3
+
+# Seconds a worker keeps retrying to reach the coordinator
+CONNECT_TIMEOUT = 60
+
+
+def get_authkey():
+    """Shared cluster secret from RESUME_CLUSTER_KEY (None if unset)"""
+    key = os.environ.get('RESUME_CLUSTER_KEY')
+    return key.encode('utf-8') if key else None
+
+
+def parse_address(value, default_host='127.0.0.1'):
+    """
+    Parse 'host:port' (or just 'port') into an address tuple
+
+    Args:
+        value: Address string
+        default_host: Host used when only a port is given
+
+    Returns:
+        tuple: (host, port)
+    """
+    host, _, port = value.rpartition(':')
+    return (host or default_host, int(port))
+
+
+def ranking_key(row):
+    """Sort key for rankings: best ML score first, then skill match, then id"""
+    return (-row['ml_match_score'], -row['match_percentage'], row['resume_id'])
+
+
+def top_rows(rows, top_k):
+    """
+    Best top_k scored rows (rows with an error are left out)
+
+    Args:
+        rows: Iterable of result rows from bulk_screen
+        top_k: Number of rows to keep
+
+    Returns:
+        list: Rows ordered by ranking_key
+    """
+    return heapq.nsmallest(top_k, (row for row in rows if not row['error']), key=ranking_key)
+
+
+def merge_rankings(rankings, top_k):
+    """
+    Merge per-shard top-k lists into a global top-k
+
+    Args:
+        rankings: Iterable of row lists, each ordered by ranking_key
+        top_k: Number of rows to keep
+
+    Returns:
+        list: Rows ordered by ranking_key
+    """
+    merged = heapq.merge(*rankings, key=ranking_key)
+    return [row for _, row in zip(range(top_k), merged)]
+
+
+def build_shards(sources, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Group (resume_id, loader) pairs into shards
+
+    Args:
+        sources: Iterable of (resume_id, loader) tuples
+        shard_size: Resumes per shard
+
+    Returns:
+        list: Lists of (resume_id, loader) tuples
+    """
+    shards, shard = [], []
+    for source in sources:
+        shard.append(source)
+        if len(shard) >= shard_size:
+            shards.append(shard)
+            shard = []
+    if shard:
+        shards.append(shard)
+    return shards
+
+
+class Coordinator:
+    """
+    Hands out shards to connected workers and merges their rankings
+
+    Attributes:
+        address: (host, port) the coordinator listens on
+        ranking: Global top-k rows merged so far
+        errors: Rows for resumes that could not be screened
+        stats: Counters ('screened', 'failed', 'reassigned', 'workers')
+    """
+
+    def __init__(self, shards, jd_text, top_k=100, address=('127.0.0.1', DEFAULT_PORT), authkey=None,
+                 shard_timeout=SHARD_TIMEOUT, max_attempts=MAX_SHARD_ATTEMPTS):
+        """
+        Args:
+            shards: Lists of (resume_id, loader) tuples, e.g. from build_shards
+            jd_text: Job description text content
+            top_k: Size of the global ranking
+            address: (host, port) to listen on; port 0 picks a free port
+            authkey: Shared secret bytes workers must present
+            shard_timeout: Seconds before an unanswered shard is reassigned
+            max_attempts: Assignments per shard before giving up on it
+        """
+        self.shards = shards
+        self.jd_text = jd_text
+        self.top_k = top_k
+        self.shard_timeout = shard_timeout
+        self.max_attempts = max_attempts
+
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+
+        self.ranking = []
+        self.errors = []
+        self.stats = {'screened': 0, 'failed': 0, 'reassigned': 0, 'workers': 0}
+
+        self._todo = deque(range(len(shards)))
+        self._attempts = [0] * len(shards)
+        self._remaining = len(shards)
+        self._finished = False
+        self._condition = threading.Condition()
+
+    def run(self, on_progress=None):
+        """
+        Serve workers until every shard is finished
+
+        Args:
+            on_progress: Optional callable(stats) run after each shard
+
+        Returns:
+            list: Global top-k rows ordered by ranking_key
+        """
+        self._on_progress = on_progress
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+        with self._condition:
+            while self._remaining:
+                self._condition.wait()
+            self._finished = True
+            self._condition.notify_all()
+        self._listener.close()
+        return self.ranking
+
+    def _accept_loop(self):
+        while True:
+            try:
+                connection = self._listener.accept()
+            except Exception as e:
+                # Listener closed, or a client failed authentication
+                if self._finished:
+                    return
+                print(f"Rejected connection: {e}", file=sys.stderr)
+                continue
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _next_shard(self):
+        """Block until a shard is free (None once everything is finished)"""
+        with self._condition:
+            while not self._todo and not self._finished:
+                self._condition.wait()
+            if self._finished:
+                return None
+            shard_id = self._todo.popleft()
+            self._attempts[shard_id] += 1
+            return shard_id
+
+    def _serve(self, connection):
+        """Feed one worker connection until the run ends or the worker fails"""
+        worker = 'unknown worker'
+        try:
+            hello = connection.recv()
+            worker = hello.get('name', worker)
+            with self._condition:
+                self.stats['workers'] += 1
+
+            while True:
+                shard_id = self._next_shard()
+                if shard_id is None:
+                    connection.send({'type': 'stop'})
+                    return
+
+                resumes, load_errors = _load_shard(self.shards[shard_id])
+                try:
+                    connection.send({
+                        'type': 'shard', 'shard_id': shard_id, 'jd_text': self.jd_text,
+                        'top_k': self.top_k, 'resumes': resumes
+                    })
+                    if not connection.poll(self.shard_timeout):
+                        raise TimeoutError(f"no reply within {self.shard_timeout}s")
+                    reply = connection.recv()
+                except (EOFError, OSError, TimeoutError) as e:
+                    self._reassign(shard_id, worker, e)
+                    return
+                self._complete(reply, load_errors)
+        except (EOFError, OSError):
+            # Worker went away between shards; nothing to reassign
+            return
+        finally:
+            connection.close()
+
+    def _reassign(self, shard_id, worker, error):
+        with self._condition:
+            if self._attempts[shard_id] >= self.max_attempts:
+                message = f"shard failed after {self._attempts[shard_id]} attempts: {type(error).__name__} {error}"
+                for resume_id, _ in self.shards[shard_id]:
+                    self.errors.append(_error_row(resume_id, message))
+                self.stats['failed'] += len(self.shards[shard_id])
+                self._remaining -= 1
+            else:
+                print(f"Reassigning shard {shard_id} from {worker}: {type(error).__name__} {error}",
+                      file=sys.stderr)
+                self.stats['reassigned'] += 1
+                self._todo.append(shard_id)
+            self._condition.notify_all()
+
+    def _complete(self, reply, load_errors):
+        with self._condition:
+            self.ranking = merge_rankings([self.ranking, reply['top']], self.top_k)
+            self.errors.extend(load_errors + reply['errors'])
+            self.stats['screened'] += reply['screened'] + len(load_errors)
+            self.stats['failed'] += len(reply['errors']) + len(load_errors)
+            self._remaining -= 1
+            self._condition.notify_all()
+            if self._on_progress:
+                self._on_progress(dict(self.stats))
+
+
+def _load_shard(shard):
+    """Read a shard's file bytes; unreadable files become error rows"""
+    resumes, errors = [], []
+    for resume_id, loader in shard:
+        try:
+            resumes.append((resume_id, loader()))
+        except Exception as e:
+            errors.append(_error_row(resume_id, e))
+    return resumes, errors
+
+
+def screen_shard(message):
+    """
+    Screen one shard message and build the reply (runs in a worker)
+
+    Args:
+        message: 'shard' message from the coordinator
+
+    Returns:
+        dict: Reply with the shard's top-k rows and error rows
+    """
+    rows = [
+        screen_resume(resume_id, lambda data=data: data, message['jd_text'])
+        for resume_id, data in message['resumes']
+    ]
+    return {
+        'type': 'result',
+        'shard_id': message['shard_id'],
+        'top': top_rows(rows, message['top_k']),
+        'errors': [row for row in rows if row['error']],
+        'screened': len(rows)
+    }
+
+
+def connect(address, authkey, timeout=CONNECT_TIMEOUT):
+    """
+    Connect to a coordinator, retrying while it starts up
+
+    Args:
+        address: (host, port)
+        authkey: Shared secret bytes
+        timeout: Seconds to keep retrying
+
+    Returns:
+        Connection: Authenticated connection
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except (ConnectionRefusedError, ConnectionResetError):
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+
+def run_worker(address, authkey, name=None):
+    """
+    Screen shards from a coordinator until it says stop
+
+    Args:
+        address: Coordinator (host, port)
+        authkey: Shared secret bytes
+        name: Worker name shown in coordinator logs
+
+    Returns:
+        int: Number of shards screened
+    """
+    prewarm()
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    connection = connect(address, authkey)
+    shards = 0
+    try:
+        connection.send({'type': 'hello', 'name': name})
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                # Coordinator finished or went away
+                break
+            if message['type'] == 'stop':
+                break
+            try:
+                connection.send(screen_shard(message))
+            except OSError:
+                # Shard timed out and was reassigned; the coordinator hung up
+                break
+            shards += 1
+    finally:
+        connection.close()
+    return shards
+
+
+def start_local_workers(address, authkey, count):
+    """
+    Start worker processes on this machine
+
+    Args:
+        address: Coordinator (host, port)
+        authkey: Shared secret bytes
+        count: Number of processes
+
+    Returns:
+        list: Started multiprocessing.Process objects
+    """
+    import multiprocessing
+
+    context = multiprocessing.get_context('spawn')
+    host = '127.0.0.1' if address[0] in ('0.0.0.0', '') else address[0]
+    processes = []
+    for index in range(count):
+        process = context.Process(
+            target=run_worker, args=((host, address[1]), authkey, f"local-{index}"), daemon=True
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Distributed resume screening")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    coordinator_parser = subparsers.add_parser('coordinator', help="Shard a corpus and merge rankings")
+    coordinator_parser.add_argument('--jd', required=True, help="Job description text file")
+    coordinator_parser.add_argument('--input', required=True, help="Directory or .zip of PDF/DOCX resumes")
+    coordinator_parser.add_argument('--output', required=True, help="Global ranking file (.csv or .jsonl)")
+    coordinator_parser.add_argument('--errors', default=None, help="Also write failed resumes here")
+    coordinator_parser.add_argument('--top-k', type=int, default=100, help="Size of the global ranking")
+    coordinator_parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help="Resumes per shard")
+    coordinator_parser.add_argument('--shard-timeout', type=float, default=SHARD_TIMEOUT,
+                                    help="Seconds before a shard is reassigned")
+    coordinator_parser.add_argument('--listen', default=f"127.0.0.1:{DEFAULT_PORT}", help="host:port to listen on")
+    coordinator_parser.add_argument('--local-workers', type=int, default=0, help="Worker processes to start here")
+
+    worker_parser = subparsers.add_parser('worker', help="Screen shards for a coordinator")
+    worker_parser.add_argument('--connect', required=True, help="Coordinator host:port")
+    worker_parser.add_argument('--processes', type=int, default=1, help="Worker processes to run")
+
+    args = parser.parse_args(argv)
+    authkey = get_authkey()
+
+    if args.command == 'worker':
+        if authkey is None:
+            parser.error("Set RESUME_CLUSTER_KEY to the coordinator's shared secret")
+        address = parse_address(args.connect)
+        if args.processes == 1:
+            shards = run_worker(address, authkey)
+            print(f"Worker done: {shards} shards screened", file=sys.stderr)
+        else:
+            for process in start_local_workers(address, authkey, args.processes):
+                process.join()
+        return
+
+    if authkey is None:
+        if not args.local_workers:
+            parser.error("Set RESUME_CLUSTER_KEY so remote workers can authenticate")
+        # Only local workers will join, so a throwaway secret is enough
+        authkey = os.urandom(32)
+
+    output_format = 'jsonl' if args.output.lower().endswith('.jsonl') else 'csv'
+    with open(args.jd, encoding='utf-8') as f:
+        jd_text = f.read()
+
+    shards = build_shards(iter_resume_sources(args.input), args.shard_size)
+    coordinator = Coordinator(shards, jd_text, args.top_k, parse_address(args.listen), authkey,
+                              shard_timeout=args.shard_timeout)
+    print(f"Coordinator on {coordinator.address[0]}:{coordinator.address[1]}, "
+          f"{len(shards)} shards", file=sys.stderr)
+
+    local_workers = start_local_workers(coordinator.address, authkey, args.local_workers)
+
+    start = time.perf_counter()
+
+    def report(stats):
+        rate = stats['screened'] / (time.perf_counter() - start)
+        print(f"Screened {stats['screened']} resumes ({stats['failed']} failed, "
+              f"{stats['workers']} workers, {rate:.1f}/s)", file=sys.stderr)
+
+    ranking = coordinator.run(on_progress=report)
+    for process in local_workers:
+        process.join(5)
+
+    # The ranking is rewritten on every run (ResultWriter appends)
+    if os.path.exists(args.output):
+        os.remove(args.output)
+    with ResultWriter(args.output, output_format) as writer:
+        for row in ranking:
+            writer.write(row)
+    if args.errors:
+        errors_format = 'jsonl' if args.errors.lower().endswith('.jsonl') else 'csv'
+        with ResultWriter(args.errors, errors_format) as writer:
+            for row in coordinator.errors:
+                writer.write(row)
+
+    stats = coordinator.stats
+    print(f"Done: {stats['screened']} resumes screened, {stats['failed']} failed, "
+          f"{stats['reassigned']} shard reassignments in {time.perf_counter() - start:.1f}s; "
+          f"top {len(ranking)} written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
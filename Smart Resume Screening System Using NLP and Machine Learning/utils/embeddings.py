@@ -0,0 +1,269 @@
+"""
+Embeddings Module
+Embeds resumes and job descriptions with a local CPU model for semantic scoring
+
+Two offline backends are supported:
+    lsa                    TF-IDF + truncated SVD (latent semantic analysis)
+                           fitted on your own documents; needs only scikit-learn
+    sentence-transformers  a sentence-transformers model directory on disk
+                           (optional dependency, never downloaded at runtime)
+
+Fit the LSA model on a directory of resumes and job descriptions:
+    python -m utils.embeddings fit path/to/documents --dim 256
+
+Use a sentence-transformers model instead:
+    RESUME_EMBEDDING_MODEL=/models/all-MiniLM-L6-v2 streamlit run app.py
+"""
+
+import argparse
+import os
+import threading
+
+from utils.nlp_processor import normalize_for_ml
+from utils.tfidf_model import PROJECT_ROOT, read_documents
+
+
+# Override with the RESUME_EMBEDDING_MODEL environment variable. A directory
+# is loaded as a sentence-transformers model, a file as an LSA model.
+DEFAULT_EMBEDDING_PATH = os.path.join(PROJECT_ROOT, 'models', 'lsa_embedder.joblib')
+
+_EMBEDDER_CACHE = {}
+_EMBEDDER_LOCK = threading.Lock()
+
+# (mtime, size) of each cached embedder's file or directory when it was loaded
+_EMBEDDER_SIGNATURES = {}
+
+
+def _normalize_rows(matrix):
+    import numpy as np
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class LsaEmbedder:
+    """
+    Latent semantic analysis embedder: TF-IDF followed by truncated SVD
+
+    Terms that co-occur across the training documents (e.g. "spark" and
+    "etl") end up close together, so related wording scores as similar even
+    without exact overlap.
+    """
+
+    name = 'lsa'
+
+    def __init__(self, vectorizer, svd):
+        self.vectorizer = vectorizer
+        self.svd = svd
+
+    @property
+    def dim(self):
+        """Embedding dimension"""
+        return self.svd.n_components
+
+    @classmethod
+    def fit(cls, texts, dim=256, max_features=50000):
+        """
+        Fit an LSA embedder on a corpus of resumes and job descriptions
+
+        Args:
+            texts: List of document text contents
+            dim: Embedding dimension (capped below the vocabulary size)
+            max_features: Maximum TF-IDF vocabulary size
+
+        Returns:
+            LsaEmbedder: Fitted embedder
+        """
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(
+            stop_words='english',
+            max_features=max_features,
+            ngram_range=(1, 2),
+            sublinear_tf=True
+        )
+        matrix = vectorizer.fit_transform([normalize_for_ml(text) for text in texts])
+        dim = max(1, min(dim, matrix.shape[1] - 1, matrix.shape[0] - 1))
+        svd = TruncatedSVD(n_components=dim, random_state=0)
+        svd.fit(matrix)
+        return cls(vectorizer, svd)
+
+    def embed(self, texts):
+        """
+        Embed texts as L2-normalized float32 vectors
+
+        Args:
+            texts: List of text contents
+
+        Returns:
+            numpy.ndarray: len(texts) x dim matrix
+        """
+        matrix = self.vectorizer.transform([normalize_for_ml(text) for text in texts])
+        return _normalize_rows(self.svd.transform(matrix))
+
+    def save(self, path):
+        """
+        Save the embedder to disk
+
+        Args:
+            path: Destination file
+
+        Returns:
+            str: Path the model was written to
+        """
+        import joblib
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Plain components, so the file does not depend on how this module was run
+        joblib.dump({'backend': self.name, 'vectorizer': self.vectorizer, 'svd': self.svd}, path)
+
+        _EMBEDDER_CACHE.pop(os.path.abspath(path), None)
+        return path
+
+
+class SentenceTransformerEmbedder:
+    """
+    Embedder backed by a sentence-transformers model stored on local disk
+    """
+
+    name = 'sentence-transformers'
+
+    def __init__(self, model_dir, batch_size=32):
+        """
+        Args:
+            model_dir: Directory containing the saved model
+            batch_size: Texts encoded per forward pass
+        """
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ImportError(
+                "sentence-transformers is not installed; run "
+                "'pip install sentence-transformers' or use the LSA backend"
+            )
+        self.model = SentenceTransformer(model_dir, device='cpu')
+        self.batch_size = batch_size
+
+    @property
+    def dim(self):
+        """Embedding dimension"""
+        return self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts):
+        """
+        Embed texts as L2-normalized float32 vectors
+
+        Args:
+            texts: List of text contents
+
+        Returns:
+            numpy.ndarray: len(texts) x dim matrix
+        """
+        vectors = self.model.encode(
+            list(texts), batch_size=self.batch_size, normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return _normalize_rows(vectors)
+
+
+def get_embedding_path():
+    """Return the configured embedding model path"""
+    return os.environ.get('RESUME_EMBEDDING_MODEL', DEFAULT_EMBEDDING_PATH)
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def embedder_version():
+    """
+    Identify the configured embedding model; changes when it is refitted
+
+    Returns:
+        str: Path, modification time and size ('' without a model)
+    """
+    path = os.path.abspath(get_embedding_path())
+    signature = _signature(path)
+    return f"{path}:{signature[0]}:{signature[1]}" if signature else ''
+
+
+def load_embedder(path=None):
+    """
+    Load an embedder, reading it from disk again only when it changes
+
+    Args:
+        path: LSA model file or sentence-transformers directory
+              (defaults to get_embedding_path())
+
+    Returns:
+        LsaEmbedder or SentenceTransformerEmbedder: Loaded embedder
+    """
+    path = os.path.abspath(path or get_embedding_path())
+    with _EMBEDDER_LOCK:
+        signature = _signature(path)
+        if path not in _EMBEDDER_CACHE or _EMBEDDER_SIGNATURES.get(path) != signature:
+            if os.path.isdir(path):
+                _EMBEDDER_CACHE[path] = SentenceTransformerEmbedder(path)
+            else:
+                import joblib
+                saved = joblib.load(path)
+                _EMBEDDER_CACHE[path] = LsaEmbedder(saved['vectorizer'], saved['svd'])
+            _EMBEDDER_SIGNATURES[path] = signature
+        return _EMBEDDER_CACHE[path]
+
+
+def get_embedder():
+    """
+    Return the configured embedder if a model is available, otherwise None
+
+    A refitted model is picked up on the next call.
+
+    Returns:
+        embedder or None: Loaded embedder
+    """
+    path = os.path.abspath(get_embedding_path())
+    signature = _signature(path)
+    if signature is None:
+        return None
+    if path in _EMBEDDER_CACHE and _EMBEDDER_SIGNATURES.get(path) == signature:
+        return _EMBEDDER_CACHE[path]
+    try:
+        return load_embedder(path)
+    except Exception as e:
+        # Semantic scoring is optional; lexical scores still work without it
+        return None
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Manage the semantic embedding model")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = subparsers.add_parser('fit', help="Fit an LSA embedder on a directory of documents")
+    fit_parser.add_argument('directory', help="Directory of resumes and job descriptions")
+    fit_parser.add_argument('--output', default=None, help="Model file (default: models/lsa_embedder.joblib)")
+    fit_parser.add_argument('--dim', type=int, default=256, help="Embedding dimension")
+    fit_parser.add_argument('--max-features', type=int, default=50000, help="Maximum vocabulary size")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        texts = read_documents(args.directory)
+        if len(texts) < 2:
+            parser.error(f"Need at least two documents in {args.directory}")
+        embedder = LsaEmbedder.fit(texts, dim=args.dim, max_features=args.max_features)
+        path = embedder.save(args.output or get_embedding_path())
+        print(f"Fitted on {len(texts)} documents, dimension {embedder.dim}, saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
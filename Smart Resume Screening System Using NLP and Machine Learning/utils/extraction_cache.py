@@ -0,0 +1,209 @@
+"""
+Extraction Cache Module
+Caches cleaned resume text keyed by a hash of the file bytes, so the same
+file is never parsed twice
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+from utils.text_extractor import EXTRACTOR_VERSION, extract_text, clean_text, read_file_bytes
+
+
+class ExtractionCache:
+    """
+    Two-tier cache of cleaned document text
+
+    The memory tier is an LRU of at most max_entries items. The optional disk
+    tier stores one file per document in cache_dir and evicts the least
+    recently used files once their total size exceeds max_disk_bytes.
+    """
+
+    def __init__(self, max_entries=128, cache_dir=None, max_disk_bytes=100 * 1024 * 1024):
+        """
+        Args:
+            max_entries: Maximum number of documents kept in memory
+            cache_dir: Directory for the disk tier (None disables it)
+            max_disk_bytes: Size limit for the disk tier
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(data):
+        """
+        Compute the cache key for raw file bytes
+
+        The extractor version is hashed in, so text cached by an older
+        extractor is never returned.
+
+        Args:
+            data: File content as bytes
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        digest = hashlib.sha256(f"v{EXTRACTOR_VERSION}:".encode())
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key + '.txt')
+
+    def get(self, key):
+        """
+        Look up cleaned text by key
+
+        Args:
+            key: Cache key from key_for
+
+        Returns:
+            str or None: Cached text, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    text = f.read()
+            except OSError:
+                text = None
+            if text is not None:
+                # Refresh the modification time so eviction stays LRU
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, text)
+                return text
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, text):
+        """
+        Store cleaned text in both tiers
+
+        Args:
+            key: Cache key from key_for
+            text: Cleaned text content
+        """
+        self._remember(key, text)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(temp_path, path)
+            except OSError:
+                # A full or read-only cache directory only loses the disk copy
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                return
+            self._evict_disk()
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier fits its limit"""
+        entries = []
+        total_size = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.txt'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """Empty the memory tier and reset counters (disk files are kept)"""
+        with self._lock:
+            self._memory.clear()
+            self.memory_hits = self.disk_hits = self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Hit/miss counters
+
+        Returns:
+            dict: hits, memory_hits, disk_hits, misses and entry count
+        """
+        with self._lock:
+            return {
+                'hits': self.memory_hits + self.disk_hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory)
+            }
+
+
+def extract_resume_text(file, filename, cache=None):
+    """
+    Extract and clean resume text, skipping parsing when the file is cached
+
+    Args:
+        file: File path, bytes, or file object
+        filename: Original file name, used to pick the extractor
+        cache: ExtractionCache instance (None disables caching)
+
+    Returns:
+        str: Cleaned text content
+    """
+    data = read_file_bytes(file)
+
+    if cache is None:
+        return clean_text(extract_text(io.BytesIO(data), filename))
+
+    key = ExtractionCache.key_for(data)
+    text = cache.get(key)
+    if text is None:
+        text = clean_text(extract_text(io.BytesIO(data), filename))
+        cache.put(key, text)
+    return text
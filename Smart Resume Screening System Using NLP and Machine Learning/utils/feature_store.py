@@ -0,0 +1,307 @@
+"""
+Feature Store Module
+Persists per-candidate features so edited job descriptions can be re-scored
+incrementally
+
+Each resume is processed once into its skill set, keyword set and term
+counts (from which TF-IDF vectors are built for any JD or corpus model).
+When a job description is edited only the delta is computed: requirements
+added or removed, and the new JD vector. Scores are then updated from the
+stored features without touching resume text, and a report lists the
+candidates whose ranking changed.
+
+Usage:
+    python -m utils.feature_store add --store features/ --input resumes/
+    python -m utils.feature_store score --store features/ --job backend-dev --jd job.txt
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+from collections import Counter
+
+from utils.nlp_processor import extract_skills, extract_keywords_tfidf
+from utils.job_profile import get_job_profile
+from utils.streaming import ml_counts_for_text, ml_score_from_counts
+from utils.instrumentation import instrumented
+
+
+class FeatureStore:
+    """
+    Candidate features and per-job scores stored in a directory
+
+    Layout:
+        candidates.jsonl   one line per resume (later lines replace earlier)
+        jobs/<job_id>.json JD text, its requirements and every candidate's scores
+
+    Each candidate has a revision, bumped when its resume is replaced. Job
+    scores record the revision they were computed from, so a replaced
+    resume is scored in full rather than adjusted from stale counts.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Store directory (created if missing)
+        """
+        self.directory = directory
+        self._candidates_path = os.path.join(directory, 'candidates.jsonl')
+        self._jobs_dir = os.path.join(directory, 'jobs')
+        os.makedirs(self._jobs_dir, exist_ok=True)
+
+        self.candidates = {}
+        if os.path.exists(self._candidates_path):
+            with open(self._candidates_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.candidates[record['id']] = {
+                            'skills': set(record['skills']),
+                            'keywords': set(record['keywords']),
+                            'ml_counts': Counter(record['ml_counts']),
+                            'revision': record.get('revision', 0)
+                        }
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def __contains__(self, resume_id):
+        return resume_id in self.candidates
+
+    @instrumented
+    def add_resume(self, resume_id, resume_text):
+        """
+        Extract and persist a resume's features (replacing any earlier ones)
+
+        Args:
+            resume_id: Unique resume identifier
+            resume_text: Resume text content
+        """
+        previous = self.candidates.get(resume_id)
+        features = {
+            'skills': extract_skills(resume_text),
+            'keywords': set(extract_keywords_tfidf(resume_text, top_n=15)),
+            'ml_counts': ml_counts_for_text(resume_text),
+            'revision': previous['revision'] + 1 if previous is not None else 0
+        }
+        with open(self._candidates_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'id': resume_id,
+                'revision': features['revision'],
+                'skills': sorted(features['skills']),
+                'keywords': sorted(features['keywords']),
+                'ml_counts': features['ml_counts']
+            }) + '\n')
+        self.candidates[resume_id] = features
+
+    def _job_path(self, job_id):
+        safe_id = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in job_id)
+        return os.path.join(self._jobs_dir, safe_id + '.json')
+
+    def load_job(self, job_id):
+        """
+        Return the stored state of a job, or None if it was never scored
+
+        Returns:
+            dict or None: 'jd_text', 'requirements' and 'scores'
+        """
+        try:
+            with open(self._job_path(job_id), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save_job(self, job_id, job):
+        path = self._job_path(job_id)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        os.replace(path + '.tmp', path)
+
+    @staticmethod
+    def _requirements(profile):
+        return profile.skills | profile.keywords
+
+    def _score(self, resume_id, requirements, matched, profile):
+        features = self.candidates[resume_id]
+        return {
+            'revision': features['revision'],
+            'total_matched': matched,
+            'match_percentage': round(matched / len(requirements) * 100, 2) if requirements else 0,
+            'ml_match_score': float(ml_score_from_counts(features['ml_counts'], profile))
+        }
+
+    @instrumented
+    def score_job(self, job_id, jd_text):
+        """
+        Score every stored candidate against a JD, incrementally if possible
+
+        The first call for a job scores everyone. Later calls compare the new
+        JD with the stored one: match counts are adjusted only by the added
+        and removed requirements, ML scores are recomputed from stored term
+        counts only if the JD's text changed, and new or replaced candidates
+        are scored in full.
+
+        Args:
+            job_id: Job identifier
+            jd_text: Current job description text
+
+        Returns:
+            dict: Change report, see rankings_report()
+        """
+        profile = get_job_profile(jd_text)
+        requirements = self._requirements(profile)
+        previous = self.load_job(job_id)
+
+        if previous is None:
+            old_requirements, old_scores = set(), {}
+            added, removed = requirements, set()
+            vector_changed = True
+        else:
+            old_requirements = set(previous['requirements'])
+            old_scores = previous['scores']
+            added = requirements - old_requirements
+            removed = old_requirements - requirements
+            vector_changed = get_job_profile(previous['jd_text']).clean_text != profile.clean_text
+
+        scores = {}
+        for resume_id, features in self.candidates.items():
+            resume_features = features['skills'] | features['keywords']
+            old = old_scores.get(resume_id)
+            if old is None or old.get('revision', 0) != features['revision']:
+                # New or replaced candidate (or first scoring): full computation
+                matched = len(resume_features & requirements)
+                scores[resume_id] = self._score(resume_id, requirements, matched, profile)
+                continue
+
+            matched = old['total_matched'] - len(resume_features & removed) + len(resume_features & added)
+            score = dict(old)
+            score['total_matched'] = matched
+            score['match_percentage'] = round(matched / len(requirements) * 100, 2) if requirements else 0
+            if vector_changed:
+                score['ml_match_score'] = float(ml_score_from_counts(features['ml_counts'], profile))
+            scores[resume_id] = score
+
+        self._save_job(job_id, {
+            'jd_text': jd_text,
+            'requirements': sorted(requirements),
+            'scores': scores
+        })
+
+        report = rankings_report(old_scores, scores)
+        report.update({
+            'job_id': job_id,
+            'added_requirements': sorted(added) if previous is not None else [],
+            'removed_requirements': sorted(removed),
+            'jd_vector_changed': vector_changed
+        })
+        return report
+
+
+def rank_order(scores):
+    """
+    Rank candidates like rank_resumes: ML score, then skill match, descending
+
+    Args:
+        scores: Dict resume_id -> score dict
+
+    Returns:
+        dict: resume_id -> rank (1 = best)
+    """
+    ordered = sorted(
+        scores, key=lambda rid: (-scores[rid]['ml_match_score'], -scores[rid]['match_percentage'], rid)
+    )
+    return {resume_id: rank for rank, resume_id in enumerate(ordered, 1)}
+
+
+def rankings_report(old_scores, new_scores):
+    """
+    Compare two scorings of the same job
+
+    Args:
+        old_scores: Dict resume_id -> score dict before the edit
+        new_scores: Dict resume_id -> score dict after the edit
+
+    Returns:
+        dict: 'candidates' count and 'changed', a list of candidates whose
+              rank or scores changed (old values are None for new
+              candidates), ordered by new rank
+    """
+    old_ranks = rank_order(old_scores) if old_scores else {}
+    new_ranks = rank_order(new_scores)
+
+    changed = []
+    for resume_id, new_rank in sorted(new_ranks.items(), key=lambda item: item[1]):
+        old = old_scores.get(resume_id)
+        new = new_scores[resume_id]
+        if old is not None and old_ranks[resume_id] == new_rank and \
+                old['match_percentage'] == new['match_percentage'] and \
+                old['ml_match_score'] == new['ml_match_score']:
+            continue
+        changed.append({
+            'resume_id': resume_id,
+            'old_rank': old_ranks.get(resume_id),
+            'new_rank': new_rank,
+            'old_match_percentage': old['match_percentage'] if old else None,
+            'new_match_percentage': new['match_percentage'],
+            'old_ml_match_score': old['ml_match_score'] if old else None,
+            'new_ml_match_score': new['ml_match_score']
+        })
+
+    return {'candidates': len(new_scores), 'changed': changed}
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Candidate feature store with incremental JD re-scoring")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help="Extract features for new resumes")
+    add_parser.add_argument('--store', required=True, help="Feature store directory")
+    add_parser.add_argument('--input', required=True, help="Directory or .zip of resumes")
+
+    score_parser = subparsers.add_parser('score', help="Score or re-score a job description")
+    score_parser.add_argument('--store', required=True, help="Feature store directory")
+    score_parser.add_argument('--job', required=True, help="Job identifier")
+    score_parser.add_argument('--jd', required=True, help="Job description text file")
+    score_parser.add_argument('--report', default=None, help="Write the full change report as JSON")
+    score_parser.add_argument('--show', type=int, default=20, help="Changed candidates to print")
+
+    args = parser.parse_args(argv)
+    store = FeatureStore(args.store)
+
+    if args.command == 'add':
+        from utils.bulk_screen import iter_resume_sources
+        from utils.text_extractor import extract_text, clean_text
+
+        added = 0
+        for resume_id, loader in iter_resume_sources(args.input):
+            if resume_id in store:
+                continue
+            try:
+                store.add_resume(resume_id, clean_text(extract_text(io.BytesIO(loader()), resume_id)))
+                added += 1
+            except Exception as e:
+                print(f"Skipping {resume_id}: {e}", file=sys.stderr)
+        print(f"Added {added} resumes, store holds {len(store)}")
+        return
+
+    with open(args.jd, encoding='utf-8') as f:
+        report = store.score_job(args.job, f.read())
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"Job {args.job}: {report['candidates']} candidates, {len(report['changed'])} changed")
+    print(f"Added requirements:   {', '.join(report['added_requirements']) or '-'}")
+    print(f"Removed requirements: {', '.join(report['removed_requirements']) or '-'}")
+    for row in report['changed'][:args.show]:
+        old_rank = row['old_rank'] if row['old_rank'] is not None else 'new'
+        print(f"  #{row['new_rank']:<5} (was {old_rank:<5}) ML {row['new_ml_match_score']:>6.2f}  "
+              f"skills {row['new_match_percentage']:>6.2f}%  {row['resume_id']}")
+
+
+if __name__ == "__main__":
+    main()
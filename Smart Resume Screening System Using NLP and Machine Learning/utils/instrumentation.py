@@ -0,0 +1,211 @@
+"""
+Instrumentation Module
+Records per-stage wall time, call counts and input sizes
+
+Off by default. While disabled an instrumented function costs one flag check
+per call. Enable it with enable() or the RESUME_INSTRUMENTATION=1
+environment variable.
+
+Example:
+    from utils import instrumentation
+    instrumentation.enable()
+    calculate_match_score(resume_text, jd_text)
+    print(instrumentation.summary_table())
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+_ENABLED = os.environ.get('RESUME_INSTRUMENTATION', '') not in ('', '0')
+
+_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+def enable():
+    """Start recording stage timings"""
+    global _ENABLED
+    _ENABLED = True
+
+
+def disable():
+    """Stop recording stage timings (collected stats are kept)"""
+    global _ENABLED
+    _ENABLED = False
+
+
+def is_enabled():
+    """Return True if timings are being recorded"""
+    return _ENABLED
+
+
+def reset():
+    """Discard all collected stats"""
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+def _input_size(value):
+    """Best-effort size of a stage input: characters, bytes or items"""
+    if isinstance(value, (str, bytes, bytearray, list, tuple, set, frozenset, dict)):
+        return len(value)
+    size = getattr(value, 'size', None)  # e.g. a Streamlit upload
+    if isinstance(size, int):
+        return size
+    if hasattr(value, 'getbuffer'):
+        return value.getbuffer().nbytes
+    return 0
+
+
+def record(name, seconds, input_size=0):
+    """
+    Add one observation for a stage
+
+    Args:
+        name: Stage name, e.g. 'nlp_processor.extract_skills'
+        seconds: Wall time of the call
+        input_size: Size of the input (characters, bytes or items)
+    """
+    with _STATS_LOCK:
+        stats = _STATS.get(name)
+        if stats is None:
+            stats = _STATS[name] = {
+                'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'input_size': 0
+            }
+        stats['calls'] += 1
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+        stats['input_size'] += input_size
+
+
+def instrumented(func):
+    """
+    Decorator recording timings for a function as '<module>.<name>'
+
+    Times are inclusive of any instrumented functions called inside. The
+    input size is taken from the first argument.
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _ENABLED:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, time.perf_counter() - start, _input_size(args[0]) if args else 0)
+
+    return wrapper
+
+
+@contextmanager
+def stage(name, input_size=0):
+    """
+    Context manager timing an arbitrary block as a stage
+
+    Example:
+        with stage('app.analyze', len(resume_text)):
+            ...
+    """
+    if not _ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, input_size)
+
+
+def get_stats():
+    """
+    Snapshot of the collected stats
+
+    Returns:
+        dict: Stage name -> calls, total/mean/max seconds and input size,
+              slowest total first
+    """
+    with _STATS_LOCK:
+        snapshot = {name: dict(stats) for name, stats in _STATS.items()}
+    for stats in snapshot.values():
+        stats['mean_seconds'] = stats['total_seconds'] / stats['calls']
+    return dict(sorted(snapshot.items(), key=lambda item: -item[1]['total_seconds']))
+
+
+def summary_rows():
+    """
+    Stats as display rows (e.g. for st.table)
+
+    Returns:
+        list: One dict per stage with human-readable units
+    """
+    return [
+        {
+            'stage': name,
+            'calls': stats['calls'],
+            'total_ms': round(stats['total_seconds'] * 1000, 2),
+            'mean_ms': round(stats['mean_seconds'] * 1000, 3),
+            'max_ms': round(stats['max_seconds'] * 1000, 2),
+            'input_size': stats['input_size']
+        }
+        for name, stats in get_stats().items()
+    ]
+
+
+def summary_table():
+    """
+    Stats as a fixed-width text table
+
+    Returns:
+        str: Table, slowest stage first
+    """
+    rows = summary_rows()
+    header = f"{'stage':<42} {'calls':>7} {'total_ms':>11} {'mean_ms':>10} {'max_ms':>10} {'input_size':>12}"
+    lines = [header, '-' * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['stage']:<42} {row['calls']:>7} {row['total_ms']:>11.2f} "
+            f"{row['mean_ms']:>10.3f} {row['max_ms']:>10.2f} {row['input_size']:>12}"
+        )
+    return '\n'.join(lines)
+
+
+def to_json(indent=2):
+    """
+    Stats as a JSON document
+
+    Returns:
+        str: JSON object keyed by stage name
+    """
+    return json.dumps(get_stats(), indent=indent)
+
+
+def to_prometheus(prefix='resume_screening'):
+    """
+    Stats in the Prometheus text exposition format
+
+    Returns:
+        str: Counter metrics labelled by stage
+    """
+    stats = get_stats()
+    metrics = [
+        ('stage_calls_total', 'Number of calls per stage', 'calls'),
+        ('stage_seconds_total', 'Wall time spent per stage', 'total_seconds'),
+        ('stage_input_size_total', 'Input characters, bytes or items per stage', 'input_size')
+    ]
+
+    lines = []
+    for metric, help_text, field in metrics:
+        name = f"{prefix}_{metric}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for stage_name, values in stats.items():
+            lines.append(f'{name}{{stage="{stage_name}"}} {values[field]}')
+    return '\n'.join(lines) + '\n'
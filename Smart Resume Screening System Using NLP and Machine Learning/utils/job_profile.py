@@ -0,0 +1,141 @@
+"""
+Job Profile Module
+Processes a job description once so it can be matched against many resumes
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils.nlp_processor import extract_skills, extract_keywords_tfidf
+from utils.tfidf_model import get_corpus_model
+from utils.taxonomy import get_taxonomy
+from utils.tokenizer import tokenize, word_ngrams
+
+
+# Number of recently used job descriptions kept by get_job_profile
+PROFILE_CACHE_SIZE = 64
+
+_PROFILE_CACHE = OrderedDict()
+_PROFILE_CACHE_LOCK = threading.Lock()
+
+
+def hash_text(text):
+    """
+    Compute a stable hash of a text
+
+    Args:
+        text: Input text string
+
+    Returns:
+        str: SHA-256 hex digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class JobProfile:
+    """
+    Everything the matcher needs from a job description, computed once
+
+    Attributes:
+        text: Original JD text
+        key: SHA-256 hash of the JD text
+        taxonomy_version: Version of the skill taxonomy used for skills
+        skills: Set of skills found in the JD
+        keywords: Set of top TF-IDF keywords in the JD
+        clean_text: JD text normalized for ML scoring
+        ml_ngrams: JD unigrams and bigrams for ML scoring
+        tfidf_vector: JD vector from the corpus TF-IDF model (None without one)
+        embedding: JD embedding from the last embedder used (None until needed)
+    """
+
+    def __init__(self, jd_text):
+        """
+        Args:
+            jd_text: Job description text content
+        """
+        self.text = jd_text
+        self.key = hash_text(jd_text)
+        self.taxonomy_version = get_taxonomy().version
+
+        # Tokenized once; every JD feature below reads the same stream
+        tokens = tokenize(jd_text)
+        self.skills = extract_skills(tokens)
+        self.keywords = set(extract_keywords_tfidf(tokens, top_n=15))
+        self.clean_text = tokens.ml_text
+        self.ml_ngrams = word_ngrams(tokens.ml_tokens)
+
+        self._tfidf_model = None
+        self.tfidf_vector = None
+        self.vector_for(get_corpus_model())
+
+        self._embedder = None
+        self.embedding = None
+
+    def vector_for(self, model):
+        """
+        Return the JD's TF-IDF vector for a fitted vectorizer
+
+        The vector is cached, and recomputed only if a different model is
+        passed (e.g. after the corpus model has been retrained).
+
+        Args:
+            model: Fitted TfidfVectorizer, or None
+
+        Returns:
+            sparse matrix or None: 1 x vocabulary TF-IDF row
+        """
+        if model is None:
+            return None
+        if model is not self._tfidf_model:
+            self.tfidf_vector = model.transform([self.clean_text])
+            self._tfidf_model = model
+        return self.tfidf_vector
+
+    def embedding_for(self, embedder):
+        """
+        Return the JD's semantic embedding for an embedder
+
+        Cached like vector_for, so the JD is embedded once per embedder.
+
+        Args:
+            embedder: Embedder from utils.embeddings, or None
+
+        Returns:
+            numpy.ndarray or None: L2-normalized embedding
+        """
+        if embedder is None:
+            return None
+        if embedder is not self._embedder:
+            self.embedding = embedder.embed([self.text])[0]
+            self._embedder = embedder
+        return self.embedding
+
+
+def get_job_profile(jd):
+    """
+    Get the JobProfile for a JD, reusing recently built profiles by JD hash
+
+    Profiles built with an older skill taxonomy are rebuilt after a reload.
+
+    Args:
+        jd: Job description text or an existing JobProfile
+
+    Returns:
+        JobProfile: Profile for the job description
+    """
+    if isinstance(jd, JobProfile):
+        return jd
+
+    key = (hash_text(jd), get_taxonomy().version)
+    with _PROFILE_CACHE_LOCK:
+        if key in _PROFILE_CACHE:
+            _PROFILE_CACHE.move_to_end(key)
+            return _PROFILE_CACHE[key]
+
+    profile = JobProfile(jd)
+    with _PROFILE_CACHE_LOCK:
+        _PROFILE_CACHE[key] = profile
+        while len(_PROFILE_CACHE) > PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+    return profile
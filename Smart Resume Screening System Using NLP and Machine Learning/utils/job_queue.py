@@ -0,0 +1,429 @@
+"""
+Job Queue Module
+SQLite-backed queue running resume analyses on a local worker pool
+
+The Streamlit app submits an analysis (resume bytes + job description) and
+polls for the result; text extraction, section parsing and scoring all run
+in the workers, never in the script thread. Jobs are keyed by (resume hash,
+JD hash, scoring and extractor versions), so a repeated analysis returns
+the stored result immediately.
+
+The database holds resume text and results, so it lives in a per-user
+directory and is readable by its owner only.
+
+Workers normally run inside the app (see WorkerPool). They can also run as
+separate processes sharing the same database:
+    python -m utils.job_queue worker --db jobs.sqlite3 --workers 4
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+import time
+import traceback
+
+from utils.job_profile import hash_text
+from utils.matcher import scoring_version
+from utils.text_extractor import EXTRACTOR_VERSION
+
+
+def _user_data_dir():
+    """Per-user application data directory (LOCALAPPDATA or XDG_DATA_HOME)"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'resume_analyzer')
+
+
+# Override with the RESUME_QUEUE_DB environment variable
+DEFAULT_QUEUE_PATH = os.path.join(_user_data_dir(), 'jobs.sqlite3')
+
+# A running job not finished within this time is assumed lost and requeued
+LEASE_SECONDS = 300
+
+# Idle workers check for new jobs this often
+POLL_SECONDS = 0.2
+
+PENDING_STATUSES = ('queued', 'running')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    resume_data BLOB,
+    jd_text TEXT NOT NULL,
+    record_timings INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+
+def get_queue_path():
+    """Return the configured queue database path"""
+    return os.environ.get('RESUME_QUEUE_DB', DEFAULT_QUEUE_PATH)
+
+
+class JobQueue:
+    """
+    Analysis jobs and their memoised results in a SQLite database
+
+    Safe to share between threads and processes: each call opens its own
+    connection, and jobs are claimed inside an immediate transaction.
+    """
+
+    def __init__(self, db_path=None):
+        """
+        Args:
+            db_path: Database file (defaults to get_queue_path())
+        """
+        self.db_path = db_path or get_queue_path()
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Owner-only before SQLite opens it; the WAL files copy these permissions
+        os.close(os.open(self.db_path, os.O_CREAT | os.O_RDWR, 0o600))
+        with self._connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(_SCHEMA)
+            # Databases created before timings became optional
+            columns = {row['name'] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if 'record_timings' not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN record_timings INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        return _Closing(connection)
+
+    @staticmethod
+    def job_id_for(resume_data, jd_text):
+        """
+        Memoisation key of an analysis
+
+        Args:
+            resume_data: Resume file bytes
+            jd_text: Job description text
+
+        Returns:
+            str: Job id (changes when the skill taxonomy, a scoring model or
+                 the extractor changes)
+        """
+        resume_key = hashlib.sha256(resume_data).hexdigest()
+        key = f"{resume_key}:{hash_text(jd_text)}:{scoring_version()}:{EXTRACTOR_VERSION}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def submit(self, resume_data, filename, jd_text, record_timings=False):
+        """
+        Queue an analysis unless an identical one is queued, running or done
+
+        Failed jobs are queued again, and so are finished jobs that ran
+        without timings when timings are now requested.
+
+        Args:
+            resume_data: Resume file bytes
+            filename: Original file name (picks the extractor)
+            jd_text: Job description text
+            record_timings: Have the worker record stage timings
+
+        Returns:
+            str: Job id to poll with get()
+        """
+        job_id = self.job_id_for(resume_data, jd_text)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, filename, resume_data, jd_text, record_timings, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET status = 'queued', resume_data = excluded.resume_data, "
+                "record_timings = excluded.record_timings, error = NULL, created_at = excluded.created_at "
+                "WHERE jobs.status = 'failed' "
+                "OR (jobs.status = 'done' AND excluded.record_timings AND NOT jobs.record_timings)",
+                (job_id, filename, resume_data, jd_text, int(record_timings), time.time())
+            )
+        return job_id
+
+    def get(self, job_id):
+        """
+        Current state of a job
+
+        Args:
+            job_id: Id returned by submit()
+
+        Returns:
+            dict or None: 'status' ('queued', 'running', 'done' or
+                          'failed'), 'result' (dict once done) and 'error'
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'status': row['status'],
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error']
+        }
+
+    def claim(self):
+        """
+        Take the oldest queued job (or one whose worker vanished)
+
+        Returns:
+            dict or None: 'id', 'filename', 'resume_data', 'jd_text' and
+                          'record_timings'
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                row = connection.execute(
+                    "SELECT id, filename, resume_data, jd_text, record_timings FROM jobs "
+                    "WHERE status = 'queued' OR (status = 'running' AND started_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (now - LEASE_SECONDS,)
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE id = ?", (now, row['id'])
+                    )
+                connection.execute('COMMIT')
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+        return dict(row) if row is not None else None
+
+    def finish(self, job_id, result=None, error=None):
+        """
+        Store a job's result (the resume bytes are dropped once done)
+
+        Args:
+            job_id: Job id
+            result: JSON-serializable result on success
+            error: Error message on failure
+        """
+        with self._connect() as connection:
+            if error is None:
+                connection.execute(
+                    "UPDATE jobs SET status = 'done', result = ?, resume_data = NULL, finished_at = ? "
+                    "WHERE id = ?",
+                    (json.dumps(result), time.time(), job_id)
+                )
+            else:
+                connection.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (error, time.time(), job_id)
+                )
+
+    def clear(self):
+        """Delete every job and stored result"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM jobs")
+
+
+class _Closing:
+    """Context manager closing a sqlite3 connection (sqlite3's own only commits)"""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, *exc_info):
+        self.connection.close()
+
+
+def analyze_resume(resume_data, filename, jd_text, extraction_cache=None, section_store=None,
+                   record_timings=False):
+    """
+    Full analysis of one resume, as shown in the app
+
+    The file is extracted once; the same lines give the cleaned text and the
+    sections. Both are cached under the file hash when a cache or store is
+    passed.
+
+    Args:
+        resume_data: Resume file bytes
+        filename: Original file name
+        jd_text: Job description text
+        extraction_cache: Optional ExtractionCache
+        section_store: Optional SectionStore
+        record_timings: Record stage timings for this analysis
+
+    Returns:
+        dict: 'match' (calculate_match_score result), 'suggestions',
+              'sections' (calculate_section_scores result), 'resume_text'
+              (cleaned text, for the preview) and 'timings'
+              (instrumentation rows, or None unless record_timings)
+    """
+    from utils import instrumentation
+    from utils.extraction_cache import ExtractionCache
+    from utils.matcher import calculate_match_score, generate_suggestions
+    from utils.sections import sections_from_lines, calculate_section_scores
+    from utils.text_extractor import extract_lines, clean_text
+
+    was_enabled = instrumentation.is_enabled()
+    if record_timings:
+        instrumentation.enable()
+        instrumentation.reset()
+
+    try:
+        key = ExtractionCache.key_for(resume_data)
+        resume_text = extraction_cache.get(key) if extraction_cache else None
+        sections = section_store.get(key) if section_store else None
+        if resume_text is None or sections is None:
+            # Pool workers are daemon processes and cannot start a page-level pool
+            lines = extract_lines(io.BytesIO(resume_data), filename, parallel=False)
+            resume_text = clean_text('\n'.join(text for text, _ in lines))
+            sections = sections_from_lines(lines)
+            if extraction_cache:
+                extraction_cache.put(key, resume_text)
+            if section_store:
+                section_store.put(key, sections)
+        if not resume_text:
+            raise ValueError("No text could be extracted from the resume")
+
+        match = calculate_match_score(resume_text, jd_text)
+
+        return {
+            'match': match,
+            'suggestions': generate_suggestions(match),
+            'sections': calculate_section_scores(sections, jd_text) if sections else None,
+            'resume_text': resume_text,
+            'timings': instrumentation.summary_rows() if record_timings else None
+        }
+    finally:
+        # Later jobs record only if they ask to (or RESUME_INSTRUMENTATION is set)
+        if record_timings and not was_enabled:
+            instrumentation.disable()
+
+
+def run_worker(db_path=None, cache_dir=None, stop_event=None, max_jobs=None):
+    """
+    Process queued jobs until stopped
+
+    Args:
+        db_path: Queue database (defaults to get_queue_path())
+        cache_dir: Directory for the extraction cache disk tier and sections
+        stop_event: Optional multiprocessing.Event ending the loop
+        max_jobs: Stop after this many jobs (None runs forever)
+    """
+    from utils.extraction_cache import ExtractionCache
+    from utils.resources import prewarm
+    from utils.sections import SectionStore
+
+    prewarm()
+    queue = JobQueue(db_path)
+    extraction_cache = ExtractionCache(cache_dir=cache_dir)
+    section_store = SectionStore(os.path.join(cache_dir, 'sections')) if cache_dir else None
+
+    processed = 0
+    while stop_event is None or not stop_event.is_set():
+        job = queue.claim()
+        if job is None:
+            if max_jobs is not None:
+                break
+            time.sleep(POLL_SECONDS)
+            continue
+
+        try:
+            result = analyze_resume(job['resume_data'], job['filename'], job['jd_text'],
+                                    extraction_cache, section_store, bool(job['record_timings']))
+            queue.finish(job['id'], result=result)
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            queue.finish(job['id'], error=str(e) or type(e).__name__)
+
+        processed += 1
+        if max_jobs is not None and processed >= max_jobs:
+            break
+
+
+class WorkerPool:
+    """
+    Local worker processes serving a JobQueue
+
+    Workers use the spawn start method, so they never inherit the state of
+    a multi-threaded parent such as the Streamlit server.
+    """
+
+    def __init__(self, db_path=None, workers=2, cache_dir=None):
+        """
+        Args:
+            db_path: Queue database (defaults to get_queue_path())
+            workers: Number of worker processes
+            cache_dir: Directory for the extraction cache disk tier and sections
+        """
+        self.db_path = db_path or get_queue_path()
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self._context = multiprocessing.get_context('spawn')
+        self._stop_event = self._context.Event()
+        self._processes = []
+
+    def start(self):
+        """Start the worker processes"""
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=run_worker, args=(self.db_path, self.cache_dir, self._stop_event), daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        return self
+
+    def stop(self, timeout=5):
+        """Ask workers to finish their current job and exit"""
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+        self._processes = []
+
+    def alive(self):
+        """Number of running worker processes"""
+        return sum(process.is_alive() for process in self._processes)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run or manage analysis queue workers")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    worker_parser = subparsers.add_parser('worker', help="Process queued analyses")
+    worker_parser.add_argument('--db', default=None, help="Queue database (default: RESUME_QUEUE_DB or per-user data dir)")
+    worker_parser.add_argument('--workers', type=int, default=1, help="Worker processes")
+    worker_parser.add_argument('--cache-dir', default=os.environ.get('RESUME_CACHE_DIR'),
+                               help="Extraction cache directory shared with the app")
+
+    clear_parser = subparsers.add_parser('clear', help="Delete all jobs and memoised results")
+    clear_parser.add_argument('--db', default=None, help="Queue database")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'clear':
+        JobQueue(args.db).clear()
+        print("Queue cleared")
+        return
+
+    pool = WorkerPool(args.db, args.workers, args.cache_dir).start()
+    print(f"{args.workers} workers serving {pool.db_path}", file=sys.stderr)
+    try:
+        while pool.alive():
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Keywords Module
+Ranks a document's unigrams and bigrams to pick its top keywords
+
+Within a single document IDF is constant, so the top TF-IDF terms are simply
+the most frequent ones; they are counted in one pass and the best top_n kept
+in a bounded heap. With a corpus IDF table on disk the counts are weighted by
+how rare each term is across the corpus instead.
+
+Build the IDF table offline from a directory of resumes and job descriptions:
+    python -m utils.keywords fit path/to/documents
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import sys
+import threading
+
+from utils.tokenizer import tokenize, ngram_counts
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Override with the RESUME_KEYWORD_IDF environment variable
+DEFAULT_IDF_PATH = os.path.join(PROJECT_ROOT, 'models', 'keyword_idf.json')
+
+# Loaded tables, keyed by path, so each process reads each version of the file once
+_IDF_CACHE = {}
+_IDF_CACHE_LOCK = threading.Lock()
+
+# (mtime, size) of each cached table's file when it was loaded
+_IDF_SIGNATURES = {}
+
+# (mtime, size) of table files that failed to load, so they are not retried until changed
+_IDF_FAILURES = {}
+
+
+class IdfTable:
+    """
+    Corpus inverse document frequencies for keyword terms
+
+    Attributes:
+        idf: Dict mapping term to smoothed IDF
+        default_idf: IDF of a term the corpus never contained
+        documents: Number of documents the table was built from
+    """
+
+    def __init__(self, idf, default_idf, documents=0):
+        self.idf = idf
+        self.default_idf = default_idf
+        self.documents = documents
+
+    def weight(self, term):
+        """IDF of a term (default_idf if unseen)"""
+        return self.idf.get(term, self.default_idf)
+
+
+def get_idf_path():
+    """Return the configured IDF table path"""
+    return os.environ.get('RESUME_KEYWORD_IDF', DEFAULT_IDF_PATH)
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def idf_version():
+    """
+    Identify the configured IDF table file; changes when it is rebuilt
+
+    Returns:
+        str: Path, modification time and size ('' without a table)
+    """
+    path = os.path.abspath(get_idf_path())
+    signature = _signature(path)
+    return f"{path}:{signature[0]}:{signature[1]}" if signature else ''
+
+
+def build_idf_table(texts, min_df=2):
+    """
+    Compute keyword IDF over a corpus, smoothed like TfidfVectorizer
+
+    Args:
+        texts: List of document text contents
+        min_df: Drop terms found in fewer documents (they get default_idf)
+
+    Returns:
+        IdfTable: IDF for every unigram and bigram of the keyword tokens
+    """
+    document_frequency = {}
+    for text in texts:
+        for term in ngram_counts(tokenize(text).keyword_tokens):
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+
+    documents = len(texts)
+    idf = {
+        term: math.log((1 + documents) / (1 + df)) + 1
+        for term, df in document_frequency.items()
+        if df >= min_df
+    }
+    return IdfTable(idf, math.log(1 + documents) + 1, documents)
+
+
+def save_idf_table(table, path=None):
+    """
+    Save an IDF table as JSON
+
+    Args:
+        table: IdfTable
+        path: Destination file (defaults to get_idf_path())
+
+    Returns:
+        str: Path the table was written to
+    """
+    path = path or get_idf_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'documents': table.documents, 'default_idf': table.default_idf, 'idf': table.idf}, f)
+
+    # Make the new table visible to this process on next use
+    _IDF_CACHE.pop(os.path.abspath(path), None)
+    return path
+
+
+def load_idf_table(path=None):
+    """
+    Load a saved IDF table, reading the file again only when it changes
+
+    Args:
+        path: Table file (defaults to get_idf_path())
+
+    Returns:
+        IdfTable: Loaded table
+    """
+    path = os.path.abspath(path or get_idf_path())
+    signature = _signature(path)
+    if path not in _IDF_CACHE or _IDF_SIGNATURES.get(path) != signature:
+        with _IDF_CACHE_LOCK:
+            if path not in _IDF_CACHE or _IDF_SIGNATURES.get(path) != signature:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+                _IDF_CACHE[path] = IdfTable(data['idf'], data['default_idf'], data.get('documents', 0))
+                _IDF_SIGNATURES[path] = signature
+    return _IDF_CACHE[path]
+
+
+def get_idf_table():
+    """
+    Return the corpus IDF table if one has been built, otherwise None
+
+    A rebuilt table is picked up on the next call. An unreadable file is
+    reported once and not read again until it changes.
+
+    Returns:
+        IdfTable or None: Loaded table
+    """
+    path = os.path.abspath(get_idf_path())
+    signature = _signature(path)
+    if signature is None:
+        return None
+    if path in _IDF_CACHE and _IDF_SIGNATURES.get(path) == signature:
+        return _IDF_CACHE[path]
+    if _IDF_FAILURES.get(path) == signature:
+        return None
+    try:
+        return load_idf_table(path)
+    except Exception as e:
+        # Fall back to plain term frequency if the file is unreadable
+        _IDF_FAILURES[path] = signature
+        print(f"Ignoring keyword IDF table {path}: {e}", file=sys.stderr)
+        return None
+
+
+def rank_keywords(counts, top_n, idf_table=None):
+    """
+    Pick the top_n terms by count (or count x IDF), ties broken alphabetically
+
+    Only top_n entries are ever held in the heap, so the cost is linear in the
+    number of distinct terms.
+
+    Args:
+        counts: Dict mapping term to count in the document
+        top_n: Number of keywords to return
+        idf_table: Optional IdfTable weighting the counts
+
+    Returns:
+        list: Keywords sorted alphabetically
+    """
+    if top_n <= 0:
+        return []
+    if idf_table is None:
+        best = heapq.nsmallest(top_n, counts.items(), key=lambda item: (-item[1], item[0]))
+    else:
+        weight = idf_table.weight
+        best = heapq.nsmallest(top_n, counts.items(), key=lambda item: (-item[1] * weight(item[0]), item[0]))
+    return sorted(term for term, _ in best)
+
+
+def extract_keywords(text, top_n=20, idf_table=None):
+    """
+    Top unigram/bigram keywords of one document
+
+    Args:
+        text: Input text string or TokenStream
+        top_n: Number of keywords to return
+        idf_table: Optional IdfTable weighting the counts
+
+    Returns:
+        list: Keywords sorted alphabetically
+    """
+    return rank_keywords(ngram_counts(tokenize(text).keyword_tokens), top_n, idf_table)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utils.tfidf_model import read_documents
+
+    parser = argparse.ArgumentParser(description="Manage the keyword IDF table")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = subparsers.add_parser('fit', help="Build the IDF table from a directory of documents")
+    fit_parser.add_argument('directory', help="Directory of resumes and job descriptions")
+    fit_parser.add_argument('--output', default=None, help="Table file (default: models/keyword_idf.json)")
+    fit_parser.add_argument('--min-df', type=int, default=2, help="Minimum documents per kept term")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        texts = read_documents(args.directory)
+        if not texts:
+            parser.error(f"No documents found in {args.directory}")
+        table = build_idf_table(texts, min_df=args.min_df)
+        path = save_idf_table(table, args.output)
+        print(f"Built from {len(texts)} documents, {len(table.idf)} terms, saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
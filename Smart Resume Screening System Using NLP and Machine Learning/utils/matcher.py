@@ -3,48 +3,73 @@ Matcher Module
 Handles matching logic between resume and job description
 """
 
-from utils.nlp_processor import extract_skills, extract_keywords_tfidf, preprocess_text
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import re
+from utils.nlp_processor import extract_skills, extract_keywords_tfidf, extract_keywords_batch
+from utils.tfidf_model import get_corpus_model, transform_ngrams, model_version
+from utils.tokenizer import tokenize, word_ngrams, pre_tokenized
+from utils.embeddings import get_embedder, embedder_version
+from utils.keywords import idf_version
+from utils.taxonomy import get_taxonomy
+from utils.job_profile import JobProfile, get_job_profile
+from utils.instrumentation import instrumented
 
+# scikit-learn is imported on first use to keep startup fast
 
+
+def scoring_version():
+    """
+    Identify everything besides the two texts that match scores depend on
+    
+    Stored scores should be keyed by this as well as the texts, so they are
+    recomputed after the taxonomy is edited or a model is refitted.
+    
+    Returns:
+        str: Skill taxonomy, corpus TF-IDF model, embedder and keyword IDF
+             table versions
+    """
+    return '|'.join((get_taxonomy().version, model_version(), embedder_version(), idf_version()))
+
+
+@instrumented
 def calculate_ml_match_score(resume_text, jd_text):
     """
     Calculate ML-based match score using TF-IDF and cosine similarity
     
+    Uses the corpus model from utils.tfidf_model when one has been trained,
+    otherwise fits a vectorizer on the two texts.
+    
     Args:
-        resume_text: Resume text content
-        jd_text: Job description text content
+        resume_text: Resume text content or TokenStream
+        jd_text: Job description text content or JobProfile
         
     Returns:
         float: Match score as percentage (0-100)
     """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+    
     try:
-        # Preprocess texts: lowercase and clean
-        resume_clean = resume_text.lower()
-        jd_clean = jd_text.lower()
-        
-        # Remove special characters but keep spaces
-        resume_clean = re.sub(r'[^a-z0-9\s]', ' ', resume_clean)
-        jd_clean = re.sub(r'[^a-z0-9\s]', ' ', jd_clean)
-        
-        # Remove extra whitespace
-        resume_clean = ' '.join(resume_clean.split())
-        jd_clean = ' '.join(jd_clean.split())
-        
-        # Create TF-IDF vectorizer with stopword removal
-        vectorizer = TfidfVectorizer(
-            stop_words='english',
-            max_features=100,
-            ngram_range=(1, 2)  # Use unigrams and bigrams
-        )
+        # Unigrams and bigrams without stopwords (the JD's are precomputed)
+        profile = get_job_profile(jd_text)
+        resume_ngrams = word_ngrams(tokenize(resume_text).ml_tokens)
         
-        # Fit and transform both texts
-        tfidf_matrix = vectorizer.fit_transform([resume_clean, jd_clean])
+        corpus_model = get_corpus_model()
+        if corpus_model is not None:
+            # Pre-trained corpus model: only the resume needs transforming
+            resume_vector = transform_ngrams(corpus_model, [resume_ngrams])
+            jd_vector = profile.vector_for(corpus_model)
+        else:
+            # TF-IDF over both token streams, keeping the top terms
+            vectorizer = TfidfVectorizer(
+                max_features=100,
+                analyzer=pre_tokenized
+            )
+            
+            # Fit and transform both texts
+            tfidf_matrix = vectorizer.fit_transform([resume_ngrams, profile.ml_ngrams])
+            resume_vector, jd_vector = tfidf_matrix[0:1], tfidf_matrix[1:2]
         
         # Calculate cosine similarity
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+        similarity = cosine_similarity(resume_vector, jd_vector)[0][0]
         
         # Convert to percentage
         ml_score = round(similarity * 100, 2)
@@ -55,25 +80,88 @@ def calculate_ml_match_score(resume_text, jd_text):
         return 0.0
 
 
+@instrumented
+def calculate_semantic_match_scores(resume_texts, jd_text):
+    """
+    Calculate embedding-based semantic match scores against one JD
+    
+    Unlike the TF-IDF score this rewards related wording ("built data
+    pipelines in Spark" vs "ETL experience"). Needs an embedding model, see
+    utils.embeddings.
+    
+    Args:
+        resume_texts: List of resume text contents
+        jd_text: Job description text content or JobProfile
+        
+    Returns:
+        list or None: Cosine similarity as percentage (0-100) for each
+                      resume, or None if no embedding model is available
+    """
+    embedder = get_embedder()
+    if embedder is None:
+        return None
+    
+    try:
+        jd_vector = get_job_profile(jd_text).embedding_for(embedder)
+        similarities = embedder.embed(list(resume_texts)) @ jd_vector
+        return [round(max(0.0, float(similarity)) * 100, 2) for similarity in similarities]
+    except Exception as e:
+        # Semantic scoring is optional; keep the lexical results usable
+        return None
+
+
+@instrumented
 def calculate_match_score(resume_text, jd_text):
     """
     Calculate match percentage between resume and job description
     
+    The JD side comes from a JobProfile, built once per distinct JD text and
+    cached by its hash, so only the resume is processed per call.
+    
     Args:
         resume_text: Resume text content
-        jd_text: Job description text content
+        jd_text: Job description text content or JobProfile
         
     Returns:
         dict: Dictionary containing match results
     """
-    # Extract skills from both texts
-    resume_skills = extract_skills(resume_text)
-    jd_skills = extract_skills(jd_text)
+    profile = get_job_profile(jd_text)
     
-    # Extract additional keywords using TF-IDF
-    resume_keywords = set(extract_keywords_tfidf(resume_text, top_n=15))
-    jd_keywords = set(extract_keywords_tfidf(jd_text, top_n=15))
+    # Tokenize once; skills, keywords and the ML score share the stream
+    tokens = tokenize(resume_text)
     
+    # Extract skills and additional keywords from the resume
+    resume_skills = extract_skills(tokens)
+    resume_keywords = set(extract_keywords_tfidf(tokens, top_n=15))
+    
+    # Calculate ML-based match score using TF-IDF + cosine similarity
+    ml_match_score = calculate_ml_match_score(tokens, profile)
+    
+    # Embedding similarity, when an embedding model is configured
+    semantic_scores = calculate_semantic_match_scores([resume_text], profile)
+    semantic_match_score = semantic_scores[0] if semantic_scores else None
+    
+    return _build_match_result(resume_skills, resume_keywords, profile.skills, profile.keywords,
+                               ml_match_score, semantic_match_score)
+
+
+@instrumented
+def _build_match_result(resume_skills, resume_keywords, jd_skills, jd_keywords, ml_match_score,
+                        semantic_match_score=None):
+    """
+    Combine extracted skills, keywords and ML score into a match result
+    
+    Args:
+        resume_skills: Set of skills found in the resume
+        resume_keywords: Set of keywords found in the resume
+        jd_skills: Set of skills found in the job description
+        jd_keywords: Set of keywords found in the job description
+        ml_match_score: TF-IDF cosine similarity percentage
+        semantic_match_score: Embedding similarity percentage (None without a model)
+        
+    Returns:
+        dict: Dictionary containing match results
+    """
     # Combine skills and keywords
     resume_features = resume_skills.union(resume_keywords)
     jd_features = jd_skills.union(jd_keywords)
@@ -88,9 +176,6 @@ def calculate_match_score(resume_text, jd_text):
     else:
         match_percentage = 0
     
-    # Calculate ML-based match score using TF-IDF + cosine similarity
-    ml_match_score = calculate_ml_match_score(resume_text, jd_text)
-    
     # Separate skills and keywords for better display
     matched_skills = matched_features.intersection(jd_skills)
     missing_skills = missing_features.intersection(jd_skills)
@@ -98,6 +183,7 @@ def calculate_match_score(resume_text, jd_text):
     return {
         'match_percentage': round(match_percentage, 2),
         'ml_match_score': ml_match_score,  # New ML-based score
+        'semantic_match_score': semantic_match_score,
         'matched_skills': sorted(list(matched_skills)),
         'missing_skills': sorted(list(missing_skills)),
         'total_jd_requirements': len(jd_features),
@@ -107,6 +193,92 @@ def calculate_match_score(resume_text, jd_text):
     }
 
 
+@instrumented
+def calculate_ml_match_scores(resume_texts, jd_text):
+    """
+    Calculate ML-based match scores for many resumes against one JD
+    
+    Uses the corpus model when one has been trained, otherwise fits a single
+    TF-IDF vectorizer over the JD and every resume (IDF weights then come from
+    the batch). All cosine similarities come from one sparse matrix product.
+    
+    Args:
+        resume_texts: List of resume text contents or TokenStreams
+        jd_text: Job description text content or JobProfile
+        
+    Returns:
+        list: Match score as percentage (0-100) for each resume
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    try:
+        profile = get_job_profile(jd_text)
+        resume_ngrams = [word_ngrams(tokenize(text).ml_tokens) for text in resume_texts]
+        
+        corpus_model = get_corpus_model()
+        if corpus_model is not None:
+            resume_matrix = transform_ngrams(corpus_model, resume_ngrams)
+            jd_vector = profile.vector_for(corpus_model)
+        else:
+            vectorizer = TfidfVectorizer(analyzer=pre_tokenized)
+            tfidf_matrix = vectorizer.fit_transform([profile.ml_ngrams] + resume_ngrams)
+            resume_matrix, jd_vector = tfidf_matrix[1:], tfidf_matrix[0]
+        
+        # Rows are L2-normalized, so the dot product is the cosine similarity
+        similarities = (resume_matrix @ jd_vector.T).toarray().ravel()
+        
+        return [round(float(similarity) * 100, 2) for similarity in similarities]
+    except Exception as e:
+        # Return 0 for every resume if any error occurs
+        return [0.0] * len(resume_texts)
+
+
+@instrumented
+def rank_resumes(jd_text, resume_texts):
+    """
+    Rank many resumes against one job description in a single batch
+    
+    Args:
+        jd_text: Job description text content or JobProfile
+        resume_texts: List of resume text contents
+        
+    Returns:
+        list: Match result dicts (same fields as calculate_match_score plus
+              'resume_index', the position in resume_texts), best match first
+    """
+    if not resume_texts:
+        return []
+    
+    # JD side is processed once (and cached) for the whole batch
+    profile = get_job_profile(jd_text)
+    
+    # Each resume is tokenized once for all three feature extractors
+    token_streams = [tokenize(text) for text in resume_texts]
+    keyword_lists = extract_keywords_batch(token_streams, top_n=15)
+    
+    ml_scores = calculate_ml_match_scores(token_streams, profile)
+    semantic_scores = calculate_semantic_match_scores(resume_texts, profile)
+    
+    results = []
+    for index, tokens in enumerate(token_streams):
+        result = _build_match_result(
+            extract_skills(tokens),
+            set(keyword_lists[index]),
+            profile.skills,
+            profile.keywords,
+            ml_scores[index],
+            semantic_scores[index] if semantic_scores else None
+        )
+        result['resume_index'] = index
+        results.append(result)
+    
+    # Best ML score first, skill match as tie-breaker
+    results.sort(key=lambda r: (r['ml_match_score'], r['match_percentage']), reverse=True)
+    
+    return results
+
+
+@instrumented
 def generate_suggestions(match_results):
     """
     Generate improvement suggestions based on match results
@@ -4,156 +4,113 @@ Handles text preprocessing and skill extraction using NLP techniques
 """
 
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.taxonomy import get_taxonomy
+from utils.instrumentation import instrumented
+from utils.resources import ensure_nltk_data
+from utils.tokenizer import TokenStream, tokenize
+from utils.keywords import extract_keywords, get_idf_table
+
+# NLTK and scikit-learn are imported on first use to keep startup fast
 
 
 # Download required NLTK data (will be handled in app initialization)
+@instrumented
 def download_nltk_data():
-    """Download required NLTK datasets"""
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    
-    try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords', quiet=True)
-
-
-# Common tech skills and their synonyms
-SKILL_SYNONYMS = {
-    'machine learning': ['ml', 'machine learning', 'machinelearning'],
-    'artificial intelligence': ['ai', 'artificial intelligence'],
-    'javascript': ['js', 'javascript', 'java script'],
-    'typescript': ['ts', 'typescript'],
-    'python': ['python', 'py'],
-    'rest api': ['rest', 'restful', 'rest api', 'api'],
-    'database': ['db', 'database', 'databases'],
-    'sql': ['sql', 'mysql', 'postgresql', 'postgres'],
-    'nosql': ['nosql', 'mongodb', 'cassandra', 'dynamodb'],
-    'react': ['react', 'reactjs', 'react.js'],
-    'angular': ['angular', 'angularjs'],
-    'vue': ['vue', 'vuejs', 'vue.js'],
-    'node': ['node', 'nodejs', 'node.js'],
-    'docker': ['docker', 'containerization'],
-    'kubernetes': ['k8s', 'kubernetes'],
-    'aws': ['aws', 'amazon web services'],
-    'azure': ['azure', 'microsoft azure'],
-    'gcp': ['gcp', 'google cloud'],
-    'ci/cd': ['ci/cd', 'cicd', 'continuous integration'],
-    'git': ['git', 'github', 'gitlab', 'version control'],
-}
-
-
-# Common technical skills to look for
-COMMON_SKILLS = [
-    # Programming Languages
-    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 
-    'swift', 'kotlin', 'go', 'rust', 'scala', 'r',
-    
-    # Web Technologies
-    'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 
-    'flask', 'spring', 'asp.net', 'jquery',
-    
-    # Databases
-    'sql', 'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 
-    'oracle', 'dynamodb', 'cassandra',
-    
-    # Cloud & DevOps
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform', 
-    'ansible', 'ci/cd', 'git',
-    
-    # Data Science & AI
-    'machine learning', 'deep learning', 'nlp', 'computer vision', 'tensorflow', 
-    'pytorch', 'scikit-learn', 'pandas', 'numpy', 'data analysis',
-    
-    # Other Skills
-    'agile', 'scrum', 'rest api', 'graphql', 'microservices', 'testing', 
-    'unit testing', 'api', 'linux', 'bash'
-]
+    """Download required NLTK datasets (checked once per process)"""
+    ensure_nltk_data()
+
+
+# Skills, aliases and parent skills live in data/skill_taxonomy.json (see
+# utils.taxonomy); the file is reloaded automatically when it changes
 
 
+@instrumented
 def preprocess_text(text):
     """
     Preprocess text: lowercase, tokenize, remove stopwords
     
     Args:
-        text: Input text string
+        text: Input text string or TokenStream
         
     Returns:
         list: List of processed tokens
     """
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Tokenize
-    tokens = word_tokenize(text)
+    # One regex pass (see utils.tokenizer); no Punkt sentence splitting
+    return tokenize(text).keyword_tokens
+
+
+@instrumented
+def normalize_for_ml(text):
+    """
+    Normalize text for TF-IDF scoring: lowercase, strip special characters
     
-    # Remove stopwords and short tokens
-    stop_words = set(stopwords.words('english'))
-    tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
+    Args:
+        text: Input text string
+        
+    Returns:
+        str: Normalized text
+    """
+    # Lowercase and remove special characters but keep spaces
+    text = re.sub(r'[^a-z0-9\s]', ' ', text.lower())
     
-    return tokens
+    # Remove extra whitespace
+    return ' '.join(text.split())
 
 
+@instrumented
 def extract_skills(text):
     """
     Extract technical skills from text using pattern matching and NLP
     
     Args:
-        text: Input text string
+        text: Input text string or TokenStream
         
     Returns:
-        set: Set of extracted skills
+        set: Set of extracted skills, including implied parent skills
     """
-    text_lower = text.lower()
-    found_skills = set()
-    
-    # Check for each common skill
-    for skill in COMMON_SKILLS:
-        # Use word boundaries to avoid partial matches
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.add(skill)
-    
-    # Check for synonyms and normalize
-    for canonical, synonyms in SKILL_SYNONYMS.items():
-        for synonym in synonyms:
-            pattern = r'\b' + re.escape(synonym) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(canonical)
-                break
-    
-    return found_skills
+    # Single pass over the text; aliases map to canonical names, then the
+    # taxonomy adds implied parents (e.g. pytorch -> deep learning)
+    taxonomy = get_taxonomy()
+    if isinstance(text, TokenStream):
+        # The stream already holds the lowercased text
+        return taxonomy.resolve(taxonomy.matcher.find_lowercase(text.lower))
+    return taxonomy.extract(text)
 
 
+@instrumented
 def extract_keywords_tfidf(text, top_n=20):
     """
     Extract important keywords using TF-IDF
     
+    With a single document IDF is constant, so this ranks unigrams and
+    bigrams by frequency, or by frequency x corpus IDF when a keyword IDF
+    table has been built (see utils.keywords).
+    
     Args:
-        text: Input text string
+        text: Input text string or TokenStream
         top_n: Number of top keywords to extract
         
     Returns:
         list: List of important keywords
     """
-    try:
-        # Preprocess
-        tokens = preprocess_text(text)
-        processed_text = ' '.join(tokens)
-        
-        # TF-IDF vectorization
-        vectorizer = TfidfVectorizer(max_features=top_n, ngram_range=(1, 2))
-        tfidf_matrix = vectorizer.fit_transform([processed_text])
-        
-        # Get feature names (keywords)
-        keywords = vectorizer.get_feature_names_out()
+    return extract_keywords(text, top_n, get_idf_table())
+
+
+@instrumented
+def extract_keywords_batch(texts, top_n=20):
+    """
+    Extract top keywords for many documents
+    
+    Each document is ranked on its own, exactly like extract_keywords_tfidf;
+    counting and a bounded heap per document is cheaper than fitting one
+    vectorizer over the whole batch.
+    
+    Args:
+        texts: List of input text strings or TokenStreams
+        top_n: Number of top keywords to extract per document
         
-        return list(keywords)
-    except:
-        return []
+    Returns:
+        list: One list of keywords per input text
+    """
+    idf_table = get_idf_table()
+    return [extract_keywords(text, top_n, idf_table) for text in texts]
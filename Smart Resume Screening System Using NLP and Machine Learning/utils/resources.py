@@ -0,0 +1,100 @@
+"""
+Resources Module
+Loads shared NLP resources once per process and pre-warms heavy imports
+
+scikit-learn, NLTK and the document parsers are imported lazily on first
+use so short-lived workers start quickly. Call prewarm() in a parent process
+before forking workers to have them inherit everything already loaded.
+"""
+
+import importlib
+import threading
+
+
+_LOCK = threading.RLock()
+_STOPWORDS = None
+_NLTK_DATA_CHECKED = False
+
+# Modules imported by prewarm(), slowest first
+HEAVY_MODULES = [
+    'sklearn.feature_extraction.text',
+    'sklearn.metrics.pairwise',
+    'joblib',
+    'numpy',
+    'scipy.sparse',
+    'nltk',
+    'pdfplumber',
+    'pypdfium2',
+]
+
+
+def ensure_nltk_data():
+    """
+    Make sure the NLTK stopword data is installed
+
+    The lookup runs once per process; later calls return immediately.
+    """
+    global _NLTK_DATA_CHECKED
+    if _NLTK_DATA_CHECKED:
+        return
+
+    with _LOCK:
+        if _NLTK_DATA_CHECKED:
+            return
+        import nltk
+
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords', quiet=True)
+        _NLTK_DATA_CHECKED = True
+
+
+def get_stopwords():
+    """
+    English stopword set, read from the NLTK corpus only once
+
+    Returns:
+        frozenset: Stopwords
+    """
+    global _STOPWORDS
+    if _STOPWORDS is None:
+        with _LOCK:
+            if _STOPWORDS is None:
+                from nltk.corpus import stopwords
+                _STOPWORDS = frozenset(stopwords.words('english'))
+    return _STOPWORDS
+
+
+def prewarm(load_nltk=True, load_models=True):
+    """
+    Import heavy modules and load shared resources ahead of time
+
+    Args:
+        load_nltk: Load the NLTK stopword set
+        load_models: Load the skill taxonomy and the corpus TF-IDF model (if
+                     one has been trained)
+
+    Returns:
+        list: Names of resources that could not be loaded
+    """
+    failed = []
+    for module in HEAVY_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            failed.append(module)
+
+    if load_nltk:
+        try:
+            get_stopwords()
+        except LookupError:
+            failed.append('nltk data')
+
+    if load_models:
+        from utils.taxonomy import get_taxonomy
+        from utils.tfidf_model import get_corpus_model
+        get_taxonomy()
+        get_corpus_model()
+
+    return failed
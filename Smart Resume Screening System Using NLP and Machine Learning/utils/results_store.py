@@ -0,0 +1,652 @@
+"""
+Results Store Module
+Columnar, memory-mapped store of screening results for analytics
+
+A store is a directory holding:
+    meta.json       segment list and row counts
+    skills.jsonl    skill dictionary, one name per line (line number = id)
+    jobs.jsonl      job dictionary, same format
+    write.lock      held by the one process appending or compacting at a time
+    seg-NNNNNN/     one append-only segment per batch of rows:
+        ids.jsonl / ids.offsets   resume id per row, plus byte offsets
+        <score>.bin               float32 (semantic NaN when absent)
+        <count>.bin               uint16
+        job.bin                   uint32 job id
+        <skills>.bin / .offsets   int32 skill ids plus int64 row offsets
+
+Filters, sorting and top-k read the memory-mapped columns directly; only
+the rows returned are decoded back into dicts. Several processes may write
+to one store: each append or compaction takes the lock and re-reads
+meta.json and the dictionaries first.
+
+Usage:
+    python -m utils.bulk_screen --jd job.txt --input resumes/ --output results.csv --store store/
+    python -m utils.results_store query --store store/ --where "ml_match_score > 60 and has kubernetes" --top-k 20
+    python -m utils.results_store compact --store store/
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Numeric columns and their on-disk dtypes
+SCORE_COLUMNS = ['match_percentage', 'ml_match_score', 'semantic_match_score']
+COUNT_COLUMNS = ['total_matched', 'total_jd_requirements']
+SKILL_COLUMNS = ['resume_skills', 'matched_skills', 'missing_skills']
+
+# Filter keywords for skill conditions ("has kubernetes", "missing docker")
+SKILL_PREDICATES = {'has': 'resume_skills', 'matched': 'matched_skills', 'missing': 'missing_skills'}
+
+_OPERATORS = {
+    '>': np.greater, '>=': np.greater_equal, '<': np.less,
+    '<=': np.less_equal, '==': np.equal, '!=': np.not_equal
+}
+_COMPARISON = re.compile(r'^(\w+)\s*(>=|<=|==|!=|>|<)\s*(-?\d+(?:\.\d+)?)$')
+
+
+def parse_filter(expression):
+    """
+    Parse a filter such as "ml_match_score > 60 and has kubernetes"
+
+    Conditions are joined with 'and'. Each is either a comparison of a
+    numeric column with a number, or 'has', 'matched' or 'missing' followed
+    by a skill name.
+
+    Args:
+        expression: Filter text (empty or None matches everything)
+
+    Returns:
+        list: Conditions as ('compare', column, operator, value) or
+              ('skill', column, skill) tuples
+    """
+    conditions = []
+    if not expression or not expression.strip():
+        return conditions
+    for clause in re.split(r'\s+and\s+', expression.strip(), flags=re.IGNORECASE):
+        word, _, rest = clause.strip().partition(' ')
+        if word.lower() in SKILL_PREDICATES and rest.strip():
+            conditions.append(('skill', SKILL_PREDICATES[word.lower()], rest.strip().lower()))
+            continue
+        match = _COMPARISON.match(clause.strip())
+        if not match or match.group(1) not in SCORE_COLUMNS + COUNT_COLUMNS:
+            raise ValueError(f"Cannot parse filter condition: {clause!r}")
+        conditions.append(('compare', match.group(1), match.group(2), float(match.group(3))))
+    return conditions
+
+
+class _Dictionary:
+    """Append-only string dictionary stored one JSON string per line"""
+
+    def __init__(self, path):
+        self.path = path
+        self.reload()
+
+    def reload(self):
+        """Re-read the file, picking up values other writers added"""
+        self.values = []
+        self._size = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                for line in f:
+                    # A line without its newline is a write a crash cut short
+                    if not line.endswith(b'\n'):
+                        break
+                    self.values.append(json.loads(line))
+                    self._size += len(line)
+        self.ids = {value: index for index, value in enumerate(self.values)}
+        self._pending = []
+
+    def encode(self, value):
+        """Id of a value, adding it if new (call flush() to persist)"""
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+            self._pending.append(value)
+        return index
+
+    def flush(self):
+        if self._pending:
+            data = ''.join(json.dumps(value) + '\n' for value in self._pending).encode('utf-8')
+            with open(self.path, 'ab') as f:
+                # Line numbers are ids, so an unfinished last line must go
+                f.truncate(self._size)
+                f.write(data)
+            self._size += len(data)
+            self._pending = []
+
+
+class _Segment:
+    """One immutable segment, its columns memory-mapped on first use"""
+
+    def __init__(self, directory, count):
+        self.directory = directory
+        self.count = count
+        self._columns = {}
+        self._ids = None
+
+    def column(self, name):
+        if name not in self._columns:
+            dtype = _column_dtype(name)
+            if self.count:
+                self._columns[name] = np.memmap(
+                    os.path.join(self.directory, name + '.bin'), dtype=dtype, mode='r', shape=(self.count,)
+                )
+            else:
+                self._columns[name] = np.empty(0, dtype=dtype)
+        return self._columns[name]
+
+    def skill_column(self, name):
+        """(offsets, values) of a skill column in CSR form"""
+        key = name + '.offsets'
+        if key not in self._columns:
+            offsets = np.fromfile(os.path.join(self.directory, name + '.offsets'), dtype=np.int64)
+            if offsets[-1]:
+                values = np.memmap(os.path.join(self.directory, name + '.bin'), dtype=np.int32, mode='r',
+                                   shape=(int(offsets[-1]),))
+            else:
+                values = np.empty(0, dtype=np.int32)
+            self._columns[key] = (offsets, values)
+        return self._columns[key]
+
+    @property
+    def ids(self):
+        """Every resume id in the segment (reads the whole id file)"""
+        if self._ids is None:
+            with open(os.path.join(self.directory, 'ids.jsonl'), encoding='utf-8') as f:
+                self._ids = [json.loads(line) for line in f if line.strip()]
+        return self._ids
+
+    def resume_id(self, row):
+        """Resume id of one row, read via the id offsets"""
+        if self._ids is not None:
+            return self._ids[row]
+        if 'ids.offsets' not in self._columns:
+            self._columns['ids.offsets'] = np.fromfile(os.path.join(self.directory, 'ids.offsets'), dtype=np.int64)
+        offsets = self._columns['ids.offsets']
+        with open(os.path.join(self.directory, 'ids.jsonl'), 'rb') as f:
+            f.seek(int(offsets[row]))
+            return json.loads(f.read(int(offsets[row + 1] - offsets[row])))
+
+
+def _column_dtype(name):
+    if name in SCORE_COLUMNS:
+        return np.float32
+    if name in COUNT_COLUMNS:
+        return np.uint16
+    if name == 'job':
+        return np.uint32
+    raise ValueError(f"Unknown column: {name}")
+
+
+def _rows_with_skill(offsets, values, skill_id):
+    """Boolean mask of rows whose skill list contains skill_id"""
+    mask = np.zeros(len(offsets) - 1, dtype=bool)
+    positions = np.flatnonzero(values == skill_id)
+    mask[np.searchsorted(offsets, positions, side='right') - 1] = True
+    return mask
+
+
+class ResultsStore:
+    """
+    Append-only columnar store of match results
+
+    Rows are the dicts written by bulk_screen (calculate_match_score fields
+    plus 'resume_id'); rows with an error have no scores and are skipped.
+    """
+
+    def __init__(self, directory):
+        """
+        Open a store, creating an empty one if the directory has none
+
+        Args:
+            directory: Store directory
+        """
+        self.directory = directory
+        self._meta_path = os.path.join(directory, 'meta.json')
+        self._lock_path = os.path.join(directory, 'write.lock')
+        os.makedirs(directory, exist_ok=True)
+        self.skills = _Dictionary(os.path.join(directory, 'skills.jsonl'))
+        self.jobs = _Dictionary(os.path.join(directory, 'jobs.jsonl'))
+        self._segments = {}
+        if os.path.exists(self._meta_path):
+            self._read_meta()
+        else:
+            # Another process may be creating the same store
+            with self._write_lock():
+                pass
+
+    def __len__(self):
+        return sum(segment['count'] for segment in self.meta['segments'])
+
+    def _read_meta(self):
+        with open(self._meta_path, encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Hold the store's exclusive write lock, with meta.json and the
+        dictionaries re-read under it (an empty store is created if needed)
+        """
+        with open(self._lock_path, 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                while True:
+                    try:
+                        # Retries for about 10 seconds before raising
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue
+            try:
+                if os.path.exists(self._meta_path):
+                    self._read_meta()
+                else:
+                    self.meta = {'segments': [], 'next_segment': 1}
+                    self._write_meta()
+                self.skills.reload()
+                self.jobs.reload()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _write_meta(self):
+        temp_path = self._meta_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(temp_path, self._meta_path)
+
+    def segments(self):
+        """Open segments in write order"""
+        opened = []
+        for entry in self.meta['segments']:
+            if entry['name'] not in self._segments:
+                self._segments[entry['name']] = _Segment(
+                    os.path.join(self.directory, entry['name']), entry['count']
+                )
+            opened.append(self._segments[entry['name']])
+        return opened
+
+    def append(self, rows, job=''):
+        """
+        Write rows as a new segment
+
+        Args:
+            rows: Iterable of result dicts (list fields may also be '; '-joined
+                  strings, as in bulk_screen CSV output)
+            job: Job name stored with every row (e.g. the JD file name)
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = [row for row in rows if not row.get('error')]
+        if not rows:
+            return 0
+
+        with self._write_lock():
+            entry = self._append_segment(rows, job)
+            self.meta['segments'].append(entry)
+            self._write_meta()
+        return len(rows)
+
+    def _append_segment(self, rows, job):
+        """Encode rows and write them as a segment (called under the write lock)"""
+        job_id = self.jobs.encode(job or '')
+        columns = {
+            column: np.array([_number(row.get(column)) for row in rows], dtype=np.float32)
+            for column in SCORE_COLUMNS
+        }
+        for column in COUNT_COLUMNS:
+            columns[column] = np.array([int(_number(row.get(column), 0)) for row in rows], dtype=np.uint16)
+        columns['job'] = np.full(len(rows), job_id, dtype=np.uint32)
+
+        skill_columns = {}
+        for column in SKILL_COLUMNS:
+            offsets = [0]
+            values = []
+            for row in rows:
+                values.extend(self.skills.encode(skill) for skill in _skill_list(row.get(column)))
+                offsets.append(len(values))
+            skill_columns[column] = (np.array(offsets, dtype=np.int64), np.array(values, dtype=np.int32))
+
+        return self._write_segment([row['resume_id'] for row in rows], columns, skill_columns)
+
+    def _write_segment(self, ids, columns, skill_columns):
+        """
+        Write one segment directory (not yet listed in meta.json)
+
+        Dictionaries are flushed first and the directory is renamed into
+        place last. A crash before meta.json is updated leaves unused
+        dictionary entries and an unlisted segment directory; new segments
+        skip names already on disk, and compact() removes the leftovers.
+
+        Returns:
+            dict: Segment entry for meta.json
+        """
+        while True:
+            name = f"seg-{self.meta['next_segment']:06d}"
+            self.meta['next_segment'] += 1
+            if not os.path.exists(os.path.join(self.directory, name)):
+                break
+        final_dir = os.path.join(self.directory, name)
+        temp_dir = final_dir + '.tmp'
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        os.makedirs(temp_dir)
+
+        id_offsets = [0]
+        with open(os.path.join(temp_dir, 'ids.jsonl'), 'wb') as f:
+            for resume_id in ids:
+                line = (json.dumps(resume_id) + '\n').encode('utf-8')
+                f.write(line)
+                id_offsets.append(id_offsets[-1] + len(line))
+        np.array(id_offsets, dtype=np.int64).tofile(os.path.join(temp_dir, 'ids.offsets'))
+        for column, values in columns.items():
+            np.asarray(values, dtype=_column_dtype(column)).tofile(os.path.join(temp_dir, column + '.bin'))
+        for column, (offsets, values) in skill_columns.items():
+            np.asarray(values, dtype=np.int32).tofile(os.path.join(temp_dir, column + '.bin'))
+            np.asarray(offsets, dtype=np.int64).tofile(os.path.join(temp_dir, column + '.offsets'))
+
+        self.skills.flush()
+        self.jobs.flush()
+        os.replace(temp_dir, final_dir)
+        return {'name': name, 'count': len(ids)}
+
+    def _mask(self, segment, conditions, job=None):
+        mask = np.ones(segment.count, dtype=bool)
+        if job is not None:
+            job_id = self.jobs.ids.get(job)
+            if job_id is None:
+                return np.zeros(segment.count, dtype=bool)
+            mask &= segment.column('job') == job_id
+        for condition in conditions:
+            if condition[0] == 'compare':
+                _, column, operator, value = condition
+                mask &= _OPERATORS[operator](segment.column(column), value)
+            else:
+                _, column, skill = condition
+                skill_id = self.skills.ids.get(skill)
+                if skill_id is None:
+                    return np.zeros(segment.count, dtype=bool)
+                mask &= _rows_with_skill(*segment.skill_column(column), skill_id)
+        return mask
+
+    def count(self, where=None, job=None):
+        """
+        Number of rows matching a filter
+
+        Args:
+            where: Filter expression (see parse_filter)
+            job: Only rows stored for this job name
+
+        Returns:
+            int: Matching rows
+        """
+        conditions = parse_filter(where)
+        return int(sum(self._mask(segment, conditions, job).sum() for segment in self.segments()))
+
+    def query(self, where=None, job=None, sort_by='ml_match_score', top_k=None, descending=True):
+        """
+        Filter, sort and decode matching rows
+
+        Each segment contributes at most top_k candidates (argpartition on the
+        sort column), so only the final rows are decoded.
+
+        Args:
+            where: Filter expression (see parse_filter)
+            job: Only rows stored for this job name
+            sort_by: Numeric column to sort on
+            top_k: Number of rows to return (None for all matches)
+            descending: Highest values first
+
+        Returns:
+            list: Result dicts, with 'job' added
+        """
+        _column_dtype(sort_by)
+        conditions = parse_filter(where)
+
+        candidates = []  # (sort value, segment index, row)
+        for segment_index, segment in enumerate(self.segments()):
+            rows = np.flatnonzero(self._mask(segment, conditions, job))
+            values = np.asarray(segment.column(sort_by)[rows], dtype=np.float64)
+            # Rows without a value (NaN semantic scores) sort last
+            keys = np.nan_to_num(-values if descending else values, nan=np.inf)
+            if top_k is not None and len(rows) > top_k:
+                keep = np.argpartition(keys, top_k - 1)[:top_k]
+                rows, keys = rows[keep], keys[keep]
+            candidates.extend(zip(keys.tolist(), [segment_index] * len(rows), rows.tolist()))
+
+        candidates.sort()
+        if top_k is not None:
+            candidates = candidates[:top_k]
+        segments = self.segments()
+        return [self._decode(segments[segment_index], row) for _, segment_index, row in candidates]
+
+    def _decode(self, segment, row):
+        result = {'resume_id': segment.resume_id(row), 'job': self.jobs.values[int(segment.column('job')[row])]}
+        for column in SCORE_COLUMNS:
+            value = float(segment.column(column)[row])
+            result[column] = None if np.isnan(value) else round(value, 2)
+        for column in COUNT_COLUMNS:
+            result[column] = int(segment.column(column)[row])
+        for column in SKILL_COLUMNS:
+            offsets, values = segment.skill_column(column)
+            result[column] = [self.skills.values[i] for i in values[offsets[row]:offsets[row + 1]]]
+        return result
+
+    def resume_ids(self, job=None):
+        """
+        Resume ids with a stored row
+
+        Args:
+            job: Only rows stored for this job name
+
+        Returns:
+            set: Resume ids
+        """
+        ids = set()
+        for segment in self.segments():
+            if job is None:
+                ids.update(segment.ids)
+            else:
+                mask = self._mask(segment, [], job)
+                ids.update(resume_id for resume_id, kept in zip(segment.ids, mask.tolist()) if kept)
+        return ids
+
+    def skill_frequencies(self, column='missing_skills', where=None, job=None, top_n=20):
+        """
+        Most common skills in a skill column across matching rows
+
+        Args:
+            column: One of SKILL_COLUMNS
+            where: Filter expression (see parse_filter)
+            job: Only rows stored for this job name
+            top_n: Number of skills to return
+
+        Returns:
+            list: (skill, rows) tuples, most common first
+        """
+        conditions = parse_filter(where)
+        totals = np.zeros(len(self.skills.values), dtype=np.int64)
+        for segment in self.segments():
+            mask = self._mask(segment, conditions, job)
+            offsets, values = segment.skill_column(column)
+            rows = np.repeat(mask, np.diff(offsets))
+            totals += np.bincount(values[rows], minlength=len(totals))
+        order = np.lexsort((np.arange(len(totals)), -totals))[:top_n]
+        return [(self.skills.values[i], int(totals[i])) for i in order if totals[i]]
+
+    def _remove_unlisted_segments(self):
+        """Delete segment directories a crashed append or compaction left behind"""
+        listed = {entry['name'] for entry in self.meta['segments']}
+        for name in os.listdir(self.directory):
+            if name.startswith('seg-') and name not in listed:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def compact(self):
+        """
+        Merge all segments into one, keeping the latest row per (resume, job)
+
+        Segment directories not listed in meta.json (left by a crash) are
+        deleted; the write lock keeps other writers out meanwhile.
+
+        Returns:
+            int: Rows in the compacted store
+        """
+        with self._write_lock():
+            return self._compact()
+
+    def _compact(self):
+        self._remove_unlisted_segments()
+        segments = self.segments()
+        if len(segments) <= 1:
+            return len(self)
+
+        latest = {}
+        for segment_index, segment in enumerate(segments):
+            jobs = segment.column('job').tolist()
+            for row, resume_id in enumerate(segment.ids):
+                latest[(resume_id, jobs[row])] = (segment_index, row)
+
+        keep = [np.zeros(segment.count, dtype=bool) for segment in segments]
+        for segment_index, row in latest.values():
+            keep[segment_index][row] = True
+
+        # Gather whole columns; rows are never decoded into dicts
+        ids = []
+        for segment, mask in zip(segments, keep):
+            ids.extend(resume_id for resume_id, kept in zip(segment.ids, mask.tolist()) if kept)
+        columns = {
+            column: np.concatenate([segment.column(column)[mask] for segment, mask in zip(segments, keep)])
+            for column in SCORE_COLUMNS + COUNT_COLUMNS + ['job']
+        }
+        skill_columns = {}
+        for column in SKILL_COLUMNS:
+            lengths, values = [], []
+            for segment, mask in zip(segments, keep):
+                offsets, segment_values = segment.skill_column(column)
+                row_lengths = np.diff(offsets)
+                lengths.append(row_lengths[mask])
+                values.append(segment_values[np.repeat(mask, row_lengths)])
+            offsets = np.concatenate([[0], np.cumsum(np.concatenate(lengths))]).astype(np.int64)
+            skill_columns[column] = (offsets, np.concatenate(values))
+
+        old_names = [entry['name'] for entry in self.meta['segments']]
+        self.meta['segments'] = [self._write_segment(ids, columns, skill_columns)]
+        self._write_meta()
+        for name in old_names:
+            self._segments.pop(name, None)
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        return len(ids)
+
+    def disk_size(self):
+        """Total bytes used by the store directory"""
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+
+def _number(value, default=np.nan):
+    if value is None or value == '':
+        return default
+    return float(value)
+
+
+def _skill_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [skill.strip() for skill in value.split(';') if skill.strip()]
+    return list(value)
+
+
+def read_result_rows(path):
+    """
+    Read rows from a bulk_screen CSV or JSONL results file
+
+    Args:
+        path: Results file
+
+    Returns:
+        list: Result dicts
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Query and maintain the columnar results store")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help="Add a bulk_screen results file")
+    import_parser.add_argument('--store', required=True, help="Store directory")
+    import_parser.add_argument('--input', required=True, help="Results file (.csv or .jsonl)")
+    import_parser.add_argument('--job', default=None, help="Job name (default: input file name)")
+
+    query_parser = subparsers.add_parser('query', help="Filter and rank stored results")
+    query_parser.add_argument('--store', required=True, help="Store directory")
+    query_parser.add_argument('--where', default=None, help='e.g. "ml_match_score > 60 and has kubernetes"')
+    query_parser.add_argument('--job', default=None, help="Only results for this job")
+    query_parser.add_argument('--sort', default='ml_match_score', help="Numeric column to sort by")
+    query_parser.add_argument('--ascending', action='store_true', help="Lowest values first")
+    query_parser.add_argument('--top-k', type=int, default=20, help="Rows to print")
+
+    stats_parser = subparsers.add_parser('stats', help="Row count, disk size and common missing skills")
+    stats_parser.add_argument('--store', required=True, help="Store directory")
+    stats_parser.add_argument('--where', default=None, help="Filter expression")
+
+    compact_parser = subparsers.add_parser('compact', help="Merge segments, keeping the latest results")
+    compact_parser.add_argument('--store', required=True, help="Store directory")
+
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.store)
+
+    if args.command == 'import':
+        job = args.job or os.path.splitext(os.path.basename(args.input))[0]
+        written = store.append(read_result_rows(args.input), job)
+        print(f"Added {written} rows for job {job!r} ({len(store)} rows in store)")
+    elif args.command == 'query':
+        try:
+            rows = store.query(args.where, args.job, args.sort, args.top_k, descending=not args.ascending)
+        except ValueError as e:
+            parser.error(str(e))
+        for row in rows:
+            print(json.dumps(row))
+    elif args.command == 'stats':
+        print(f"Rows: {len(store)} in {len(store.meta['segments'])} segments, "
+              f"{store.disk_size() / 1024:.1f} KiB on disk")
+        print(f"Matching filter: {store.count(args.where)}")
+        for skill, rows in store.skill_frequencies('missing_skills', args.where, top_n=10):
+            print(f"  missing {skill}: {rows}")
+    elif args.command == 'compact':
+        before = store.disk_size()
+        rows = store.compact()
+        print(f"Compacted to {rows} rows, {before / 1024:.1f} -> {store.disk_size() / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Role Matrix Module
+Scores M resumes against N job descriptions in one pass
+
+Resume and JD features (skills plus top keywords) are encoded as sparse
+binary matrices over the JD feature vocabulary, so the skill overlap of
+every pair is one sparse matrix product. TF-IDF vectors come from the corpus
+model when one is trained, otherwise from IDF weights counted over all JDs
+and resumes in a first pass. Resumes are processed in chunks so memory
+stays bounded, and the best roles per candidate are returned directly.
+
+Usage:
+    python -m utils.role_matrix --jds open_roles/ --input resumes/ --output roles.csv --top-k 5
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+from utils.nlp_processor import extract_skills, extract_keywords_batch
+from utils.job_profile import get_job_profile
+from utils.tfidf_model import get_corpus_model, transform_ngrams
+from utils.tokenizer import tokenize, word_ngrams, pre_tokenized
+from utils.instrumentation import instrumented
+
+
+# Resumes scored per chunk; a chunk holds chunk_size x N dense scores
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _binary_matrix(feature_sets, vocabulary):
+    """
+    Encode feature sets as a sparse 0/1 matrix over a vocabulary
+
+    Args:
+        feature_sets: List of sets of feature strings
+        vocabulary: Dict feature -> column index (other features are ignored)
+
+    Returns:
+        scipy.sparse.csr_matrix: len(feature_sets) x len(vocabulary) matrix
+    """
+    from scipy.sparse import csr_matrix
+
+    indptr = [0]
+    indices = []
+    for features in feature_sets:
+        indices.extend(sorted(vocabulary[f] for f in features if f in vocabulary))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return csr_matrix((data, indices, indptr), shape=(len(feature_sets), len(vocabulary)))
+
+
+def _fit_idf(documents):
+    """
+    Fit a TF-IDF vectorizer from document frequencies alone
+
+    Equivalent to TfidfVectorizer(analyzer=pre_tokenized).fit(documents),
+    but only one document is held at a time: the vocabulary and its
+    counts are all that is kept.
+
+    Args:
+        documents: Iterable of n-gram lists (see utils.tokenizer.word_ngrams)
+
+    Returns:
+        TfidfVectorizer or None: Fitted vectorizer, None if the vocabulary is empty
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    document_frequency = Counter()
+    n_documents = 0
+    for ngrams in documents:
+        document_frequency.update(set(ngrams))
+        n_documents += 1
+    if not document_frequency:
+        return None
+
+    vectorizer = TfidfVectorizer(analyzer=pre_tokenized)
+    vectorizer.vocabulary_ = {term: index for index, term in enumerate(sorted(document_frequency))}
+    df = np.array([document_frequency[term] for term in vectorizer.vocabulary_], dtype=np.float64)
+    # Smoothed IDF, as TfidfVectorizer computes it by default
+    vectorizer.idf_ = np.log((1 + n_documents) / (1 + df)) + 1
+    return vectorizer
+
+
+def _top_k(scores, tie_breaker, top_k):
+    """Column indices of the top_k scores per row, best first"""
+    top_k = min(top_k, scores.shape[1])
+    if top_k <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+    rows = np.arange(scores.shape[0])[:, None]
+    order = np.lexsort((-tie_breaker[rows, candidates], -scores[rows, candidates]), axis=1)
+    return candidates[rows, order]
+
+
+@instrumented
+def score_matrix(resume_texts, jd_texts, top_k=5, chunk_size=DEFAULT_CHUNK_SIZE,
+                 return_matrix=True, rank_by='ml_match_score'):
+    """
+    Score every resume against every job description
+
+    match_percentage is computed exactly as in calculate_match_score. The
+    ML score shares IDF weights across the whole batch (or the corpus
+    model), like rank_resumes.
+
+    Args:
+        resume_texts: List of M resume text contents
+        jd_texts: List of N job description texts or JobProfiles
+        top_k: Best roles returned per resume
+        chunk_size: Resumes scored per chunk
+        return_matrix: Also return the full M x N score matrices
+        rank_by: 'ml_match_score' or 'match_percentage' for top roles
+                 (the other score breaks ties)
+
+    Returns:
+        dict: 'match_percentage' and 'ml_match_score' (M x N float32 arrays,
+              or None if return_matrix is False) and 'top_roles' (per resume,
+              a list of {'jd_index', 'match_percentage', 'ml_match_score'})
+    """
+    if rank_by not in ('ml_match_score', 'match_percentage'):
+        raise ValueError("rank_by must be 'ml_match_score' or 'match_percentage'")
+
+    resume_texts = list(resume_texts)
+    profiles = [get_job_profile(jd) for jd in jd_texts]
+    m, n = len(resume_texts), len(profiles)
+
+    # JD side: binary features over the union of all JD features
+    jd_features = [profile.skills | profile.keywords for profile in profiles]
+    vocabulary = {}
+    for features in jd_features:
+        for feature in sorted(features):
+            vocabulary.setdefault(feature, len(vocabulary))
+    jd_binary_t = _binary_matrix(jd_features, vocabulary).T.tocsc()
+    jd_sizes = np.array([len(features) for features in jd_features], dtype=np.float32)
+    jd_sizes[jd_sizes == 0] = np.inf  # no requirements -> 0%
+
+    def tokenized_chunks():
+        """Skill/keyword features and ML n-grams per chunk, tokenizing each resume once"""
+        for start in range(0, m, chunk_size):
+            streams = [tokenize(text) for text in resume_texts[start:start + chunk_size]]
+            keyword_lists = extract_keywords_batch(streams, top_n=15)
+            features = [extract_skills(stream) | set(keywords) for stream, keywords in zip(streams, keyword_lists)]
+            yield features, [word_ngrams(stream.ml_tokens) for stream in streams]
+
+    # TF-IDF: corpus model if trained, otherwise IDF weights fitted over the
+    # whole batch in a first pass (resumes are tokenized again for scoring)
+    corpus_model = get_corpus_model()
+    if corpus_model is not None:
+        from scipy.sparse import vstack
+        jd_vectors = [profile.vector_for(corpus_model) for profile in profiles]
+        jd_tfidf_t = vstack(jd_vectors).T.tocsc() if n else None
+        vectorizer = corpus_model
+    else:
+        resume_ngrams = (word_ngrams(tokenize(text).ml_tokens) for text in resume_texts)
+        vectorizer = _fit_idf(itertools.chain([profile.ml_ngrams for profile in profiles], resume_ngrams))
+        # Empty vocabulary (e.g. only stop words): ML scores are all 0
+        jd_tfidf_t = (
+            transform_ngrams(vectorizer, [profile.ml_ngrams for profile in profiles]).T.tocsc()
+            if vectorizer is not None and n else None
+        )
+    scored_chunks = (
+        (features, transform_ngrams(vectorizer, ngrams) if vectorizer is not None else None)
+        for features, ngrams in tokenized_chunks()
+    )
+
+    skill_matrix = np.zeros((m, n), dtype=np.float32) if return_matrix else None
+    ml_matrix = np.zeros((m, n), dtype=np.float32) if return_matrix else None
+    top_roles = []
+
+    start = 0
+    for resume_features, chunk_tfidf in scored_chunks:
+        overlap = (_binary_matrix(resume_features, vocabulary) @ jd_binary_t).toarray()
+        skill_scores = np.round(overlap / jd_sizes * 100, 2).astype(np.float32)
+
+        if chunk_tfidf is not None and jd_tfidf_t is not None:
+            ml_scores = np.round((chunk_tfidf @ jd_tfidf_t).toarray() * 100, 2).astype(np.float32)
+        else:
+            ml_scores = np.zeros((len(resume_features), n), dtype=np.float32)
+
+        if return_matrix:
+            skill_matrix[start:start + len(resume_features)] = skill_scores
+            ml_matrix[start:start + len(resume_features)] = ml_scores
+        start += len(resume_features)
+
+        primary, secondary = (ml_scores, skill_scores) if rank_by == 'ml_match_score' else (skill_scores, ml_scores)
+        for row, columns in enumerate(_top_k(primary, secondary, top_k)):
+            top_roles.append([
+                {
+                    'jd_index': int(column),
+                    'match_percentage': round(float(skill_scores[row, column]), 2),
+                    'ml_match_score': round(float(ml_scores[row, column]), 2)
+                }
+                for column in columns
+            ])
+
+    return {
+        'match_percentage': skill_matrix,
+        'ml_match_score': ml_matrix,
+        'top_roles': top_roles
+    }
+
+
+def read_job_descriptions(directory):
+    """
+    Read every .txt/.md job description in a directory
+
+    Args:
+        directory: Directory with one job description per file
+
+    Returns:
+        list: (name, text) tuples sorted by file name
+    """
+    jds = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith(('.txt', '.md')):
+            with open(os.path.join(directory, name), encoding='utf-8', errors='ignore') as f:
+                jds.append((os.path.splitext(name)[0], f.read()))
+    return jds
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utils.bulk_screen import iter_resume_sources
+    from utils.text_extractor import extract_text, clean_text
+
+    parser = argparse.ArgumentParser(description="Match every resume against every open role")
+    parser.add_argument('--jds', required=True, help="Directory of job descriptions (.txt/.md)")
+    parser.add_argument('--input', required=True, help="Directory or .zip of PDF/DOCX resumes")
+    parser.add_argument('--output', required=True, help="CSV file of top roles per resume")
+    parser.add_argument('--top-k', type=int, default=5, help="Roles listed per resume")
+    parser.add_argument('--rank-by', choices=['ml_match_score', 'match_percentage'],
+                        default='ml_match_score', help="Score used to order roles")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="Resumes per chunk")
+    args = parser.parse_args(argv)
+
+    jds = read_job_descriptions(args.jds)
+    if not jds:
+        parser.error(f"No job descriptions found in {args.jds}")
+
+    resume_ids, resume_texts = [], []
+    for resume_id, loader in iter_resume_sources(args.input):
+        try:
+            resume_texts.append(clean_text(extract_text(io.BytesIO(loader()), resume_id)))
+            resume_ids.append(resume_id)
+        except Exception as e:
+            print(f"Skipping {resume_id}: {e}", file=sys.stderr)
+
+    results = score_matrix(resume_texts, [text for _, text in jds], top_k=args.top_k,
+                           chunk_size=args.chunk_size, return_matrix=False, rank_by=args.rank_by)
+
+    with open(args.output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['resume_id', 'rank', 'role', 'match_percentage', 'ml_match_score'])
+        for resume_id, roles in zip(resume_ids, results['top_roles']):
+            for rank, role in enumerate(roles, 1):
+                writer.writerow([resume_id, rank, jds[role['jd_index']][0],
+                                 role['match_percentage'], role['ml_match_score']])
+
+    print(f"Matched {len(resume_ids)} resumes against {len(jds)} roles, saved to {args.output}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+"""
+Scoring Service Module
+Asyncio HTTP service exposing the matcher to other systems (e.g. an ATS)
+
+Usage:
+    python -m utils.scoring_service --port 8080 --workers 4
+
+Endpoints:
+    GET  /health  Service status and queue depth
+    POST /score   {"jd_text": ..., "resume_text": ...}
+                  -> {"result": {...}, "suggestions": [...]}
+    POST /rank    {"jd_text": ..., "resume_texts": [...], "top_k": 10}
+                  -> {"results": [...]}
+
+Resumes may also be sent as files: instead of "resume_text" pass
+"resume_file" (base64) and "resume_filename"; for /rank pass "resumes", a
+list of {"text": ...} or {"file": ..., "filename": ...} objects.
+
+Concurrent /score requests for the same JD are gathered into one batch and
+scored with a single call in a worker process.
+"""
+
+import argparse
+import asyncio
+import base64
+import binascii
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.job_profile import hash_text
+from utils.matcher import calculate_match_score, generate_suggestions, rank_resumes
+from utils.resources import prewarm
+from utils.text_extractor import extract_text, extract_text_from_pdf, clean_text
+from utils.tfidf_model import get_corpus_model
+
+
+MAX_BODY_BYTES = 20 * 1024 * 1024
+MAX_HEADER_LINES = 100
+
+
+class ServiceError(Exception):
+    """Error returned to the client with an HTTP status code"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _resume_text(item):
+    """
+    Get clean resume text from a request item (runs in a worker process)
+
+    Args:
+        item: Dict with 'text', or 'file' (base64) and 'filename'
+
+    Returns:
+        str: Resume text content
+    """
+    if item.get('text') is not None:
+        return item['text']
+
+    data = io.BytesIO(base64.b64decode(item['file']))
+    filename = item.get('filename') or ''
+    if filename.lower().endswith('.pdf'):
+        # Already inside a worker process, so no nested page-level pool
+        return clean_text(extract_text_from_pdf(data, parallel=False))
+    return clean_text(extract_text(data, filename))
+
+
+def score_batch(jd_text, items):
+    """
+    Score a batch of resumes against one JD (runs in a worker process)
+
+    With a corpus TF-IDF model every score is independent of the rest of the
+    batch, so the whole batch goes through one vectorized rank_resumes call.
+    Without one, rank_resumes would fit IDF on the batch and a resume's score
+    would depend on which requests happened to arrive together, so each
+    resume is scored on its own against the shared (cached) JobProfile.
+
+    Args:
+        jd_text: Job description text content
+        items: List of resume request items
+
+    Returns:
+        list: One {'result', 'suggestions'} or {'error'} dict per item, in order
+    """
+    outputs = [None] * len(items)
+    texts = []
+    positions = []
+    for position, item in enumerate(items):
+        try:
+            texts.append(_resume_text(item))
+            positions.append(position)
+        except Exception as e:
+            outputs[position] = {'error': f"Could not read resume: {e}"}
+
+    if get_corpus_model() is not None:
+        results = [None] * len(texts)
+        for result in rank_resumes(jd_text, texts):
+            results[result.pop('resume_index')] = result
+    else:
+        results = [calculate_match_score(text, jd_text) for text in texts]
+
+    for position, result in zip(positions, results):
+        outputs[position] = {'result': result, 'suggestions': generate_suggestions(result)}
+    return outputs
+
+
+def rank_batch(jd_text, items, top_k=None):
+    """
+    Rank resumes against one JD (runs in a worker process)
+
+    Args:
+        jd_text: Job description text content
+        items: List of resume request items
+        top_k: Number of results to return (None for all)
+
+    Returns:
+        list: Match result dicts, best match first
+    """
+    texts = [_resume_text(item) for item in items]
+    results = rank_resumes(jd_text, texts)
+    return results[:top_k] if top_k is not None else results
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent /score requests for the same JD into one worker call
+
+    A batch is flushed when it reaches max_batch_size or when batch_window
+    seconds have passed since its first request.
+    """
+
+    def __init__(self, pool, max_batch_size=32, batch_window=0.01):
+        self.pool = pool
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._batches = {}  # JD hash -> (jd_text, items, futures)
+
+    async def submit(self, jd_text, item):
+        """
+        Queue one resume for scoring and wait for its result
+
+        Args:
+            jd_text: Job description text content
+            item: Resume request item
+
+        Returns:
+            dict: {'result', 'suggestions'} or {'error'}
+        """
+        loop = asyncio.get_running_loop()
+        key = hash_text(jd_text)
+        future = loop.create_future()
+
+        if key not in self._batches:
+            self._batches[key] = (jd_text, [], [])
+            loop.call_later(self.batch_window, self._flush, key)
+
+        _, items, futures = self._batches[key]
+        items.append(item)
+        futures.append(future)
+        if len(items) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key):
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            # Already flushed because it filled up before the window closed
+            return
+        jd_text, items, futures = batch
+        asyncio.ensure_future(self._run(jd_text, items, futures))
+
+    async def _run(self, jd_text, items, futures):
+        loop = asyncio.get_running_loop()
+        try:
+            outputs = await loop.run_in_executor(self.pool, score_batch, jd_text, items)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, output in zip(futures, outputs):
+            if not future.done():
+                future.set_result(output)
+
+
+class ScoringService:
+    """HTTP request handling, admission control and routing"""
+
+    def __init__(self, workers=None, max_pending=256, max_batch_size=32, batch_window=0.01):
+        """
+        Args:
+            workers: Worker processes for extraction and scoring (default: CPU count)
+            max_pending: Requests in progress before new ones get HTTP 503
+            max_batch_size: Largest /score batch sent to one worker call
+            batch_window: Seconds to wait for more /score requests for a JD
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.batcher = MicroBatcher(self.pool, max_batch_size, batch_window)
+        self.pending = 0
+        self.started = time.time()
+        self.served = 0
+        self.rejected = 0
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ServiceError as e:
+                    await self._respond(writer, e.status, {'error': e.message}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise ServiceError(400, "Malformed request line")
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise ServiceError(431, "Too many headers")
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise ServiceError(400, "Invalid Content-Length")
+        if length < 0:
+            raise ServiceError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ServiceError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b''
+
+        return method.upper(), target.split('?', 1)[0], headers, body
+
+    async def _respond(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload).encode('utf-8')
+        reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                  413: 'Payload Too Large', 431: 'Request Header Fields Too Large',
+                  500: 'Internal Server Error', 503: 'Service Unavailable'}.get(status, '')
+        head = [
+            f"HTTP/1.1 {status} {reason}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, path, body):
+        routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/score'): self.score,
+            ('POST', '/rank'): self.rank
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in routes):
+                return 405, {'error': f"Method {method} not allowed on {path}"}
+            return 404, {'error': f"Unknown endpoint {path}"}
+
+        if method == 'GET':
+            return 200, handler()
+
+        # Admission control: shed load instead of queueing without limit
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return 503, {'error': "Server busy, retry later"}
+
+        self.pending += 1
+        try:
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError:
+                return 400, {'error': "Request body must be JSON"}
+            if not isinstance(request, dict) or not isinstance(request.get('jd_text'), str):
+                return 400, {'error': "Field 'jd_text' is required"}
+            return await handler(request)
+        except ServiceError as e:
+            return e.status, {'error': e.message}
+        except Exception as e:
+            return 500, {'error': str(e)}
+        finally:
+            self.pending -= 1
+            self.served += 1
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'workers': self.workers,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'served': self.served,
+            'rejected': self.rejected,
+            'uptime_seconds': round(time.time() - self.started, 1)
+        }
+
+    async def score(self, request):
+        if isinstance(request.get('resume_text'), str):
+            item = {'text': request['resume_text']}
+        elif request.get('resume_file'):
+            _validate_base64(request['resume_file'])
+            item = {'file': request['resume_file'], 'filename': request.get('resume_filename', '')}
+        else:
+            raise ServiceError(400, "Field 'resume_text' or 'resume_file' is required")
+
+        output = await self.batcher.submit(request['jd_text'], item)
+        if 'error' in output:
+            raise ServiceError(400, output['error'])
+        return 200, output
+
+    async def rank(self, request):
+        if isinstance(request.get('resume_texts'), list):
+            if not all(isinstance(text, str) for text in request['resume_texts']):
+                raise ServiceError(400, "Each entry in 'resume_texts' must be a string")
+            items = [{'text': text} for text in request['resume_texts']]
+        elif isinstance(request.get('resumes'), list):
+            items = request['resumes']
+            for item in items:
+                if not isinstance(item, dict):
+                    raise ServiceError(400, "Each entry in 'resumes' must be an object")
+                if item.get('text') is None:
+                    _validate_base64(item.get('file'))
+                elif not isinstance(item['text'], str):
+                    raise ServiceError(400, "Field 'text' of each entry in 'resumes' must be a string")
+        else:
+            raise ServiceError(400, "Field 'resume_texts' or 'resumes' is required")
+
+        top_k = request.get('top_k')
+        if top_k is not None and (isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 0):
+            raise ServiceError(400, "Field 'top_k' must be a non-negative integer")
+
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            self.pool, rank_batch, request['jd_text'], items, top_k
+        )
+        return 200, {'results': results}
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def _validate_base64(data):
+    """Reject file payloads that are not valid base64 before queueing them"""
+    try:
+        base64.b64decode(data or '', validate=True)
+    except (binascii.Error, TypeError):
+        raise ServiceError(400, "Resume file must be base64 encoded")
+
+
+async def serve(host, port, service):
+    """Run the HTTP server until cancelled"""
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Scoring service listening on http://{host}:{port} "
+          f"({service.workers} workers)", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run the resume scoring HTTP service")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to bind")
+    parser.add_argument('--port', type=int, default=8080, help="Port to bind")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--max-pending', type=int, default=256,
+                        help="Requests in progress before returning HTTP 503")
+    parser.add_argument('--max-batch-size', type=int, default=32, help="Largest /score batch")
+    parser.add_argument('--batch-window-ms', type=float, default=10,
+                        help="How long to gather /score requests for the same JD")
+    args = parser.parse_args(argv)
+
+    # Load heavy modules once here so forked workers inherit them
+    prewarm()
+
+    service = ScoringService(
+        workers=args.workers,
+        max_pending=args.max_pending,
+        max_batch_size=args.max_batch_size,
+        batch_window=args.batch_window_ms / 1000
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
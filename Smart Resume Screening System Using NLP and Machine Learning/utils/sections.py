@@ -0,0 +1,307 @@
+"""
+Sections Module
+Splits resumes into sections (experience, skills, education, ...) and scores
+each section against a job description with configurable weights
+
+Headings are recognised in one linear pass over the lines the text
+extractor produces, so tables, headers and text boxes are covered too. Cues
+are heading styles and all-bold paragraphs in DOCX files, and capitals or a
+trailing colon in any format. Parsed sections can be stored as JSON keyed
+by the file hash, so re-scoring never re-parses the document.
+"""
+
+import io
+import json
+import os
+import re
+
+from utils.text_extractor import read_file_bytes, clean_text, extract_lines
+from utils.extraction_cache import ExtractionCache
+from utils.nlp_processor import extract_skills
+from utils.job_profile import get_job_profile
+from utils.matcher import calculate_ml_match_score
+from utils.instrumentation import instrumented
+
+
+# Section name -> heading variants (compared lowercase, punctuation removed)
+SECTION_ALIASES = {
+    'summary': ['summary', 'profile', 'professional summary', 'objective', 'career objective',
+                'about me', 'career summary', 'personal statement'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships',
+                   'internship', 'relevant experience'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'competencies',
+               'technologies', 'tools', 'skills and tools', 'technical proficiencies', 'expertise'],
+    'education': ['education', 'academic background', 'qualifications', 'academics',
+                  'educational background', 'academic qualifications'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'key projects',
+                 'selected projects', 'portfolio'],
+    'certifications': ['certifications', 'certificates', 'licenses', 'courses', 'training'],
+    'hobbies': ['hobbies', 'interests', 'hobbies and interests', 'extracurricular activities',
+                'activities'],
+    'other': ['awards', 'achievements', 'publications', 'languages', 'references',
+              'volunteering', 'volunteer experience'],
+}
+
+# Text before the first heading (name, contact details)
+HEADER_SECTION = 'header'
+
+# How much a skill found in each section counts towards the weighted score
+DEFAULT_SECTION_WEIGHTS = {
+    'experience': 1.0,
+    'projects': 0.8,
+    'skills': 0.7,
+    'certifications': 0.6,
+    'summary': 0.5,
+    'education': 0.5,
+    'other': 0.3,
+    'header': 0.3,
+    'hobbies': 0.1,
+}
+
+_HEADING_LOOKUP = {
+    alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases
+}
+_MAX_HEADING_WORDS = 6
+
+
+def _normalize_heading(text):
+    text = text.lower().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z\s]', ' ', text).split())
+
+
+def match_heading(text, has_cue=False):
+    """
+    Decide whether a line is a section heading
+
+    A line that is exactly a known heading always counts. With a layout cue
+    (bold, large font, heading style, capitals, trailing colon) a short line
+    that starts with a known heading counts too, e.g. "Experience & Internships".
+
+    Args:
+        text: Line text
+        has_cue: True if layout marks the line as heading-like
+
+    Returns:
+        str or None: Section name, or None for ordinary lines
+    """
+    normalized = _normalize_heading(text)
+    if not normalized:
+        return None
+    if normalized in _HEADING_LOOKUP:
+        return _HEADING_LOOKUP[normalized]
+
+    words = normalized.split()
+    if not has_cue or len(words) > _MAX_HEADING_WORDS:
+        return None
+    for length in range(len(words) - 1, 0, -1):
+        section = _HEADING_LOOKUP.get(' '.join(words[:length]))
+        if section:
+            return section
+    return None
+
+
+def segment_lines(lines):
+    """
+    Group lines into sections in a single pass
+
+    Args:
+        lines: Iterable of (text, has_cue) tuples in reading order
+
+    Returns:
+        dict: Section name -> cleaned section text, in document order.
+              Repeated headings are merged into one section.
+    """
+    sections = {}
+    current = HEADER_SECTION
+    for text, has_cue in lines:
+        section = match_heading(text, has_cue)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections.setdefault(current, []).append(text)
+
+    return {
+        name: clean_text('\n'.join(texts))
+        for name, texts in sections.items()
+        if texts and clean_text('\n'.join(texts))
+    }
+
+
+def _text_has_cue(text):
+    stripped = text.strip()
+    letters = [c for c in stripped if c.isalpha()]
+    return stripped.endswith(':') or (bool(letters) and all(c.isupper() for c in letters))
+
+
+def text_lines(text):
+    """
+    Lines of plain text with capitals / trailing colons as heading cues
+
+    Args:
+        text: Raw text with line breaks
+
+    Returns:
+        list: (text, has_cue) tuples
+    """
+    return [(line, _text_has_cue(line)) for line in text.splitlines() if line.strip()]
+
+
+def sections_from_lines(lines):
+    """
+    Split extracted lines into sections
+
+    Args:
+        lines: (text, styled) tuples from text_extractor.extract_lines
+
+    Returns:
+        dict: Section name -> cleaned section text
+    """
+    return segment_lines((text, styled or _text_has_cue(text)) for text, styled in lines)
+
+
+@instrumented
+def parse_sections(file, filename):
+    """
+    Split a PDF, DOCX or text resume into sections
+
+    Args:
+        file: File path or file object
+        filename: Original file name, used to pick the parser
+
+    Returns:
+        dict: Section name -> cleaned section text
+    """
+    if filename.lower().endswith(('.pdf', '.docx')):
+        return sections_from_lines(extract_lines(file, filename))
+
+    data = read_file_bytes(file)
+    return segment_lines(text_lines(data.decode('utf-8', errors='ignore')))
+
+
+class SectionStore:
+    """
+    Parsed sections stored as one JSON file per document, keyed by file hash
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory: Directory holding the JSON files
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """
+        Return stored sections for a document hash, or None
+
+        Args:
+            key: SHA-256 of the file bytes
+
+        Returns:
+            dict or None: Section name -> text
+        """
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                return json.load(f)['sections']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key, sections):
+        """
+        Store sections for a document hash
+
+        Args:
+            key: SHA-256 of the file bytes
+            sections: Section name -> text
+        """
+        temp_path = self._path(key) + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'sections': sections}, f)
+        os.replace(temp_path, self._path(key))
+
+
+def get_resume_sections(file, filename, store=None):
+    """
+    Parse a resume into sections, reusing stored sections when available
+
+    Args:
+        file: File path or file object
+        filename: Original file name
+        store: Optional SectionStore
+
+    Returns:
+        dict: Section name -> cleaned section text
+    """
+    data = read_file_bytes(file)
+    if store is None:
+        return parse_sections(io.BytesIO(data), filename)
+
+    key = ExtractionCache.key_for(data)
+    sections = store.get(key)
+    if sections is None:
+        sections = parse_sections(io.BytesIO(data), filename)
+        store.put(key, sections)
+    return sections
+
+
+@instrumented
+def calculate_section_scores(sections, jd_text, weights=None, only=None, previous=None):
+    """
+    Score each resume section against a job description
+
+    Every JD skill earns the weight of the highest-weighted section that
+    mentions it, so a skill listed under "Experience" counts more than the
+    same skill under "Hobbies".
+
+    Args:
+        sections: Section name -> text (from get_resume_sections)
+        jd_text: Job description text content or JobProfile
+        weights: Section name -> weight, overriding DEFAULT_SECTION_WEIGHTS
+        only: Section names to (re)score; None scores all of them
+        previous: Earlier result whose other section scores are reused
+
+    Returns:
+        dict: 'section_scores' (per section: weight, matched_skills,
+              skill_match, ml_match_score) and 'weighted_match_percentage'
+    """
+    profile = get_job_profile(jd_text)
+    weights = dict(DEFAULT_SECTION_WEIGHTS, **(weights or {}))
+    default_weight = weights.get('other', 0)
+
+    section_scores = {}
+    for name, text in sections.items():
+        if only is not None and name not in only and previous and name in previous['section_scores']:
+            section_scores[name] = dict(previous['section_scores'][name])
+            section_scores[name]['weight'] = weights.get(name, default_weight)
+            continue
+
+        matched_skills = extract_skills(text) & profile.skills
+        section_scores[name] = {
+            'weight': weights.get(name, default_weight),
+            'matched_skills': sorted(matched_skills),
+            'skill_match': round(len(matched_skills) / len(profile.skills) * 100, 2) if profile.skills else 0,
+            'ml_match_score': calculate_ml_match_score(text, profile)
+        }
+
+    # Each JD skill counts with the best weight among the sections containing it
+    max_weight = max(weights.values()) or 1
+    credit = {}
+    for scores in section_scores.values():
+        for skill in scores['matched_skills']:
+            credit[skill] = max(credit.get(skill, 0), scores['weight'] / max_weight)
+
+    if profile.skills:
+        weighted = sum(credit.values()) / len(profile.skills) * 100
+    else:
+        weighted = 0
+
+    return {
+        'section_scores': section_scores,
+        'weighted_match_percentage': round(weighted, 2)
+    }
@@ -0,0 +1,251 @@
+"""
+Skill Index Module
+Inverted index from skill to candidates, for shortlisting a candidate pool
+against a new job description without rescanning resume text
+
+Example:
+    index = SkillIndex.load('candidates.npz')
+    shortlist = index.shortlist(extract_skills(jd_text), min_coverage=0.5)
+    results = rank_resumes(jd_text, [resume_texts[c] for c in shortlist])
+"""
+
+import json
+import math
+from array import array
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from utils.nlp_processor import extract_skills
+
+
+class SkillIndex:
+    """
+    Skill -> candidate posting lists stored as sorted uint32 arrays
+
+    Candidates get a compact integer slot; slots of removed candidates are
+    reused by later additions.
+    """
+
+    def __init__(self):
+        self._candidate_ids = []   # slot -> candidate id (None if free)
+        self._slots = {}           # candidate id -> slot
+        self._free_slots = []
+        self._candidate_skills = {}  # slot -> frozenset of skills
+        self._postings = {}        # skill -> sorted array('I') of slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, candidate_id):
+        return candidate_id in self._slots
+
+    @property
+    def skills(self):
+        """Set of all skills held by at least one candidate"""
+        return set(self._postings)
+
+    def skills_of(self, candidate_id):
+        """
+        Args:
+            candidate_id: Candidate identifier
+
+        Returns:
+            frozenset: Skills indexed for the candidate
+        """
+        return self._candidate_skills[self._slots[candidate_id]]
+
+    def add(self, candidate_id, skills):
+        """
+        Add a candidate, replacing any existing entry with the same id
+
+        Args:
+            candidate_id: Candidate identifier (str or int)
+            skills: Iterable of skill names, e.g. from extract_skills
+        """
+        if candidate_id in self._slots:
+            self.remove(candidate_id)
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._candidate_ids[slot] = candidate_id
+        else:
+            slot = len(self._candidate_ids)
+            self._candidate_ids.append(candidate_id)
+        self._slots[candidate_id] = slot
+
+        skills = frozenset(skills)
+        self._candidate_skills[slot] = skills
+        for skill in skills:
+            postings = self._postings.setdefault(skill, array('I'))
+            if not postings or postings[-1] < slot:
+                postings.append(slot)
+            else:
+                insort(postings, slot)
+
+    def add_text(self, candidate_id, text):
+        """
+        Add a candidate from resume text
+
+        Args:
+            candidate_id: Candidate identifier
+            text: Resume text content
+        """
+        self.add(candidate_id, extract_skills(text))
+
+    def remove(self, candidate_id):
+        """
+        Remove a candidate from the index
+
+        Args:
+            candidate_id: Candidate identifier
+        """
+        slot = self._slots.pop(candidate_id)
+        for skill in self._candidate_skills.pop(slot):
+            postings = self._postings[skill]
+            del postings[bisect_left(postings, slot)]
+            if not postings:
+                del self._postings[skill]
+        self._candidate_ids[slot] = None
+        self._free_slots.append(slot)
+
+    def _posting_array(self, skill):
+        postings = self._postings.get(skill)
+        if postings is None:
+            return np.empty(0, dtype=np.uint32)
+        return np.frombuffer(postings, dtype=np.uint32)
+
+    def _to_ids(self, slots):
+        return [self._candidate_ids[slot] for slot in slots]
+
+    def query_all(self, skills):
+        """
+        Candidates having every one of the given skills (AND)
+
+        Args:
+            skills: Iterable of skill names
+
+        Returns:
+            list: Candidate ids
+        """
+        # Intersect starting from the shortest posting list
+        arrays = sorted((self._posting_array(skill) for skill in set(skills)), key=len)
+        if not arrays:
+            return []
+        result = arrays[0]
+        for postings in arrays[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, postings, assume_unique=True)
+        return self._to_ids(result.tolist())
+
+    def query_any(self, skills):
+        """
+        Candidates having at least one of the given skills (OR)
+
+        Args:
+            skills: Iterable of skill names
+
+        Returns:
+            list: Candidate ids
+        """
+        arrays = [self._posting_array(skill) for skill in set(skills)]
+        if not arrays:
+            return []
+        return self._to_ids(np.unique(np.concatenate(arrays)).tolist())
+
+    def coverage(self, skills):
+        """
+        Count how many of the given skills each candidate has
+
+        Args:
+            skills: Iterable of skill names, e.g. a JD's jd_skills
+
+        Returns:
+            list: (candidate_id, count) tuples for candidates with count > 0,
+                  highest count first
+        """
+        arrays = [self._posting_array(skill) for skill in set(skills)]
+        if not arrays:
+            return []
+        counts = np.bincount(np.concatenate(arrays), minlength=len(self._candidate_ids))
+        slots = np.flatnonzero(counts)
+        order = slots[np.argsort(-counts[slots], kind='stable')]
+        return [(self._candidate_ids[slot], int(counts[slot])) for slot in order]
+
+    def shortlist(self, jd_skills, min_coverage=0.5, limit=None):
+        """
+        Candidates covering at least a share of the JD skills
+
+        Args:
+            jd_skills: Iterable of skill names required by the JD
+            min_coverage: Minimum share of jd_skills (0-1) a candidate must have
+            limit: Maximum number of candidates to return
+
+        Returns:
+            list: Candidate ids, best coverage first
+        """
+        jd_skills = set(jd_skills)
+        min_count = max(1, math.ceil(min_coverage * len(jd_skills)))
+        shortlisted = [
+            candidate_id for candidate_id, count in self.coverage(jd_skills)
+            if count >= min_count
+        ]
+        return shortlisted[:limit] if limit is not None else shortlisted
+
+    def save(self, path):
+        """
+        Save the index to a .npz file
+
+        Args:
+            path: Destination file
+        """
+        skills = sorted(self._postings)
+        lengths = [len(self._postings[skill]) for skill in skills]
+        data = [self._postings[skill] for skill in skills]
+        np.savez_compressed(
+            path,
+            meta=np.array(json.dumps({
+                'candidate_ids': self._candidate_ids,
+                'skills': skills
+            })),
+            offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            postings=np.concatenate([np.frombuffer(a, dtype=np.uint32) for a in data])
+            if data else np.empty(0, dtype=np.uint32)
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save()
+
+        Args:
+            path: .npz file
+
+        Returns:
+            SkillIndex: Loaded index
+        """
+        with np.load(path) as archive:
+            meta = json.loads(str(archive['meta']))
+            offsets = archive['offsets']
+            postings = archive['postings']
+
+        index = cls()
+        index._candidate_ids = meta['candidate_ids']
+        for slot, candidate_id in enumerate(index._candidate_ids):
+            if candidate_id is None:
+                index._free_slots.append(slot)
+            else:
+                index._slots[candidate_id] = slot
+                index._candidate_skills[slot] = set()
+
+        for i, skill in enumerate(meta['skills']):
+            slots = postings[offsets[i]:offsets[i + 1]]
+            index._postings[skill] = array('I', slots.tobytes())
+            for slot in slots.tolist():
+                index._candidate_skills[slot].add(skill)
+
+        index._candidate_skills = {
+            slot: frozenset(skills) for slot, skills in index._candidate_skills.items()
+        }
+        return index
@@ -0,0 +1,128 @@
+"""
+Skill Matcher Module
+Compiles the skill list and synonym table into a single regex that finds
+every skill in one pass over the text
+"""
+
+import re
+
+
+def _build_trie(words):
+    """
+    Build a character trie from a list of words
+
+    Args:
+        words: Iterable of strings
+
+    Returns:
+        dict: Nested dict trie, with '' marking the end of a word
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_to_regex(node):
+    """
+    Render a trie as a regex alternation that prefers the longest word
+
+    Args:
+        node: Trie node from _build_trie
+
+    Returns:
+        str: Regex source matching every word stored below the node
+    """
+    is_end = '' in node
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char != ''
+    ]
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    # A word ends here, so everything below is optional (greedy = longest first)
+    return pattern + '?' if is_end else pattern
+
+
+class SkillMatcher:
+    """
+    Precompiled matcher mapping skill aliases to canonical skill names
+
+    All aliases are merged into one trie-shaped regex, so scanning a document
+    costs a single pass no matter how many skills the taxonomy holds.
+    Matching keeps the word-boundary semantics of a per-skill
+    r'\\b' + skill + r'\\b' search.
+    """
+
+    def __init__(self, skills, synonyms=None):
+        """
+        Args:
+            skills: List of canonical skill names (each matches itself)
+            synonyms: Dict mapping canonical name to a list of aliases
+        """
+        lookup = {}
+        for skill in skills:
+            lookup.setdefault(skill.lower(), set()).add(skill)
+        for canonical, aliases in (synonyms or {}).items():
+            for alias in aliases:
+                lookup.setdefault(alias.lower(), set()).add(canonical)
+
+        # The scan reports only the longest alias starting at each position,
+        # so fold in any shorter alias that would also have matched there
+        for alias in lookup:
+            for end in range(1, len(alias)):
+                prefix = alias[:end]
+                if prefix in lookup and re.match(r'\b' + re.escape(prefix) + r'\b', alias):
+                    lookup[alias] = lookup[alias] | lookup[prefix]
+
+        self.lookup = {alias: frozenset(names) for alias, names in lookup.items()}
+        self.max_alias_length = max((len(alias) for alias in self.lookup), default=0)
+
+        # Zero-width lookahead so matches may overlap, like independent searches
+        if self.lookup:
+            trie_regex = _trie_to_regex(_build_trie(self.lookup))
+            self.pattern = re.compile(r'\b(?=(' + trie_regex + r')\b)')
+        else:
+            self.pattern = None
+
+    def find(self, text):
+        """
+        Find all canonical skills mentioned in text
+
+        Args:
+            text: Input text string (matched case-insensitively)
+
+        Returns:
+            set: Set of canonical skill names
+        """
+        return self.find_lowercase(text.lower())
+
+    def find_lowercase(self, text):
+        """
+        find() for text that is already lowercased
+
+        Args:
+            text: Lowercased text string
+
+        Returns:
+            set: Set of canonical skill names
+        """
+        found_skills = set()
+        if self.pattern is None:
+            return found_skills
+
+        found_aliases = set(self.pattern.findall(text))
+
+        for alias in found_aliases:
+            found_skills.update(self.lookup[alias])
+
+        return found_skills
@@ -0,0 +1,277 @@
+"""
+Streaming Module
+Scores very large documents chunk by chunk with bounded memory
+
+Pages (PDF) or paragraphs (DOCX) flow through cleaning, skill scanning and
+term counting one at a time. Only n-gram counts are kept, never the whole
+document text, so peak memory depends on vocabulary size rather than
+document length.
+
+Example:
+    results = score_file_stream('portfolio.pdf', 'portfolio.pdf', jd_text,
+                                max_pages=50, max_chars=200000)
+"""
+
+import math
+from collections import Counter
+
+import numpy as np
+
+from utils.instrumentation import instrumented
+from utils.job_profile import get_job_profile
+from utils.keywords import rank_keywords, get_idf_table
+from utils.matcher import _build_match_result
+from utils.nlp_processor import extract_skills
+from utils.taxonomy import get_taxonomy
+from utils.text_extractor import iter_text_chunks, iter_clean_chunks
+from utils.tfidf_model import get_corpus_model
+from utils.tokenizer import tokenize, ngram_counts
+
+
+# Same settings as the per-request vectorizer in calculate_ml_match_score
+ML_MAX_FEATURES = 100
+
+
+def _count_ngrams(counts, tokens, previous_token):
+    """
+    Add unigram and bigram counts for one chunk, bridging the chunk boundary
+
+    Args:
+        counts: Counter to update
+        tokens: Unigrams of this chunk
+        previous_token: Last unigram of the previous chunk (or None)
+
+    Returns:
+        str or None: Last unigram seen, to carry into the next chunk
+    """
+    if not tokens:
+        return previous_token
+    counts.update(tokens)
+    if previous_token is not None:
+        counts[previous_token + ' ' + tokens[0]] += 1
+    counts.update(a + ' ' + b for a, b in zip(tokens, tokens[1:]))
+    return tokens[-1]
+
+
+def _seam_text(previous, chunk, overlap):
+    """
+    The words either side of a chunk boundary, for skills that straddle it
+
+    Each side is cut back to whole words, so a fragment such as "py" from
+    "happy" never looks like a word of its own.
+
+    Args:
+        previous: Previous chunk
+        chunk: Current chunk
+        overlap: Characters kept on each side (longest skill alias)
+
+    Returns:
+        str: Joined window, or '' when one side has no whole word
+    """
+    tail = previous[-overlap:]
+    if len(previous) > overlap and not previous[-overlap - 1].isspace():
+        parts = tail.split(None, 1)
+        tail = parts[1] if len(parts) > 1 else ''
+
+    head = chunk[:overlap]
+    if len(chunk) > overlap and not chunk[overlap].isspace():
+        parts = head.rsplit(None, 1)
+        head = parts[0] if len(parts) > 1 else ''
+
+    if not tail.strip() or not head.strip():
+        return ''
+    return tail + ' ' + head
+
+
+class StreamStats:
+    """
+    Everything the matcher needs from a resume, accumulated chunk by chunk
+
+    Attributes:
+        skills: Set of skills found
+        ml_counts: Unigram/bigram counts for ML scoring
+        keyword_counts: Unigram/bigram counts for keyword extraction
+        chunks: Number of chunks consumed
+        chars: Number of characters consumed
+    """
+
+    def __init__(self):
+        self.skills = set()
+        self.ml_counts = Counter()
+        self.keyword_counts = Counter()
+        self.chunks = 0
+        self.chars = 0
+
+
+@instrumented
+def scan_chunks(chunks):
+    """
+    Consume cleaned text chunks, collecting skills and term counts
+
+    Args:
+        chunks: Iterable of cleaned text chunks (e.g. from iter_clean_chunks)
+
+    Returns:
+        StreamStats: Accumulated document features
+    """
+    stats = StreamStats()
+
+    # Enough of each side of a chunk boundary to catch a skill split across it
+    overlap = get_taxonomy().matcher.max_alias_length
+    previous = None
+    last_ml_token = last_keyword_token = None
+
+    for chunk in chunks:
+        stats.chunks += 1
+        stats.chars += len(chunk)
+
+        stats.skills |= extract_skills(chunk)
+        if previous and overlap:
+            seam = _seam_text(previous, chunk, overlap)
+            if seam:
+                stats.skills |= extract_skills(seam)
+        previous = chunk
+
+        tokens = tokenize(chunk)
+        last_ml_token = _count_ngrams(stats.ml_counts, tokens.ml_tokens, last_ml_token)
+        last_keyword_token = _count_ngrams(stats.keyword_counts, tokens.keyword_tokens, last_keyword_token)
+
+    return stats
+
+
+def _max_features_vocabulary(totals, max_features):
+    """
+    The terms TfidfVectorizer(max_features=...) keeps
+
+    scikit-learn ranks its alphabetical vocabulary by total count with
+    numpy's (unstable) argsort; doing the same on the same array keeps
+    exactly the same terms when counts tie.
+
+    Args:
+        totals: Counter of terms summed over the documents
+        max_features: Number of terms to keep
+
+    Returns:
+        set: Kept terms
+    """
+    terms = sorted(totals)
+    if len(terms) <= max_features:
+        return set(terms)
+    counts = np.fromiter((totals[term] for term in terms), dtype=np.int64, count=len(terms))
+    return {terms[index] for index in (-counts).argsort()[:max_features]}
+
+
+def _normalized_vector(weights):
+    norm = math.sqrt(sum(value * value for value in weights.values()))
+    if not norm:
+        return {}
+    return {term: value / norm for term, value in weights.items()}
+
+
+def ml_counts_for_text(text):
+    """
+    Unigram/bigram counts of a whole text, as used by ml_score_from_counts
+
+    Args:
+        text: Input text string
+
+    Returns:
+        Counter: Term counts
+    """
+    return ngram_counts(tokenize(text).ml_tokens)
+
+
+@instrumented
+def ml_score_from_counts(resume_counts, jd):
+    """
+    ML match score computed from resume n-gram counts
+
+    With a corpus model the counts are weighted with its IDF table. Without
+    one this reproduces calculate_ml_match_score's two-document fit: keep
+    the ML_MAX_FEATURES most frequent terms, smoothed IDF over the pair,
+    L2-normalized TF-IDF vectors, cosine similarity.
+
+    Args:
+        resume_counts: Counter from StreamStats.ml_counts
+        jd: Job description text or JobProfile
+
+    Returns:
+        float: Match score as percentage (0-100)
+    """
+    profile = get_job_profile(jd)
+    corpus_model = get_corpus_model()
+
+    if corpus_model is not None:
+        vocabulary = corpus_model.vocabulary_
+        idf = corpus_model.idf_
+        weights = {}
+        for term, count in resume_counts.items():
+            index = vocabulary.get(term)
+            if index is not None:
+                tf = 1 + math.log(count) if corpus_model.sublinear_tf else count
+                weights[index] = tf * idf[index]
+        resume_vector = _normalized_vector(weights)
+
+        jd_row = profile.vector_for(corpus_model).tocsr()
+        jd_vector = dict(zip(jd_row.indices.tolist(), jd_row.data.tolist()))
+    else:
+        jd_counts = Counter(profile.ml_ngrams)
+
+        # Vocabulary limited to the most frequent terms across both documents
+        totals = Counter(resume_counts)
+        totals.update(jd_counts)
+        vocabulary = _max_features_vocabulary(totals, ML_MAX_FEATURES)
+
+        def tfidf(counts, other):
+            weights = {}
+            for term in vocabulary:
+                if counts.get(term):
+                    df = 1 + (1 if other.get(term) else 0)
+                    weights[term] = counts[term] * (math.log(3 / (1 + df)) + 1)
+            return _normalized_vector(weights)
+
+        resume_vector = tfidf(resume_counts, jd_counts)
+        jd_vector = tfidf(jd_counts, resume_counts)
+
+    similarity = sum(value * jd_vector.get(term, 0.0) for term, value in resume_vector.items())
+    return round(similarity * 100, 2)
+
+
+@instrumented
+def calculate_match_score_stream(chunks, jd_text, top_n=15):
+    """
+    calculate_match_score for a resume given as a stream of text chunks
+
+    Args:
+        chunks: Iterable of cleaned text chunks
+        jd_text: Job description text content or JobProfile
+        top_n: Number of resume keywords to extract
+
+    Returns:
+        dict: Same fields as calculate_match_score
+    """
+    profile = get_job_profile(jd_text)
+    stats = scan_chunks(chunks)
+
+    resume_keywords = set(rank_keywords(stats.keyword_counts, top_n, get_idf_table()))
+    ml_match_score = ml_score_from_counts(stats.ml_counts, profile)
+
+    return _build_match_result(stats.skills, resume_keywords, profile.skills, profile.keywords, ml_match_score)
+
+
+def score_file_stream(file, filename, jd_text, max_pages=None, max_chars=None):
+    """
+    Extract, clean and score a resume file without materializing its text
+
+    Args:
+        file: File path or file object
+        filename: Original file name, used to pick the extractor
+        jd_text: Job description text content or JobProfile
+        max_pages: Page cap for PDFs / paragraph cap for DOCX (None for all)
+        max_chars: Cap on cleaned characters consumed (None for no cap)
+
+    Returns:
+        dict: Same fields as calculate_match_score
+    """
+    chunks = iter_clean_chunks(iter_text_chunks(file, filename, max_pages), max_chars)
+    return calculate_match_score_stream(chunks, jd_text)
@@ -0,0 +1,236 @@
+"""
+Taxonomy Module
+Loads the skill taxonomy from a data file into a compiled, hot-reloadable
+lookup
+
+The taxonomy lists every skill with its aliases and parent skills, e.g.
+"pytorch" has the parent "deep learning", which has the parent "machine
+learning". Finding a skill implies all of its ancestors.
+
+Supported formats:
+    .json          {"skills": {"pytorch": {"aliases": [...], "parents": [...]}}}
+    .yaml / .yml   same structure as JSON (requires PyYAML)
+    .csv           columns skill, aliases, parents; lists separated by '|'
+
+get_taxonomy() re-checks the file's modification time at most every
+RELOAD_CHECK_SECONDS and reloads it when it changes, so long-running
+workers pick up edits without restarting.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from utils.skill_matcher import SkillMatcher
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Override with the RESUME_SKILL_TAXONOMY environment variable
+DEFAULT_TAXONOMY_PATH = os.path.join(PROJECT_ROOT, 'data', 'skill_taxonomy.json')
+
+# Minimum time between checks of the taxonomy file for changes
+RELOAD_CHECK_SECONDS = 2.0
+
+_LOCK = threading.Lock()
+_CURRENT = None
+_CURRENT_SIGNATURE = None
+_CHECKED_AT = 0.0
+
+
+def _split_list(value):
+    return [item.strip() for item in (value or '').split('|') if item.strip()]
+
+
+def read_taxonomy_file(path):
+    """
+    Parse a taxonomy file into skill entries
+
+    Args:
+        path: .json, .yaml/.yml or .csv file
+
+    Returns:
+        dict: Skill name -> {'aliases': [...], 'parents': [...]}
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.csv':
+        entries = {}
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                name = (row.get('skill') or '').strip()
+                if name:
+                    entries[name] = {
+                        'aliases': _split_list(row.get('aliases')),
+                        'parents': _split_list(row.get('parents'))
+                    }
+        return entries
+
+    with open(path, encoding='utf-8') as f:
+        if extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required for YAML taxonomies; run 'pip install pyyaml'")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    skills = (data or {}).get('skills', {})
+    return {
+        str(name): {
+            'aliases': list((entry or {}).get('aliases', [])),
+            'parents': list((entry or {}).get('parents', []))
+        }
+        for name, entry in skills.items()
+    }
+
+
+class Taxonomy:
+    """
+    Compiled skill taxonomy: alias matcher plus implied-parent closure
+
+    Attributes:
+        entries: Skill name -> {'aliases': [...], 'parents': [...]}
+        matcher: SkillMatcher over every skill name and alias
+        ancestors: Skill name -> frozenset of all implied parent skills
+        version: Hash of the source file, changes whenever it is edited
+    """
+
+    def __init__(self, entries, version=''):
+        """
+        Args:
+            entries: Skill name -> {'aliases': [...], 'parents': [...]}
+            version: Identifier of the source content
+        """
+        # Parents that are not listed themselves still become skills
+        entries = {name.lower(): entry for name, entry in entries.items()}
+        for entry in list(entries.values()):
+            for parent in entry.get('parents', []):
+                entries.setdefault(parent.lower(), {'aliases': [], 'parents': []})
+
+        self.entries = entries
+        self.version = version
+        self.matcher = SkillMatcher(
+            list(entries),
+            {name: entry['aliases'] for name, entry in entries.items() if entry.get('aliases')}
+        )
+        self.ancestors = self._build_ancestors(entries)
+
+    @staticmethod
+    def _build_ancestors(entries):
+        """Transitive closure of the parent links (cycles are tolerated)"""
+        ancestors = {}
+        for name in entries:
+            seen = set()
+            stack = [parent.lower() for parent in entries[name].get('parents', [])]
+            while stack:
+                parent = stack.pop()
+                if parent in seen or parent == name:
+                    continue
+                seen.add(parent)
+                stack.extend(p.lower() for p in entries.get(parent, {}).get('parents', []))
+            if seen:
+                ancestors[name] = frozenset(seen)
+        return ancestors
+
+    @property
+    def skills(self):
+        """List of canonical skill names"""
+        return list(self.entries)
+
+    @property
+    def synonyms(self):
+        """Dict mapping skill name to its aliases (skills with aliases only)"""
+        return {name: entry['aliases'] for name, entry in self.entries.items() if entry.get('aliases')}
+
+    def resolve(self, skills):
+        """
+        Add every implied parent skill to a set of skills
+
+        Args:
+            skills: Iterable of canonical skill names
+
+        Returns:
+            set: Skills plus all their ancestors
+        """
+        resolved = set(skills)
+        for skill in list(resolved):
+            resolved |= self.ancestors.get(skill, frozenset())
+        return resolved
+
+    def extract(self, text):
+        """
+        Find skills mentioned in text, including implied parents
+
+        Args:
+            text: Input text string
+
+        Returns:
+            set: Set of canonical skill names
+        """
+        return self.resolve(self.matcher.find(text))
+
+
+def get_taxonomy_path():
+    """Return the configured taxonomy file path"""
+    return os.environ.get('RESUME_SKILL_TAXONOMY', DEFAULT_TAXONOMY_PATH)
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def load_taxonomy(path=None):
+    """
+    Load and compile a taxonomy file
+
+    Args:
+        path: Taxonomy file (defaults to get_taxonomy_path())
+
+    Returns:
+        Taxonomy: Compiled taxonomy
+    """
+    path = path or get_taxonomy_path()
+    with open(path, 'rb') as f:
+        version = hashlib.sha256(f.read()).hexdigest()[:16]
+    return Taxonomy(read_taxonomy_file(path), version=version)
+
+
+def get_taxonomy():
+    """
+    Return the current taxonomy, reloading it if the file has changed
+
+    The file is stat()ed at most every RELOAD_CHECK_SECONDS. If a reload
+    fails (e.g. the file is half-written) the previous taxonomy stays in use
+    and the reload is retried at the next check.
+
+    Returns:
+        Taxonomy: Current compiled taxonomy
+    """
+    global _CURRENT, _CURRENT_SIGNATURE, _CHECKED_AT
+
+    now = time.monotonic()
+    if _CURRENT is not None and now - _CHECKED_AT < RELOAD_CHECK_SECONDS:
+        return _CURRENT
+
+    with _LOCK:
+        if _CURRENT is not None and now - _CHECKED_AT < RELOAD_CHECK_SECONDS:
+            return _CURRENT
+        path = get_taxonomy_path()
+        try:
+            signature = (os.path.abspath(path),) + _signature(path)
+            if signature != _CURRENT_SIGNATURE:
+                _CURRENT = load_taxonomy(path)
+                _CURRENT_SIGNATURE = signature
+        except Exception as e:
+            if _CURRENT is None:
+                raise
+            print(f"Keeping previous skill taxonomy, reload of {path} failed: {e}", file=sys.stderr)
+        _CHECKED_AT = time.monotonic()
+        return _CURRENT
@@ -3,55 +3,426 @@ Text Extractor Module
 Handles extraction of text from PDF and DOCX files
 """
 
-import pdfplumber
-from docx import Document
+import io
+import multiprocessing
+import os
+import posixpath
 import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
 
+from utils.instrumentation import instrumented
 
-def extract_text_from_pdf(file):
+# pdfplumber and pypdfium2 are imported on first use
+
+
+# Part of every extraction cache key; bump it whenever extracted text changes
+# so cached text from an older extractor is not served
+EXTRACTOR_VERSION = 3
+
+# Documents with at least this many pages are split across worker processes
+PARALLEL_PAGE_THRESHOLD = 10
+
+# Share of unreadable characters above which a page is treated as garbled
+GARBLED_CHAR_RATIO = 0.3
+
+# pdfium is not thread-safe; Streamlit serves sessions from several threads
+_PDFIUM_LOCK = threading.Lock()
+
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+# WordprocessingML element names, in ElementTree's {namespace}tag form
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W + 'p'
+_W_RUN = _W + 'r'
+_W_T = _W + 't'
+_W_BOLD = _W + 'b'
+_W_STYLE = _W + 'pStyle'
+_W_VAL = _W + 'val'
+_W_TAB = _W + 'tab'
+_W_BREAKS = (_W + 'br', _W + 'cr')
+_W_CELL = _W + 'tc'
+_W_TEXTBOX = _W + 'txbxContent'
+_W_PARAGRAPH_PROPERTIES = _W + 'pPr'
+
+# Word stores each text box twice, as DrawingML and as a VML fallback
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+_RELATIONSHIP = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_OFFICE_DOCUMENT_TYPE = '/officeDocument'
+
+
+@instrumented
+def read_file_bytes(file):
     """
-    Extract text from PDF file using pdfplumber
+    Read the full content of a file path or file object
     
     Args:
-        file: Uploaded PDF file object
+        file: File path, bytes, or file object (e.g. a Streamlit upload)
+        
+    Returns:
+        bytes: File content
+    """
+    if isinstance(file, bytes):
+        return file
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'rb') as f:
+            return f.read()
+    if hasattr(file, 'getvalue'):
+        return file.getvalue()
+    file.seek(0)
+    return file.read()
+
+
+def _is_garbled(text):
+    """
+    Check whether extracted page text looks like broken font encoding
+    
+    Args:
+        text: Page text from pdfium
+        
+    Returns:
+        bool: True if the page should be re-extracted with pdfplumber
+    """
+    if not text.strip():
+        return True
+    
+    bad_chars = sum(
+        1 for char in text
+        if char == '\ufffd' or (ord(char) < 32 and char not in '\n\r\t') or '\ue000' <= char <= '\uf8ff'
+    )
+    return bad_chars / len(text) > GARBLED_CHAR_RATIO
+
+
+@instrumented
+def _extract_pdf_pages(data, start, end):
+    """
+    Extract text from a range of PDF pages
+    
+    Uses pdfium's native text extraction and falls back to pdfplumber
+    only for pages that come back empty or garbled.
+    
+    Args:
+        data: PDF file content as bytes
+        start: Index of the first page
+        end: Index after the last page
+        
+    Returns:
+        list: Text of each page in the range
+    """
+    import pdfplumber
+    import pypdfium2 as pdfium
+    
+    page_texts = []
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(data)
+        try:
+            for index in range(start, end):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                page_texts.append(textpage.get_text_bounded().replace('\r\n', '\n'))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    
+    fallback_pages = [i for i, text in enumerate(page_texts) if _is_garbled(text)]
+    if fallback_pages:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
+            for i in fallback_pages:
+                page_texts[i] = pdf.pages[start + i].extract_text() or ''
+    
+    return page_texts
+
+
+def _get_pdf_pool():
+    """Create the shared process pool for page extraction on first use"""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            # Spawned (not forked) workers never inherit a held _PDFIUM_LOCK
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _PDF_POOL
+
+
+@instrumented
+def extract_text_from_pdf(file, parallel=True):
+    """
+    Extract text from PDF file using pypdfium2, with pdfplumber as fallback
+    
+    Args:
+        file: Uploaded PDF file object or file path
+        parallel: Spread long documents across worker processes
         
     Returns:
         str: Extracted text content
     """
-    text = ""
+    import pypdfium2 as pdfium
+    
     try:
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        data = read_file_bytes(file)
+        
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(data)
+            page_count = len(pdf)
+            pdf.close()
+        
+        workers = os.cpu_count() or 1
+        if parallel and page_count >= PARALLEL_PAGE_THRESHOLD and workers > 1:
+            # One contiguous page range per worker
+            chunk_size = -(-page_count // workers)
+            starts = list(range(0, page_count, chunk_size))
+            ends = [min(start + chunk_size, page_count) for start in starts]
+            page_texts = []
+            for chunk in _get_pdf_pool().map(_extract_pdf_pages, [data] * len(starts), starts, ends):
+                page_texts.extend(chunk)
+        else:
+            page_texts = _extract_pdf_pages(data, 0, page_count)
     except Exception as e:
         raise Exception(f"Error extracting PDF: {str(e)}")
     
-    return text.strip()
+    return "\n".join(text for text in page_texts if text).strip()
+
+
+def _docx_parts(archive):
+    """
+    Locate the main document part and its header and footer parts
+    
+    Args:
+        archive: Open zipfile.ZipFile of the DOCX package
+        
+    Returns:
+        tuple: (document part, list of header parts, list of footer parts)
+    """
+    document = 'word/document.xml'
+    names = set(archive.namelist())
+    if '_rels/.rels' in names:
+        for rel in ElementTree.fromstring(archive.read('_rels/.rels')).iter(_RELATIONSHIP):
+            if rel.get('Type', '').endswith(_OFFICE_DOCUMENT_TYPE):
+                document = rel.get('Target', document).lstrip('/')
+                break
+    
+    headers, footers = [], []
+    folder, base = posixpath.split(document)
+    rels_name = posixpath.join(folder, '_rels', base + '.rels')
+    if rels_name in names:
+        for rel in ElementTree.fromstring(archive.read(rels_name)).iter(_RELATIONSHIP):
+            kind = rel.get('Type', '').rsplit('/', 1)[-1]
+            if kind in ('header', 'footer') and rel.get('TargetMode') != 'External':
+                target = posixpath.normpath(posixpath.join(folder, rel.get('Target', '')))
+                if target in names:
+                    (headers if kind == 'header' else footers).append(target)
+    
+    # header1.xml, header2.xml, ... in section order
+    part_order = lambda part: (len(part), part)
+    return document, sorted(headers, key=part_order), sorted(footers, key=part_order)
 
 
+def _iter_part_paragraphs(stream):
+    """
+    Stream one WordprocessingML part, yielding each paragraph as it closes
+    
+    Table cells and text boxes hold ordinary paragraphs, so they come out
+    in document order along with the body text. Text box paragraphs close
+    before the paragraph they are anchored in.
+    
+    A paragraph is styled when it uses a heading or title style, or when
+    all of its text is in bold runs.
+    
+    Args:
+        stream: File object of the part's XML
+        
+    Yields:
+        tuple: (kind, text, styled) with kind 'paragraph', 'cell' or 'textbox'
+    """
+    # [text pieces, heading style, all bold] of each open paragraph
+    # (text boxes nest paragraphs)
+    open_paragraphs = []
+    run_bold = False
+    cell_depth = textbox_depth = properties_depth = fallback_depth = 0
+    
+    for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == _W_P:
+                open_paragraphs.append([[], False, True])
+            elif tag == _W_RUN:
+                run_bold = False
+            elif tag == _W_BOLD:
+                # Bold on the paragraph mark (inside pPr) does not style the text
+                if not properties_depth:
+                    run_bold = elem.get(_W_VAL, 'true').lower() not in ('0', 'false', 'off')
+            elif tag == _W_STYLE:
+                if open_paragraphs and elem.get(_W_VAL, '').lower().startswith(('heading', 'title')):
+                    open_paragraphs[-1][1] = True
+            elif tag == _W_CELL:
+                cell_depth += 1
+            elif tag == _W_TEXTBOX:
+                textbox_depth += 1
+            elif tag == _W_PARAGRAPH_PROPERTIES:
+                properties_depth += 1
+            elif tag == _MC_FALLBACK:
+                fallback_depth += 1
+            continue
+        
+        if tag == _W_T:
+            if elem.text and open_paragraphs:
+                paragraph = open_paragraphs[-1]
+                paragraph[0].append(elem.text)
+                if not run_bold and not elem.text.isspace():
+                    paragraph[2] = False
+        elif tag == _W_P:
+            pieces, heading_style, all_bold = open_paragraphs.pop()
+            text = ''.join(pieces)
+            if text.strip() and not fallback_depth:
+                styled = heading_style or all_bold
+                if textbox_depth:
+                    yield 'textbox', text, styled
+                elif cell_depth:
+                    yield 'cell', text, styled
+                else:
+                    yield 'paragraph', text, styled
+            elem.clear()
+        elif tag == _W_TAB:
+            # Tab stops inside paragraph properties are not text
+            if open_paragraphs and not properties_depth:
+                open_paragraphs[-1][0].append('\t')
+        elif tag in _W_BREAKS:
+            if open_paragraphs:
+                open_paragraphs[-1][0].append('\n')
+        elif tag == _W_CELL:
+            cell_depth -= 1
+        elif tag == _W_TEXTBOX:
+            textbox_depth -= 1
+        elif tag == _W_PARAGRAPH_PROPERTIES:
+            properties_depth -= 1
+        elif tag == _MC_FALLBACK:
+            fallback_depth -= 1
+            elem.clear()
+
+
+def iter_docx_blocks(file):
+    """
+    Yield every text block of a DOCX in reading order, in one pass over its XML
+    
+    Headers come first, then the body (paragraphs, table cells row by row,
+    and text boxes), then footers. Each part is streamed with iterparse, so
+    the document tree is never built in memory. Header and footer text that
+    repeats across sections is yielded once.
+    
+    Args:
+        file: Uploaded DOCX file object, file path or bytes
+        
+    Yields:
+        tuple: (kind, text, styled) with kind 'header', 'paragraph', 'cell',
+            'textbox' or 'footer'; styled is True for heading or title
+            styles and all-bold paragraphs
+    """
+    if isinstance(file, (bytes, bytearray)):
+        file = io.BytesIO(file)
+    elif hasattr(file, 'seek'):
+        file.seek(0)
+    
+    with zipfile.ZipFile(file) as archive:
+        document, headers, footers = _docx_parts(archive)
+        
+        seen = set()
+        for part in headers:
+            with archive.open(part) as stream:
+                for _, text, styled in _iter_part_paragraphs(stream):
+                    if text not in seen:
+                        seen.add(text)
+                        yield 'header', text, styled
+        
+        with archive.open(document) as stream:
+            yield from _iter_part_paragraphs(stream)
+        
+        seen = set()
+        for part in footers:
+            with archive.open(part) as stream:
+                for _, text, styled in _iter_part_paragraphs(stream):
+                    if text not in seen:
+                        seen.add(text)
+                        yield 'footer', text, styled
+
+
+@instrumented
 def extract_text_from_docx(file):
     """
-    Extract text from DOCX file using python-docx
+    Extract text from a DOCX file, including tables, headers, footers and text boxes
     
     Args:
-        file: Uploaded DOCX file object
+        file: Uploaded DOCX file object or file path
         
     Returns:
         str: Extracted text content
     """
-    text = ""
     try:
-        doc = Document(file)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        lines = [text for _, text, _ in iter_docx_blocks(file)]
     except Exception as e:
         raise Exception(f"Error extracting DOCX: {str(e)}")
     
-    return text.strip()
+    return "\n".join(lines).strip()
+
+
+@instrumented
+def extract_text(file, filename):
+    """
+    Extract text from a PDF or DOCX file, chosen by file extension
+    
+    Args:
+        file: File path or file object
+        filename: Original file name, used to pick the extractor
+        
+    Returns:
+        str: Extracted text content
+    """
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        return extract_text_from_pdf(file)
+    elif name.endswith('.docx'):
+        return extract_text_from_docx(file)
+    else:
+        raise Exception(f"Unsupported file type: {filename}")
 
 
+@instrumented
+def extract_lines(file, filename, parallel=True):
+    """
+    Extract the lines of a PDF or DOCX file with a heading cue from its styling
+    
+    Joining the lines gives the same text as extract_text. DOCX lines are
+    styled for heading or title styles and all-bold paragraphs; PDF lines
+    carry no styling.
+    
+    Args:
+        file: File path or file object
+        filename: Original file name, used to pick the extractor
+        parallel: Spread long PDFs across worker processes
+        
+    Returns:
+        list: (text, styled) tuples of the non-empty lines in reading order
+    """
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        text = extract_text_from_pdf(file, parallel=parallel)
+        return [(line, False) for line in text.splitlines() if line.strip()]
+    elif name.endswith('.docx'):
+        try:
+            return [(text, styled) for _, text, styled in iter_docx_blocks(file)]
+        except Exception as e:
+            raise Exception(f"Error extracting DOCX: {str(e)}")
+    else:
+        raise Exception(f"Unsupported file type: {filename}")
+
+
+@instrumented
 def clean_text(text):
     """
     Clean and normalize extracted text
@@ -69,3 +440,145 @@ def clean_text(text):
     text = re.sub(r'[^\w\s\.\,\-\+\#]', '', text)
     
     return text.strip()
+
+
+def iter_pdf_pages(file, max_pages=None):
+    """
+    Yield the text of a PDF one page at a time
+    
+    Only one page of text is held in memory at once. Pages use pdfium's
+    native text extraction, with pdfplumber as fallback for empty or
+    garbled pages.
+    
+    Args:
+        file: Uploaded PDF file object or file path
+        max_pages: Stop after this many pages (None for all)
+        
+    Yields:
+        str: Text of each non-empty page
+    """
+    import pdfplumber
+    import pypdfium2 as pdfium
+    
+    # pdfium reads a path directly, without loading the whole file
+    source = file if isinstance(file, (str, os.PathLike)) else read_file_bytes(file)
+    try:
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            page_count = len(pdf)
+    except Exception as e:
+        raise Exception(f"Error extracting PDF: {str(e)}")
+    
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    
+    fallback_pdf = None
+    try:
+        for index in range(page_count):
+            with _PDFIUM_LOCK:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_bounded().replace('\r\n', '\n')
+                textpage.close()
+                page.close()
+            
+            if _is_garbled(page_text):
+                if fallback_pdf is None:
+                    fallback_source = source if isinstance(source, (str, os.PathLike)) else io.BytesIO(source)
+                    fallback_pdf = pdfplumber.open(fallback_source)
+                fallback_page = fallback_pdf.pages[index]
+                page_text = fallback_page.extract_text() or ''
+                fallback_page.close()
+            
+            if page_text:
+                yield page_text
+    finally:
+        with _PDFIUM_LOCK:
+            pdf.close()
+        if fallback_pdf is not None:
+            fallback_pdf.close()
+
+
+def iter_docx_paragraphs(file, max_paragraphs=None):
+    """
+    Yield the text of a DOCX one paragraph at a time
+    
+    Paragraphs come from iter_docx_blocks, so table cells, headers, footers
+    and text boxes are included in reading order.
+    
+    Args:
+        file: Uploaded DOCX file object or file path
+        max_paragraphs: Stop after this many non-empty paragraphs (None for all)
+        
+    Yields:
+        str: Text of each non-empty paragraph
+    """
+    blocks = iter_docx_blocks(file)
+    count = 0
+    while max_paragraphs is None or count < max_paragraphs:
+        try:
+            _, text, _ = next(blocks)
+        except StopIteration:
+            break
+        except Exception as e:
+            raise Exception(f"Error extracting DOCX: {str(e)}")
+        count += 1
+        yield text
+    blocks.close()
+
+
+def iter_text_chunks(file, filename, max_pages=None):
+    """
+    Yield page (PDF) or paragraph (DOCX) chunks, chosen by file extension
+    
+    Args:
+        file: File path or file object
+        filename: Original file name, used to pick the extractor
+        max_pages: Page cap for PDFs / paragraph cap for DOCX (None for all)
+        
+    Returns:
+        iterator: Raw text chunks
+    """
+    name = filename.lower()
+    if name.endswith('.pdf'):
+        return iter_pdf_pages(file, max_pages)
+    elif name.endswith('.docx'):
+        return iter_docx_paragraphs(file, max_pages)
+    else:
+        raise Exception(f"Unsupported file type: {filename}")
+
+
+def iter_clean_chunks(chunks, max_chars=None):
+    """
+    Clean text chunks one at a time, stopping at a character cap
+    
+    Joining the output with single spaces gives the same text as running
+    clean_text on the whole document (up to whitespace).
+    
+    Args:
+        chunks: Iterable of raw text chunks
+        max_chars: Stop after this many cleaned characters (None for no
+                   cap); the text is cut at the last whole word before it
+        
+    Yields:
+        str: Cleaned, non-empty chunks
+    """
+    total = 0
+    for chunk in chunks:
+        cleaned = clean_text(chunk)
+        if not cleaned:
+            continue
+        if max_chars is not None:
+            remaining = max_chars - total
+            if remaining <= 0:
+                break
+            if len(cleaned) > remaining:
+                # A cut token could match another skill ('javascript' -> 'java')
+                cut = cleaned[:remaining + 1].rfind(' ')
+                cleaned = cleaned[:cut] if cut > 0 else ''
+                total = max_chars
+                if not cleaned:
+                    break
+            else:
+                total += len(cleaned)
+        yield cleaned
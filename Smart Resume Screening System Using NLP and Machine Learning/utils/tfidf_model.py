@@ -0,0 +1,238 @@
+"""
+TF-IDF Model Module
+Trains, saves and loads a corpus-level TF-IDF vectorizer for ML scoring
+
+Fit the model offline on a directory of resumes and job descriptions:
+    python -m utils.tfidf_model fit path/to/documents
+"""
+
+import argparse
+import os
+import sys
+from collections import Counter
+
+from utils.nlp_processor import normalize_for_ml
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Override with the RESUME_TFIDF_MODEL environment variable
+DEFAULT_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'tfidf_vectorizer.joblib')
+
+DOCUMENT_EXTENSIONS = ('.txt', '.md', '.pdf', '.docx')
+
+# Loaded models, keyed by path, so each process reads each version of the file once
+_MODEL_CACHE = {}
+
+# (mtime, size) of each cached model's file when it was loaded
+_MODEL_SIGNATURES = {}
+
+
+def get_model_path():
+    """Return the configured model path"""
+    return os.environ.get('RESUME_TFIDF_MODEL', DEFAULT_MODEL_PATH)
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def model_version():
+    """
+    Identify the configured corpus model file; changes when it is refitted
+
+    Returns:
+        str: Path, modification time and size ('' without a model)
+    """
+    path = os.path.abspath(get_model_path())
+    signature = _signature(path)
+    return f"{path}:{signature[0]}:{signature[1]}" if signature else ''
+
+
+def fit_corpus_model(texts, max_features=20000):
+    """
+    Fit a TF-IDF vectorizer on a corpus of resumes and job descriptions
+
+    Args:
+        texts: List of document text contents
+        max_features: Maximum vocabulary size
+
+    Returns:
+        TfidfVectorizer: Fitted vectorizer
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer(
+        stop_words='english',
+        max_features=max_features,
+        ngram_range=(1, 2),  # Use unigrams and bigrams
+        sublinear_tf=True
+    )
+    vectorizer.fit([normalize_for_ml(text) for text in texts])
+    return vectorizer
+
+
+def transform_ngrams(vectorizer, documents):
+    """
+    Transform pre-tokenized documents with a fitted vectorizer
+
+    Gives the same rows as vectorizer.transform() on the original texts,
+    without running the vectorizer's own analyzer again.
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer
+        documents: List of n-gram lists (see utils.tokenizer.word_ngrams)
+
+    Returns:
+        sparse matrix: One TF-IDF row per document
+    """
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from sklearn.preprocessing import normalize
+
+    vocabulary = vectorizer.vocabulary_
+    indices, data, indptr = [], [], [0]
+    for ngrams in documents:
+        counts = Counter(vocabulary[term] for term in ngrams if term in vocabulary)
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    matrix = csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(documents), len(vocabulary))
+    )
+    if vectorizer.sublinear_tf:
+        np.log(matrix.data, out=matrix.data)
+        matrix.data += 1
+    matrix.data *= vectorizer.idf_[matrix.indices]
+    return normalize(matrix, norm=vectorizer.norm) if vectorizer.norm else matrix
+
+
+def save_model(vectorizer, path=None):
+    """
+    Save a fitted vectorizer to disk
+
+    Args:
+        vectorizer: Fitted TfidfVectorizer
+        path: Destination file (defaults to get_model_path())
+
+    Returns:
+        str: Path the model was written to
+    """
+    import joblib
+
+    path = path or get_model_path()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    joblib.dump(vectorizer, path)
+
+    # Make the new model visible to this process on next use
+    _MODEL_CACHE.pop(os.path.abspath(path), None)
+    return path
+
+
+def load_model(path=None):
+    """
+    Load a saved vectorizer, reading the file again only when it changes
+
+    Args:
+        path: Model file (defaults to get_model_path())
+
+    Returns:
+        TfidfVectorizer: Fitted vectorizer
+    """
+    import joblib
+
+    path = os.path.abspath(path or get_model_path())
+    signature = _signature(path)
+    if path not in _MODEL_CACHE or _MODEL_SIGNATURES.get(path) != signature:
+        _MODEL_CACHE[path] = joblib.load(path)
+        _MODEL_SIGNATURES[path] = signature
+    return _MODEL_CACHE[path]
+
+
+def get_corpus_model():
+    """
+    Return the corpus model if one has been trained, otherwise None
+
+    A refitted model file is picked up on the next call.
+
+    Returns:
+        TfidfVectorizer or None: Fitted vectorizer
+    """
+    path = os.path.abspath(get_model_path())
+    signature = _signature(path)
+    if signature is None:
+        return None
+    if path in _MODEL_CACHE and _MODEL_SIGNATURES.get(path) == signature:
+        return _MODEL_CACHE[path]
+    try:
+        return load_model(path)
+    except Exception as e:
+        # Fall back to per-request fitting if the file is unreadable
+        return None
+
+
+def read_documents(directory):
+    """
+    Read the text of every supported document under a directory
+
+    Args:
+        directory: Directory containing .txt/.md/.pdf/.docx files
+
+    Returns:
+        list: List of document text contents
+    """
+    from utils.text_extractor import extract_text_from_pdf, extract_text_from_docx, clean_text
+
+    texts = []
+    for root, _, files in os.walk(directory):
+        for name in sorted(files):
+            if not name.lower().endswith(DOCUMENT_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            try:
+                if name.lower().endswith('.pdf'):
+                    text = extract_text_from_pdf(path)
+                elif name.lower().endswith('.docx'):
+                    text = extract_text_from_docx(path)
+                else:
+                    with open(path, encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+            except Exception as e:
+                print(f"Skipping {path}: {e}", file=sys.stderr)
+                continue
+            texts.append(clean_text(text))
+    return texts
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Manage the corpus TF-IDF model")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fit_parser = subparsers.add_parser('fit', help="Fit the model on a directory of documents")
+    fit_parser.add_argument('directory', help="Directory of resumes and job descriptions")
+    fit_parser.add_argument('--output', default=None, help="Model file (default: models/tfidf_vectorizer.joblib)")
+    fit_parser.add_argument('--max-features', type=int, default=20000, help="Maximum vocabulary size")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        texts = read_documents(args.directory)
+        if not texts:
+            parser.error(f"No documents found in {args.directory}")
+        vectorizer = fit_corpus_model(texts, max_features=args.max_features)
+        path = save_model(vectorizer, args.output)
+        print(f"Fitted on {len(texts)} documents, vocabulary size "
+              f"{len(vectorizer.vocabulary_)}, saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
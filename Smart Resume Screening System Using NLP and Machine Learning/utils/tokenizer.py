@@ -0,0 +1,175 @@
+"""
+Tokenizer Module
+Normalizes and tokenizes a document once for skill, keyword and ML scoring
+
+A TokenStream lowercases the text and splits it into words with one compiled
+regex. Skill matching reads the lowercased text, keyword extraction and ML
+scoring read token lists derived from the same words, so no stage
+re-tokenizes the document with its own rules.
+
+Example:
+    stream = tokenize(resume_text)
+    skills = extract_skills(stream)
+    keywords = extract_keywords_tfidf(stream, top_n=15)
+"""
+
+import re
+import threading
+from collections import Counter
+
+from utils.resources import get_stopwords
+
+
+# Runs of word characters in the lowercased text
+WORD_PATTERN = re.compile(r'\w+')
+
+# What normalize_for_ml keeps: ASCII letters and digits
+ASCII_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+_STOP_WORDS = {}
+_STOP_WORDS_LOCK = threading.Lock()
+
+
+def _stop_words(kind):
+    """
+    Stopword sets used by the token lists
+
+    'ml' is scikit-learn's English list, as used by the TF-IDF vectorizers;
+    'keywords' is NLTK's list, or scikit-learn's when the NLTK corpus is not
+    installed.
+    """
+    if kind not in _STOP_WORDS:
+        with _STOP_WORDS_LOCK:
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            if kind == 'ml':
+                _STOP_WORDS[kind] = ENGLISH_STOP_WORDS
+            else:
+                try:
+                    _STOP_WORDS[kind] = get_stopwords()
+                except LookupError:
+                    _STOP_WORDS[kind] = ENGLISH_STOP_WORDS
+    return _STOP_WORDS[kind]
+
+
+def word_ngrams(tokens):
+    """
+    Unigrams followed by bigrams, as TfidfVectorizer(ngram_range=(1, 2)) builds them
+
+    Args:
+        tokens: List of tokens
+
+    Returns:
+        list: Unigrams and space-joined bigrams
+    """
+    return tokens + [a + ' ' + b for a, b in zip(tokens, tokens[1:])]
+
+
+def ngram_counts(tokens):
+    """
+    Unigram and bigram counts of a token list
+
+    Args:
+        tokens: List of tokens
+
+    Returns:
+        Counter: Term counts
+    """
+    counts = Counter(tokens)
+    counts.update(a + ' ' + b for a, b in zip(tokens, tokens[1:]))
+    return counts
+
+
+def pre_tokenized(ngrams):
+    """
+    Vectorizer analyzer for documents that are already lists of n-grams
+
+    Pass as analyzer= to a scikit-learn vectorizer and fit it on
+    word_ngrams() output instead of raw strings.
+    """
+    return ngrams
+
+
+class TokenStream:
+    """
+    One document, lowercased and split into words once
+
+    Attributes:
+        lower: Lowercased text (input of the skill matcher)
+        words: Every run of word characters, in document order
+    """
+
+    __slots__ = ('lower', 'words', '_ml_tokens', '_keyword_tokens')
+
+    def __init__(self, text):
+        """
+        Args:
+            text: Input text string
+        """
+        self.lower = text.lower()
+        self.words = WORD_PATTERN.findall(self.lower)
+        self._ml_tokens = None
+        self._keyword_tokens = None
+
+    def __len__(self):
+        """Length of the text in characters"""
+        return len(self.lower)
+
+    def ascii_words(self):
+        """
+        Words reduced to ASCII letters and digits, as normalize_for_ml splits them
+
+        Returns:
+            list: Tokens (non-ASCII characters and underscores split a word)
+        """
+        tokens = []
+        for word in self.words:
+            if word.isascii() and word.isalnum():
+                tokens.append(word)
+            else:
+                tokens.extend(ASCII_WORD_PATTERN.findall(word))
+        return tokens
+
+    @property
+    def ml_text(self):
+        """Text for ML scoring; equal to normalize_for_ml() of the original text"""
+        return ' '.join(self.ascii_words())
+
+    @property
+    def ml_tokens(self):
+        """
+        Unigrams for ML scoring
+
+        The same tokens TfidfVectorizer(stop_words='english') produces from
+        normalize_for_ml() text: at least two characters, no English stopwords.
+        """
+        if self._ml_tokens is None:
+            stop_words = _stop_words('ml')
+            self._ml_tokens = [
+                token for token in self.ascii_words() if len(token) > 1 and token not in stop_words
+            ]
+        return self._ml_tokens
+
+    @property
+    def keyword_tokens(self):
+        """Unigrams for keyword extraction: longer than two characters, no stopwords"""
+        if self._keyword_tokens is None:
+            stop_words = _stop_words('keywords')
+            self._keyword_tokens = [
+                word for word in self.words if len(word) > 2 and word not in stop_words
+            ]
+        return self._keyword_tokens
+
+
+def tokenize(text):
+    """
+    Tokenize a document for all scoring stages
+
+    Args:
+        text: Input text string or an existing TokenStream
+
+    Returns:
+        TokenStream: Token stream (the same object if one was passed)
+    """
+    if isinstance(text, TokenStream):
+        return text
+    return TokenStream(text)
@@ -0,0 +1,294 @@
+"""
+Vector Index Module
+On-disk index of resume embeddings for top-k semantic search
+
+An index is a directory holding:
+    meta.json     dimension, storage dtype, row count and embedder name
+    ids.jsonl     one resume id per row, in row order
+    vectors.bin   row-major float32 (or int8 when quantized) matrix
+    scales.bin    per-row float32 scale factors (int8 indexes only)
+
+Searches memory-map vectors.bin and score it in fixed-size chunks, so
+ranking a JD against 100k candidates is one matrix-vector product per chunk
+without loading the whole index into memory.
+
+Build an index and query it:
+    python -m utils.vector_index build --input resumes/ --index index/
+    python -m utils.vector_index search --index index/ --jd job.txt --top-k 20
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+
+import numpy as np
+
+
+# Rows scored per matrix-vector product during search
+SEARCH_CHUNK_ROWS = 65536
+
+
+class VectorIndex:
+    """
+    Append-only, memory-mapped matrix of L2-normalized embeddings
+
+    With quantize=True vectors are stored as int8 with one float32 scale per
+    row, a quarter of the float32 size at a small cost in score precision.
+    """
+
+    def __init__(self, directory, dim=None, quantize=False, embedder_name=None):
+        """
+        Open an existing index or create an empty one
+
+        Args:
+            directory: Index directory
+            dim: Embedding dimension (required for a new index)
+            quantize: Store vectors as int8 (new indexes only)
+            embedder_name: Name of the embedder that produced the vectors
+        """
+        self.directory = directory
+        self._meta_path = os.path.join(directory, 'meta.json')
+        self._ids_path = os.path.join(directory, 'ids.jsonl')
+        self._vectors_path = os.path.join(directory, 'vectors.bin')
+        self._scales_path = os.path.join(directory, 'scales.bin')
+        self._matrix = None
+        self._scales = None
+
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding='utf-8') as f:
+                self.meta = json.load(f)
+            self.ids = self._discard_uncommitted_rows()
+            if dim is not None and dim != self.meta['dim']:
+                raise ValueError(f"Index dimension is {self.meta['dim']}, not {dim}")
+        else:
+            if dim is None:
+                raise ValueError(f"No index in {directory}; a dimension is needed to create one")
+            os.makedirs(directory, exist_ok=True)
+            self.meta = {
+                'dim': int(dim),
+                'dtype': 'int8' if quantize else 'float32',
+                'count': 0,
+                'embedder': embedder_name
+            }
+            self.ids = []
+            for path in (self._ids_path, self._vectors_path):
+                open(path, 'wb').close()
+            if quantize:
+                open(self._scales_path, 'wb').close()
+            self._write_meta()
+
+    @property
+    def dim(self):
+        """Embedding dimension"""
+        return self.meta['dim']
+
+    @property
+    def quantized(self):
+        """True if vectors are stored as int8"""
+        return self.meta['dtype'] == 'int8'
+
+    def __len__(self):
+        return self.meta['count']
+
+    def _discard_uncommitted_rows(self):
+        """
+        Cut the data files back to the row count in meta.json
+
+        add() writes meta.json last, so rows past that count belong to an
+        append that crashed; they would otherwise shift every later row.
+
+        Returns:
+            list: Resume ids of the committed rows
+        """
+        count = self.meta['count']
+        ids = []
+        committed_bytes = 0
+        with open(self._ids_path, 'rb') as f:
+            for line in f:
+                if len(ids) == count:
+                    break
+                ids.append(json.loads(line))
+                committed_bytes += len(line)
+        if len(ids) < count:
+            raise ValueError(f"Index in {self.directory} has {len(ids)} ids but meta.json counts {count}")
+
+        row_bytes = self.dim * np.dtype(self.meta['dtype']).itemsize
+        sizes = [(self._ids_path, committed_bytes), (self._vectors_path, count * row_bytes)]
+        if self.quantized:
+            sizes.append((self._scales_path, count * np.dtype(np.float32).itemsize))
+        for path, size in sizes:
+            if os.path.getsize(path) > size:
+                os.truncate(path, size)
+        return ids
+
+    def _write_meta(self):
+        temp_path = self._meta_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(temp_path, self._meta_path)
+
+    def add(self, ids, vectors):
+        """
+        Append embeddings to the index
+
+        Args:
+            ids: List of resume ids, one per row
+            vectors: len(ids) x dim array of L2-normalized embeddings
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected a {len(ids)} x {self.dim} matrix, got {vectors.shape}")
+        if not len(ids):
+            return
+
+        if self.quantized:
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1
+            stored = np.round(vectors / scales[:, None]).astype(np.int8)
+            with open(self._scales_path, 'ab') as f:
+                f.write(scales.astype(np.float32).tobytes())
+        else:
+            stored = vectors
+        with open(self._vectors_path, 'ab') as f:
+            f.write(stored.tobytes())
+        with open(self._ids_path, 'a', encoding='utf-8') as f:
+            for resume_id in ids:
+                f.write(json.dumps(resume_id) + '\n')
+
+        # Metadata last, so a crash mid-append leaves the old count valid
+        self.ids.extend(ids)
+        self.meta['count'] += len(ids)
+        self._write_meta()
+        self._matrix = None
+        self._scales = None
+
+    def _mapped(self):
+        """Memory-map the stored rows (and scales), reopening after appends"""
+        if self._matrix is None and len(self):
+            self._matrix = np.memmap(
+                self._vectors_path, dtype=self.meta['dtype'], mode='r', shape=(len(self), self.dim)
+            )
+            if self.quantized:
+                self._scales = np.memmap(self._scales_path, dtype=np.float32, mode='r', shape=(len(self),))
+        return self._matrix, self._scales
+
+    def search(self, query, top_k=10):
+        """
+        Find the rows most similar to a query embedding
+
+        Args:
+            query: dim-length L2-normalized embedding
+            top_k: Number of results
+
+        Returns:
+            list: (resume_id, score) tuples, score as percentage (0-100),
+                  best match first
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        matrix, scales = self._mapped()
+        if matrix is None or top_k <= 0:
+            return []
+
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        for start in range(0, len(self), SEARCH_CHUNK_ROWS):
+            chunk = matrix[start:start + SEARCH_CHUNK_ROWS]
+            scores = chunk.astype(np.float32) @ query
+            if scales is not None:
+                scores *= scales[start:start + SEARCH_CHUNK_ROWS]
+
+            # Keep a running top-k instead of all scores
+            best_scores = np.concatenate([best_scores, scores])
+            best_rows = np.concatenate([best_rows, np.arange(start, start + len(scores))])
+            if len(best_scores) > top_k:
+                keep = np.argpartition(-best_scores, top_k - 1)[:top_k]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.lexsort((best_rows, -best_scores))
+        return [
+            (self.ids[best_rows[i]], round(max(0.0, float(best_scores[i])) * 100, 2))
+            for i in order
+        ]
+
+
+def build_index(input_path, index_dir, embedder, quantize=False, batch_size=64):
+    """
+    Embed every resume in a directory or zip and add it to an index
+
+    Resumes whose id is already in the index are skipped, so re-running the
+    build after adding files only embeds the new ones.
+
+    Args:
+        input_path: Directory or .zip of PDF/DOCX resumes
+        index_dir: Index directory
+        embedder: Embedder from utils.embeddings
+        quantize: Store vectors as int8 (new indexes only)
+        batch_size: Resumes embedded per call
+
+    Returns:
+        VectorIndex: Updated index
+    """
+    from utils.bulk_screen import iter_resume_sources
+    from utils.text_extractor import extract_text, clean_text
+
+    index = VectorIndex(index_dir, dim=embedder.dim, quantize=quantize, embedder_name=embedder.name)
+    known = set(index.ids)
+
+    ids, texts = [], []
+    for resume_id, loader in iter_resume_sources(input_path):
+        if resume_id in known:
+            continue
+        try:
+            texts.append(clean_text(extract_text(io.BytesIO(loader()), resume_id)))
+        except Exception as e:
+            print(f"Skipping {resume_id}: {e}", file=sys.stderr)
+            continue
+        ids.append(resume_id)
+        if len(ids) >= batch_size:
+            index.add(ids, embedder.embed(texts))
+            ids, texts = [], []
+    if ids:
+        index.add(ids, embedder.embed(texts))
+    return index
+
+
+def main(argv=None):
+    """Command line entry point"""
+    from utils.embeddings import get_embedder
+
+    parser = argparse.ArgumentParser(description="Build and search the resume vector index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Embed resumes into an index")
+    build_parser.add_argument('--input', required=True, help="Directory or .zip of resumes")
+    build_parser.add_argument('--index', required=True, help="Index directory")
+    build_parser.add_argument('--quantize', action='store_true', help="Store int8 vectors (new index)")
+
+    search_parser = subparsers.add_parser('search', help="Rank indexed resumes against a JD")
+    search_parser.add_argument('--index', required=True, help="Index directory")
+    search_parser.add_argument('--jd', required=True, help="Job description text file")
+    search_parser.add_argument('--top-k', type=int, default=20, help="Number of results")
+
+    args = parser.parse_args(argv)
+
+    embedder = get_embedder()
+    if embedder is None:
+        parser.error("No embedding model found; fit one with 'python -m utils.embeddings fit DIR'")
+
+    if args.command == 'build':
+        index = build_index(args.input, args.index, embedder, quantize=args.quantize)
+        print(f"Index {args.index} holds {len(index)} resumes")
+    else:
+        index = VectorIndex(args.index)
+        if index.meta.get('embedder') not in (None, embedder.name) or index.dim != embedder.dim:
+            parser.error("Index was built with a different embedding model")
+        with open(args.jd, encoding='utf-8') as f:
+            jd_vector = embedder.embed([f.read()])[0]
+        for resume_id, score in index.search(jd_vector, args.top_k):
+            print(f"{score:>7.2f}  {resume_id}")
+
+
+if __name__ == "__main__":
+    main()